@@ -0,0 +1 @@
+# Benchmarks Package - Synthetic Data + Timing Harness
@@ -0,0 +1,146 @@
+"""
+Synthetic data generator: สร้าง data/*.csv ขนาดใหญ่แบบกำหนด seed ได้
+(ข้อมูลเหมือนเดิมทุกครั้งเมื่อใช้ seed เดียวกัน)
+
+  python -m benchmarks.generate 100k /tmp/shelter-100k [--seed 42] [--regions 10]
+
+  citizens    n คน
+  shelters    n / 10 แห่ง, ความจุรวมราว 80% ของ n (จึงมีคนตกค้าง)
+  assignments ASSIGNED_FRACTION ของประชาชนได้ที่พักไว้แล้ว
+              (เคารพความจุ และกฎ chronic/critical → risk_level ≤ 2)
+  regions     0 = ไม่แบ่งเขต (ค่าเริ่มต้น) มิฉะนั้นศูนย์วนเขต R01..Rnn
+              ประชาชนสุ่มเขต (random stream แยก: คอลัมน์อื่นเหมือนแบบไม่แบ่งเขต)
+              และที่พักที่จัดไว้แล้วอยู่ในเขตเดียวกัน
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+from models.citizen_model import FIELDS as CITIZEN_FIELDS
+from models.shelter_model import ShelterModel
+from models.assignment_model import FIELDS as ASSIGNMENT_FIELDS
+from models.sequence import format_id
+from controllers.shelter_selector import LOW_RISK_MAX
+
+DEFAULT_SEED = 42
+ASSIGNED_FRACTION = 0.3
+CAPACITY_RATIO = 0.8
+CITIZENS_PER_SHELTER = 10
+
+FIRST_NAMES = ["สมชาย", "สมหญิง", "มานี", "มานะ", "ปิติ", "ชูใจ", "วีระ", "กมล", "ธนา", "อรุณ"]
+LAST_NAMES = ["ใจดี", "สุขสันต์", "รักไทย", "ศรีสุข", "บุญมาก", "ภักดี", "สิริ", "มั่นคง"]
+SHELTER_NAMES = ["ศูนย์พักพิง", "โรงเรียน", "วัด", "อาคารอเนกประสงค์", "หอประชุม"]
+HEALTH_WEIGHTS = {"healthy": 80, "chronic": 15, "critical": 5}
+TYPE_WEIGHTS = {"general": 70, "risk_group": 20, "vip": 10}
+FIRST_DAY = date(2025, 1, 1)
+DAYS = 90
+
+
+def parse_size(text):
+    """'1k' → 1000, '100k' → 100000, '1m' → 1000000, '500' → 500."""
+    text = text.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip("km")) * scale)
+
+
+def generate(n, data_dir, seed=DEFAULT_SEED, assigned_fraction=ASSIGNED_FRACTION, regions=0):
+    """Write citizens/shelters/assignments CSVs for `n` citizens into `data_dir`."""
+    rng = random.Random(seed)
+    region_rng = random.Random(seed + 1)
+    region_names = [f"R{r:02d}" for r in range(1, regions + 1)] or [""]
+    os.makedirs(data_dir, exist_ok=True)
+
+    healths, health_w = list(HEALTH_WEIGHTS), list(HEALTH_WEIGHTS.values())
+    types, type_w = list(TYPE_WEIGHTS), list(TYPE_WEIGHTS.values())
+
+    # ── shelters ──
+    n_shelters = max(1, n // CITIZENS_PER_SHELTER)
+    mean_capacity = CITIZENS_PER_SHELTER * CAPACITY_RATIO
+    shelters = []
+    for i in range(1, n_shelters + 1):
+        shelters.append({
+            "shelter_id": format_id("S", i),
+            "name": f"{rng.choice(SHELTER_NAMES)} {i}",
+            "max_capacity": max(1, round(rng.uniform(0.5, 1.5) * mean_capacity)),
+            "risk_level": rng.randint(1, 5),
+            "region": region_names[(i - 1) % len(region_names)],
+        })
+    with _writer(data_dir, "shelters.csv", ShelterModel.FIELDS) as writer:
+        writer.writerows(shelters)
+
+    # ── citizens (+ assignments for a fraction of them) ──
+    free = {s["shelter_id"]: s["max_capacity"] for s in shelters}
+    low_risk = {r: [] for r in region_names}
+    any_risk = {r: [] for r in region_names}
+    for s in shelters:
+        any_risk[s["region"]].append(s["shelter_id"])
+        if s["risk_level"] <= LOW_RISK_MAX:
+            low_risk[s["region"]].append(s["shelter_id"])
+    assigned_date = str(FIRST_DAY + timedelta(days=DAYS))
+
+    # streamed straight to disk: memory does not grow with n
+    with _writer(data_dir, "citizens.csv", CITIZEN_FIELDS) as citizens, \
+            _writer(data_dir, "assignments.csv", ASSIGNMENT_FIELDS) as assignments:
+        n_assigned = 0
+        for i in range(1, n + 1):
+            health = rng.choices(healths, health_w)[0]
+            citizen_id = format_id("C", i)
+            region = region_rng.choice(region_names) if regions else ""
+            citizens.writerow({
+                "citizen_id": citizen_id,
+                "national_id": str(1_000_000_000_000 + i),
+                "first_name": rng.choice(FIRST_NAMES),
+                "last_name": rng.choice(LAST_NAMES),
+                "age": rng.randint(0, 95),
+                "health_status": health,
+                "citizen_type": rng.choices(types, type_w)[0],
+                "registered_date": str(FIRST_DAY + timedelta(days=rng.randrange(DAYS))),
+                "phone": f"08{rng.randrange(10**8):08d}",
+                "region": region,
+            })
+
+            if rng.random() < assigned_fraction:
+                pool = (low_risk if health in ("chronic", "critical") else any_risk)[region]
+                if pool:
+                    shelter_id = rng.choice(pool)
+                    if free[shelter_id] > 0:
+                        free[shelter_id] -= 1
+                        n_assigned += 1
+                        assignments.writerow({
+                            "assignment_id": format_id("A", n_assigned),
+                            "citizen_id": citizen_id,
+                            "shelter_id": shelter_id,
+                            "assigned_date": assigned_date,
+                            "status": "active",
+                        })
+
+    return {"citizens": n, "shelters": n_shelters, "assignments": n_assigned}
+
+
+@contextmanager
+def _writer(data_dir, name, fields):
+    with open(os.path.join(data_dir, name), "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        yield writer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.generate")
+    parser.add_argument("size", help="e.g. 1k, 100k, 1m")
+    parser.add_argument("data_dir")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--regions", type=int, default=0, help="number of regions (0 = none)")
+    args = parser.parse_args(argv)
+    counts = generate(parse_size(args.size), args.data_dir, args.seed, regions=args.regions)
+    print(f"generated {counts['citizens']} citizens, {counts['shelters']} shelters, "
+          f"{counts['assignments']} assignments → {args.data_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+"""
+Benchmark harness: จับเวลางานหลักของระบบบนข้อมูลสังเคราะห์หลายขนาด
+แล้วบันทึกผลเป็น JSON เพื่อเทียบกันระหว่าง commit
+
+  python -m benchmarks.run --sizes 1k,100k [--backend csv|sqlite] [--seed 42]
+                           [--regions 10] [-o results.json] [--compare old.json]
+
+ต่อขนาดข้อมูล (สร้างใหม่ในโฟลเดอร์ชั่วคราว):
+  scan_columns          อ่านเฉพาะ citizen_id + citizen_type ของทุกคน ก่อนโหลดตาราง
+                        (CitizenModel.iter_columns: csv = memory-map ไม่เข้า cache)
+  type_counts_serial    นับสถิติรายงาน (ทั้งหมด / ได้ที่พัก / แยกตามประเภท) ในโปรเซสเดียว
+  type_counts_pool      (เมื่อ REPORT_WORKERS > 1) นับแบบเดียวกันใน process pool
+                        (models.parallel_counts ถ้าไฟล์มีอย่างน้อย PARALLEL_MIN แถว)
+  load                  โหลดทั้ง 3 ตารางครั้งแรก
+  report_summary        สร้าง ReportSnapshot (เดิมคือ _build_data) แบบ cold
+  report_assigned / report_unassigned / report_full
+                        อ่านแถวรายงานแบบ streaming จนหมด
+  register_single       CitizenModel.add ทีละคน × REGISTER_SINGLE
+  register_bulk         CitizenModel.add_many ครั้งเดียว × REGISTER_BULK คน
+  manual_assign_check   ShelterController.manual_assign ที่ถูกปฏิเสธ × MANUAL_CHECKS
+                        (ตรวจครบทุกขั้นแต่ไม่เขียน)
+  plan_greedy / plan_global
+                        วางแผนการจัดสรรทุกคนที่รอ (ไม่เขียน) ทั้ง 2 โหมด
+                        จำนวนที่จัดได้อยู่ใน counts: greedy_placed / global_placed
+  plan_greedy_serial    (เมื่อ --regions > 1) เหมือน plan_greedy แต่วางแผนทีละเขต
+                        ในโปรเซสเดียว เทียบกับ process pool ของ plan_greedy
+  auto_assign           ShelterController.auto_assign ทุกคนที่รอ
+  discharge             ShelterController.discharge ทีละคน × DISCHARGES
+  auto_assign_incremental
+                        ลงทะเบียนเพิ่ม INCREMENTAL_NEW คน แล้ว auto_assign_incremental
+                        (รวมเตียงที่ว่างจาก discharge)
+  report_summary_after  snapshot หลังการจัดสรร
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from models import repository, csv_scan, parallel_counts
+from models.storage import create_backend, set_backend
+from models.citizen_model import CitizenModel
+from models.shelter_model import ShelterModel
+from models.assignment_model import AssignmentModel
+from controllers import report_snapshot as snapshot_module
+from controllers.report_rows import iter_report_rows
+from controllers.shelter_controller import ShelterController, ALLOCATION_MODES
+from benchmarks.generate import generate, parse_size, DEFAULT_SEED
+
+DEFAULT_SIZES = "1k,100k"
+REGISTER_SINGLE = 100
+REGISTER_BULK = 10_000
+MANUAL_CHECKS = 100
+INCREMENTAL_NEW = 10
+DISCHARGES = 100
+MISSING_SHELTER = "S-NONE"
+
+
+@contextmanager
+def _timed(results, name, count=1):
+    start = time.perf_counter()
+    yield
+    seconds = time.perf_counter() - start
+    results[name] = {"seconds": round(seconds, 6), "count": count}
+
+
+def _new_citizens(base, count):
+    return [{
+        "national_id": str(9_000_000_000_000 + base + i),
+        "first_name": "ทดสอบ",
+        "last_name": "ระบบ",
+        "age": 30 + i % 50,
+        "health_status": "healthy",
+        "citizen_type": "general",
+        "phone": "-",
+    } for i in range(count)]
+
+
+def bench_size(n, kind, seed, workdir, regions=0):
+    """Generate `n` citizens under `workdir` and time every operation."""
+    data_dir = os.path.join(workdir, str(n))
+    counts = generate(n, data_dir, seed, regions=regions)
+    db_path = os.path.join(data_dir, "shelter.db")
+    if kind == "sqlite":
+        from models.sqlite_backend import import_csv
+        import_csv(data_dir, db_path)
+
+    repository.clear()
+    csv_scan.clear()
+    snapshot_module._cache.update(version=None, snapshot=None)
+    set_backend(create_backend(kind, data_dir, db_path))
+
+    results = {}
+    with _timed(results, "scan_columns"):
+        for _ in CitizenModel.iter_columns(("citizen_id", "citizen_type")):
+            pass
+
+    # before load: both read the file, not the cached table
+    assigned_ids = AssignmentModel.get_assigned_citizen_ids()
+    with _timed(results, "type_counts_serial"):
+        CitizenModel.type_counts(assigned_ids, workers=1)
+    if parallel_counts.WORKERS > 1:
+        with _timed(results, "type_counts_pool"):
+            CitizenModel.type_counts(assigned_ids)
+
+    with _timed(results, "load"):
+        CitizenModel.count()
+        ShelterModel.get_all()
+        AssignmentModel.occupancy_map()
+
+    with _timed(results, "report_summary"):
+        snapshot_module.report_snapshot()
+    for status in ("assigned", "unassigned"):
+        with _timed(results, f"report_{status}"):
+            for _ in iter_report_rows(status=status):
+                pass
+    with _timed(results, "report_full"):
+        for _ in iter_report_rows():
+            pass
+
+    with _timed(results, "register_single", REGISTER_SINGLE):
+        for data in _new_citizens(0, REGISTER_SINGLE):
+            CitizenModel.add(data)
+    with _timed(results, "register_bulk", REGISTER_BULK):
+        CitizenModel.add_many(_new_citizens(REGISTER_SINGLE, REGISTER_BULK))
+
+    # unassigned citizens + a shelter id that does not exist: every check
+    # runs (citizen, assignment, shelter scan) and nothing is written
+    assigned = AssignmentModel.get_assigned_citizen_ids()
+    waiting = []
+    for c in CitizenModel.iter_all():
+        if c["citizen_id"] not in assigned:
+            waiting.append(c["citizen_id"])
+            if len(waiting) >= MANUAL_CHECKS:
+                break
+    with _timed(results, "manual_assign_check", len(waiting)):
+        for citizen_id in waiting:
+            ShelterController.manual_assign(citizen_id, MISSING_SHELTER)
+
+    skip_ids = ShelterController._not_waiting_ids()
+    queue = ShelterController._priority_sort(
+        [c for c in CitizenModel.get_all() if c["citizen_id"] not in skip_ids]
+    )
+    for mode in ALLOCATION_MODES:
+        shelters = ShelterController.shelters_with_occupancy()
+        with _timed(results, f"plan_{mode}"):
+            _, _, pairs = ShelterController._plan(queue, shelters, mode)
+        counts[f"{mode}_placed"] = len(pairs)
+    if regions > 1:
+        shelters = ShelterController.shelters_with_occupancy()
+        with _timed(results, "plan_greedy_serial"):
+            ShelterController._plan(queue, shelters, "greedy", workers=1)
+
+    with _timed(results, "auto_assign"):
+        outcome = ShelterController.auto_assign()
+    counts["auto_assigned"] = sum(1 for r in outcome if r["status"] == "ok")
+
+    leaving = sorted(AssignmentModel.get_assigned_citizen_ids())[:DISCHARGES]
+    with _timed(results, "discharge", len(leaving)):
+        for citizen_id in leaving:
+            ShelterController.discharge(citizen_id)
+
+    CitizenModel.add_many(_new_citizens(REGISTER_SINGLE + REGISTER_BULK, INCREMENTAL_NEW))
+    with _timed(results, "auto_assign_incremental"):
+        ShelterController.auto_assign_incremental()
+
+    with _timed(results, "report_summary_after"):
+        snapshot_module.report_snapshot()
+
+    return {"counts": counts, "timings": results}
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes, kind="csv", seed=DEFAULT_SEED, keep=False, regions=0):
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "backend": kind,
+        "seed": seed,
+        "regions": regions,
+        "sizes": {},
+    }
+    workdir = tempfile.mkdtemp(prefix="shelter-bench-")
+    try:
+        for n in sizes:
+            print(f"── {n} citizens ──", file=sys.stderr)
+            result = bench_size(n, kind, seed, workdir, regions)
+            for name, t in result["timings"].items():
+                print(f"  {name:<22} {t['seconds']:>10.4f} s  (×{t['count']})", file=sys.stderr)
+            report["sizes"][str(n)] = result
+    finally:
+        if keep:
+            print(f"data kept in {workdir}", file=sys.stderr)
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return report
+
+
+def compare(old, new):
+    """Print new / old time ratios for every operation both reports measured."""
+    print(f"{'size':>9}  {'operation':<22} {'old s':>10} {'new s':>10} {'ratio':>7}")
+    for size, result in new["sizes"].items():
+        before = old.get("sizes", {}).get(size)
+        if not before:
+            continue
+        for name, t in result["timings"].items():
+            b = before["timings"].get(name)
+            if not b:
+                continue
+            ratio = t["seconds"] / b["seconds"] if b["seconds"] else float("inf")
+            print(f"{size:>9}  {name:<22} {b['seconds']:>10.4f} {t['seconds']:>10.4f} {ratio:>6.2f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma-separated, e.g. 1k,100k,1m")
+    parser.add_argument("--backend", choices=["csv", "sqlite"], default="csv")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--regions", type=int, default=0, help="generate this many regions")
+    parser.add_argument("-o", "--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    parser.add_argument("--keep", action="store_true", help="keep the generated data")
+    args = parser.parse_args(argv)
+
+    sizes = [parse_size(s) for s in args.sizes.split(",") if s.strip()]
+    report = run(sizes, args.backend, args.seed, args.keep, args.regions)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"results → {args.output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+"""
+Batch mode: คำสั่งแบบไม่โต้ตอบ สำหรับ script / cron
+เรียก logic ของ controller โดยตรง ไม่ผ่านเมนูและไม่ import views
+
+  python main.py register <file.csv|file.jsonl> [--rejects PATH]
+  python main.py auto-assign [--incremental] [--mode greedy|global]
+  python main.py discharge <citizen_id> | --shelter <shelter_id> [--refill]
+  python main.py transfer <citizen_id> <shelter_id>
+  python main.py report summary|assigned|unassigned|full [--json]
+  python main.py shelters [--json]
+  python main.py export summary|assigned|unassigned|full --format csv|jsonl|columnar [-o PATH]
+  python main.py serve [--host HOST] [--port PORT]      (HTTP/JSON API, see server.py)
+  python main.py compact                                 (รวบแถว assignment รุ่นเก่าทิ้ง)
+
+ผลลัพธ์แบบตาราง พิมพ์เป็น TSV (มีหัวคอลัมน์) หรือ JSON Lines เมื่อใส่ --json
+
+Exit codes
+  0  สำเร็จทั้งหมด
+  1  ทำรายการไม่ได้ตามกฎ ทั้งหมดหรือบางส่วน (มีแถวถูกปฏิเสธ / มีคนที่จัดสรรไม่ได้ /
+     ให้ออกหรือย้ายศูนย์ไม่ได้)
+  2  ใช้คำสั่งผิด (argparse)
+  3  ผิดพลาด (ไม่พบไฟล์ / อ่านเขียนข้อมูลไม่ได้)
+"""
+import argparse
+import json
+import os
+import sys
+
+EXIT_OK = 0
+EXIT_PARTIAL = 1
+EXIT_USAGE = 2
+EXIT_ERROR = 3
+
+REPORT_KINDS = ["summary", "assigned", "unassigned", "full"]
+ALLOCATION_MODES = ["greedy", "global"]
+EXPORT_FORMATS = ["csv", "jsonl", "columnar"]
+SHELTER_COLUMNS = [
+    "shelter_id", "name", "max_capacity", "risk_level", "region",
+    "current_occupancy", "available",
+]
+
+
+# ──────────── output ────────────
+def _write_rows(rows, columns, as_json, out):
+    """Rows as TSV with a header line, or as JSON Lines."""
+    if not as_json:
+        out.write("\t".join(columns) + "\n")
+    for row in rows:
+        if as_json:
+            out.write(json.dumps({c: row[c] for c in columns}, ensure_ascii=False) + "\n")
+        else:
+            out.write("\t".join(str(row[c]) for c in columns) + "\n")
+
+
+# ──────────── commands ────────────
+def cmd_register(args, out):
+    from controllers.citizen_import import import_citizens
+
+    if not os.path.isfile(args.file):
+        print(f"error: file not found: {args.file}", file=sys.stderr)
+        return EXIT_ERROR
+    summary = import_citizens(args.file, reject_path=args.rejects)
+    out.write(json.dumps(summary, ensure_ascii=False) + "\n")
+    return EXIT_PARTIAL if summary["rejected"] else EXIT_OK
+
+
+def cmd_auto_assign(args, out):
+    from controllers.shelter_controller import ShelterController
+
+    if args.incremental:
+        results = ShelterController.auto_assign_incremental(args.mode)
+    else:
+        results = ShelterController.auto_assign(args.mode)
+    assigned = sum(1 for r in results if r["status"] == "ok")
+    failed = len(results) - assigned
+    if args.json:
+        _write_rows(results, [
+            "citizen_id", "citizen_name", "shelter_id", "shelter_name", "status", "reason",
+        ], True, out)
+    out.write(json.dumps({"assigned": assigned, "failed": failed}) + "\n")
+    return EXIT_PARTIAL if failed else EXIT_OK
+
+
+def cmd_discharge(args, out):
+    from controllers.shelter_controller import ShelterController
+
+    shelter_id = args.shelter.strip().upper() if args.shelter else None
+    citizen_id = None if args.shelter else args.citizen_id.strip().upper()
+    refill = None
+    if args.refill:
+        # the freed beds go to the waitlist (not back to those discharged)
+        success, result, refill = ShelterController.discharge_and_refill(citizen_id, shelter_id)
+    elif shelter_id:
+        success, result = ShelterController.discharge_shelter(shelter_id)
+    else:
+        success, result = ShelterController.discharge(citizen_id)
+        result = [result] if success else result
+    if not success:
+        print(f"error: {result}", file=sys.stderr)
+        return EXIT_PARTIAL
+
+    summary = {"discharged": len(result)}
+    if refill is not None:
+        summary["assigned"] = sum(1 for r in refill if r["status"] == "ok")
+    out.write(json.dumps(summary) + "\n")
+    return EXIT_OK
+
+
+def cmd_transfer(args, out):
+    from controllers.shelter_controller import ShelterController
+
+    success, result = ShelterController.transfer(
+        args.citizen_id.strip().upper(), args.shelter_id.strip().upper()
+    )
+    if not success:
+        print(f"error: {result}", file=sys.stderr)
+        return EXIT_PARTIAL
+    out.write(json.dumps(result, ensure_ascii=False) + "\n")
+    return EXIT_OK
+
+
+def cmd_report(args, out):
+    if args.kind == "summary":
+        from controllers.report_snapshot import report_snapshot
+        from controllers.report_export import summary_row
+
+        stats = report_snapshot().stats
+        if args.json:
+            out.write(json.dumps(stats, ensure_ascii=False) + "\n")
+        else:
+            for key, value in summary_row(stats).items():
+                out.write(f"{key}\t{value}\n")
+        return EXIT_OK
+
+    from controllers.report_export import iter_export_rows, export_columns
+
+    _write_rows(iter_export_rows(args.kind), export_columns(args.kind), args.json, out)
+    return EXIT_OK
+
+
+def cmd_shelters(args, out):
+    from controllers.shelter_controller import ShelterController
+
+    _write_rows(ShelterController.shelters_with_occupancy(), SHELTER_COLUMNS, args.json, out)
+    return EXIT_OK
+
+
+def cmd_export(args, out):
+    from controllers.report_export import export_report, export_report_file
+
+    if args.output:
+        export_report_file(args.kind, args.format, args.output)
+    else:
+        out.flush()
+        export_report(args.kind, args.format, out.buffer)
+    return EXIT_OK
+
+
+def cmd_compact(args, out):
+    from models.storage import backend
+
+    backend().compact()
+    return EXIT_OK
+
+
+def cmd_serve(args, out):
+    from server import serve
+
+    serve(args.host, args.port)
+    return EXIT_OK
+
+
+# ──────────── parser ────────────
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Emergency Shelter Allocation System – batch mode "
+                    "(run without arguments for the interactive menu)",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("register", help="register citizens from a CSV / JSONL file")
+    p.add_argument("file")
+    p.add_argument("--rejects", help="where to write rejected rows (default <file>.rejects.jsonl)")
+    p.set_defaults(handler=cmd_register)
+
+    p = sub.add_parser("auto-assign", help="allocate every unassigned citizen")
+    p.add_argument("--json", action="store_true", help="also print one JSON line per citizen")
+    p.add_argument("--incremental", action="store_true",
+                   help="only new registrations, citizens discharged since the last run "
+                        "and citizens whose pool got beds back")
+    p.add_argument("--mode", choices=ALLOCATION_MODES,
+                   help="greedy (priority order) or global (most people placed); "
+                        "default SHELTER_ALLOCATION or greedy")
+    p.set_defaults(handler=cmd_auto_assign)
+
+    p = sub.add_parser("discharge", help="end a citizen's assignment, or everyone's in a shelter")
+    target = p.add_mutually_exclusive_group(required=True)
+    target.add_argument("citizen_id", nargs="?")
+    target.add_argument("--shelter", help="discharge every occupant of this shelter")
+    p.add_argument("--refill", action="store_true",
+                   help="then give the freed beds to the waitlist (incremental auto-assign)")
+    p.set_defaults(handler=cmd_discharge)
+
+    p = sub.add_parser("transfer", help="move an assigned citizen to another shelter")
+    p.add_argument("citizen_id")
+    p.add_argument("shelter_id")
+    p.set_defaults(handler=cmd_transfer)
+
+    p = sub.add_parser("report", help="print a report")
+    p.add_argument("kind", choices=REPORT_KINDS)
+    p.add_argument("--json", action="store_true", help="JSON output instead of TSV")
+    p.set_defaults(handler=cmd_report)
+
+    p = sub.add_parser("shelters", help="list shelters with occupancy")
+    p.add_argument("--json", action="store_true", help="JSON Lines instead of TSV")
+    p.set_defaults(handler=cmd_shelters)
+
+    p = sub.add_parser("export", help="export a report as CSV / JSON Lines / columnar")
+    p.add_argument("kind", choices=REPORT_KINDS)
+    p.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    p.add_argument("-o", "--output", help="file to write (default stdout); replaced atomically")
+    p.set_defaults(handler=cmd_export)
+
+    p = sub.add_parser("serve", help="run the HTTP/JSON API")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8080)
+    p.set_defaults(handler=cmd_serve)
+
+    p = sub.add_parser("compact", help="rewrite the data files without superseded rows")
+    p.set_defaults(handler=cmd_compact)
+
+    return parser
+
+
+def run(argv, out=None):
+    """Run one subcommand; returns the exit code."""
+    out = out or sys.stdout
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args, out)
+    except BrokenPipeError:
+        # output piped into e.g. `head`: not an error of ours
+        return EXIT_OK
+    except OSError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return EXIT_ERROR
@@ -3,13 +3,23 @@ Controller: CitizenController
 จัดการ logic สำหรับหน้าลงทะเบียนประชาชน
 """
 from models.citizen_model import CitizenModel
-from views.citizen_view import CitizenView
+from models.metrics import instrument
+from models.records import projection
+from controllers.citizen_import import import_citizens
+from controllers.report_rows import paginate
 
+BY_TYPE_COLUMNS = (
+    "citizen_id", "first_name", "last_name", "age",
+    "health_status", "citizen_type", "registered_date",
+)
 
+
+@instrument
 class CitizenController:
     """Bridges CitizenModel ↔ CitizenView."""
 
     def __init__(self):
+        from views.citizen_view import CitizenView  # lazy: keeps batch mode free of views
         self.model = CitizenModel
         self.view = CitizenView
 
@@ -24,21 +34,25 @@ class CitizenController:
                 self._show_by_type()
             elif choice == "3":
                 self._register_new()
+            elif choice == "4":
+                self._import_file()
             elif choice == "0":
                 break
             else:
-                self.view.show_error("กรุณาเลือก 0-3")
+                self.view.show_error("กรุณาเลือก 0-4")
 
     # ──────── internal actions ────────
 
     def _show_all(self):
-        citizens = self.model.get_all()
-        self.view.show_all_citizens(citizens)
+        pages = paginate(self.model.iter_all())
+        self.view.show_all_citizens_pages(pages, self.model.count())
 
     def _show_by_type(self):
-        all_citizens = self.model.get_all()
+        # only the columns the view prints (no national_id / phone)
+        row = projection(BY_TYPE_COLUMNS)._make
         by_type = {}
-        for c in all_citizens:
+        for values in self.model.iter_columns(BY_TYPE_COLUMNS):
+            c = row(values)
             by_type.setdefault(c["citizen_type"], []).append(c)
         self.view.show_by_type(by_type)
 
@@ -53,6 +67,12 @@ class CitizenController:
             self.view.show_error(form_data["error"])
             return
 
+        # same rules as import and the API (age range, health, type, ...)
+        error = self.model.validate(form_data)
+        if error:
+            self.view.show_error(error)
+            return
+
         success, result = self.model.add(form_data)
 
         if success:
@@ -62,3 +82,16 @@ class CitizenController:
             )
         else:
             self.view.show_error(result)
+
+    def _import_file(self):
+        path = self.view.import_form()
+        if path is None:
+            self.view.show_info("ยกเลิกการนำเข้า")
+            return
+
+        try:
+            summary = import_citizens(path)
+        except OSError as e:
+            self.view.show_error(f"เปิดไฟล์ไม่ได้: {e}")
+            return
+        self.view.show_import_summary(summary)
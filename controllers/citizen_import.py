@@ -0,0 +1,95 @@
+"""
+Bulk import: ลงทะเบียนประชาชนจำนวนมากจากไฟล์ CSV หรือ JSONL
+─ อ่านไฟล์แบบ streaming ทีละแถว (ไม่โหลดทั้งไฟล์เข้าหน่วยความจำ)
+─ ตรวจสอบแต่ละแถวด้วยกฎเดียวกับฟอร์มลงทะเบียน (CitizenModel.validate)
+─ กันเลขบัตรซ้ำทั้งกับข้อมูลเดิมและภายในไฟล์เดียวกัน
+─ บันทึกทีละ chunk (1 transaction + 1 การเขียนต่อ chunk)
+─ แถวที่ไม่ผ่านเขียนลงไฟล์ rejects แยก (JSONL: line, reason, row)
+"""
+import csv
+import json
+
+from models.citizen_model import CitizenModel
+
+CHUNK_SIZE = 5000
+IMPORT_FIELDS = [
+    "national_id", "first_name", "last_name", "age",
+    "health_status", "citizen_type", "phone", "region",
+]
+
+
+def read_registrants(path):
+    """
+    Yield (line_no, row_dict) from a .csv file (header row required)
+    or a .jsonl / .ndjson file (one JSON object per line).
+    """
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_no, json.loads(line)
+                except ValueError:
+                    yield line_no, None
+        else:
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+
+
+def _clean(row):
+    """Keep only the import fields, as stripped strings (age stays as given)."""
+    data = {}
+    for field in IMPORT_FIELDS:
+        value = row.get(field)
+        data[field] = value.strip() if isinstance(value, str) else value
+    return data
+
+
+def import_citizens(path, reject_path=None, chunk_size=CHUNK_SIZE):
+    """
+    Register every valid row of `path`.
+    Returns {read, imported, rejected, reject_path}.
+    """
+    reject_path = reject_path or path + ".rejects.jsonl"
+    summary = {"read": 0, "imported": 0, "rejected": 0, "reject_path": reject_path}
+
+    with open(reject_path, "w", encoding="utf-8") as rejects:
+
+        def reject(line_no, reason, row):
+            summary["rejected"] += 1
+            rejects.write(json.dumps(
+                {"line": line_no, "reason": reason, "row": row}, ensure_ascii=False
+            ) + "\n")
+
+        def commit(chunk):
+            results = CitizenModel.add_many([data for _, data, _ in chunk])
+            for (line_no, _, raw), (success, result) in zip(chunk, results):
+                if success:
+                    summary["imported"] += 1
+                else:
+                    reject(line_no, result, raw)
+
+        chunk = []
+        for line_no, raw in read_registrants(path):
+            summary["read"] += 1
+            if not isinstance(raw, dict):
+                reject(line_no, "รูปแบบแถวไม่ถูกต้อง", raw)
+                continue
+
+            data = _clean(raw)
+            error = CitizenModel.validate(data)
+            if error:
+                reject(line_no, error, raw)
+                continue
+
+            chunk.append((line_no, data, raw))
+            if len(chunk) >= chunk_size:
+                commit(chunk)
+                chunk = []
+
+        if chunk:
+            commit(chunk)
+
+    return summary
@@ -2,16 +2,17 @@
 Controller: ReportController
 จัดการ logic สำหรับหน้ารายงานผล
 """
-from models.citizen_model import CitizenModel
-from models.shelter_model import ShelterModel
-from models.assignment_model import AssignmentModel
-from views.report_view import ReportView
+from models.metrics import instrument
+from controllers.report_snapshot import report_snapshot
+from controllers.report_rows import iter_report_rows, paginate, report_counts
 
 
+@instrument
 class ReportController:
     """Bridges Models ↔ ReportView."""
 
     def __init__(self):
+        from views.report_view import ReportView  # lazy: keeps batch mode free of views
         self.view = ReportView
 
     def run(self):
@@ -35,84 +36,28 @@ class ReportController:
     # ──────── helpers ────────
 
     def _build_data(self):
-        """Build enriched data for all citizens."""
-        all_citizens = CitizenModel.get_all()
-        assignments = AssignmentModel.get_active()
-        shelters = {s["shelter_id"]: s for s in ShelterModel.get_all()}
-
-        # Map citizen_id → assignment
-        assign_map = {}
-        for a in assignments:
-            assign_map[a["citizen_id"]] = a
-
-        assigned_list = []
-        unassigned_list = []
-        full_list = []
-
-        for c in all_citizens:
-            a = assign_map.get(c["citizen_id"])
-            if a:
-                shelter = shelters.get(a["shelter_id"], {})
-                item = {
-                    "citizen": c,
-                    "status": "assigned",
-                    "shelter_name": shelter.get("name", "?"),
-                    "assigned_date": a["assigned_date"],
-                }
-                assigned_list.append(item)
-                full_list.append(item)
-            else:
-                unassigned_list.append(c)
-                full_list.append({
-                    "citizen": c,
-                    "status": "unassigned",
-                    "shelter_name": "-",
-                    "assigned_date": "-",
-                })
-
-        return all_citizens, assigned_list, unassigned_list, full_list
+        """Build enriched data for all citizens (from the cached report snapshot)."""
+        snapshot = report_snapshot()
+        return (snapshot.citizens, snapshot.assigned_list,
+                snapshot.unassigned_list, snapshot.full_list)
 
     # ──────── actions ────────
 
     def _show_summary(self):
-        all_citizens, assigned_list, unassigned_list, _ = self._build_data()
-        shelters = ShelterModel.get_all()
-
-        total_capacity = sum(s["max_capacity"] for s in shelters)
-        total_occupancy = sum(AssignmentModel.count_by_shelter(s["shelter_id"]) for s in shelters)
-
-        # By type breakdown
-        by_type = {}
-        assigned_ids = AssignmentModel.get_assigned_citizen_ids()
-        for c in all_citizens:
-            ct = c["citizen_type"]
-            if ct not in by_type:
-                by_type[ct] = {"total": 0, "assigned": 0, "unassigned": 0}
-            by_type[ct]["total"] += 1
-            if c["citizen_id"] in assigned_ids:
-                by_type[ct]["assigned"] += 1
-            else:
-                by_type[ct]["unassigned"] += 1
-
-        stats = {
-            "total_citizens": len(all_citizens),
-            "assigned_count": len(assigned_list),
-            "unassigned_count": len(unassigned_list),
-            "total_shelters": len(shelters),
-            "total_capacity": total_capacity,
-            "total_occupancy": total_occupancy,
-            "by_type": by_type,
-        }
-        self.view.show_summary(stats)
+        self.view.show_summary(report_snapshot().stats)
 
+    # Lists are streamed page by page (report_rows) instead of taken from
+    # the snapshot, so large populations never build the full lists.
     def _show_assigned(self):
-        _, assigned_list, _, _ = self._build_data()
-        self.view.show_assigned(assigned_list)
+        _, assigned, _ = report_counts()
+        pages = paginate(iter_report_rows(status="assigned"))
+        self.view.show_assigned_pages(pages, assigned)
 
     def _show_unassigned(self):
-        _, _, unassigned_list, _ = self._build_data()
-        self.view.show_unassigned(unassigned_list)
+        _, _, unassigned = report_counts()
+        rows = (item["citizen"] for item in iter_report_rows(status="unassigned"))
+        self.view.show_unassigned_pages(paginate(rows), unassigned)
 
     def _show_full_report(self):
-        _, _, _, full_list = self._build_data()
-        self.view.show_full_report(full_list)
+        total, _, _ = report_counts()
+        self.view.show_full_report_pages(paginate(iter_report_rows()), total)
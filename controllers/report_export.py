@@ -0,0 +1,192 @@
+"""
+Report export: ส่งออกรายงานเป็นไฟล์สำหรับระบบอื่น (เช่น dashboard)
+  csv      → หัวคอลัมน์ + 1 แถวต่อคน
+  jsonl    → 1 JSON object ต่อบรรทัด
+  columnar → gzip ของ JSON Lines: บรรทัดแรกเป็น header ตามด้วย row group
+             ละไม่เกิน ROW_GROUP_SIZE แถว เก็บเป็นคอลัมน์ และคอลัมน์ที่มีค่า
+             ซ้ำมาก (ประเภท, สุขภาพ, สถานะ, ศูนย์, วันที่) เก็บเป็น dictionary + codes
+
+รายการ assigned / unassigned / full อ่านจาก report_rows แบบ streaming
+จึงใช้หน่วยความจำคงที่ (มากสุด 1 row group) ไม่ว่าข้อมูลจะมีกี่แถว
+ไฟล์ปลายทางเขียนลง .tmp ก่อนแล้วค่อย os.replace ผู้อ่านจึงไม่เห็นไฟล์ครึ่งๆ
+"""
+import csv
+import gzip
+import io
+import json
+import os
+
+from controllers.report_rows import iter_report_rows
+from controllers.report_snapshot import report_snapshot
+
+EXPORT_KINDS = ["summary", "assigned", "unassigned", "full"]
+EXPORT_FORMATS = ["csv", "jsonl", "columnar"]
+COLUMNAR_FORMAT = "shelter-columnar/1"
+ROW_GROUP_SIZE = 65536
+
+CITIZEN_COLUMNS = [
+    "citizen_id", "first_name", "last_name", "age",
+    "health_status", "citizen_type", "registered_date",
+]
+ROW_COLUMNS = CITIZEN_COLUMNS + ["status", "shelter_name", "assigned_date"]
+# low-cardinality columns: dictionary-encoded in the columnar format
+DICTIONARY_COLUMNS = {
+    "health_status", "citizen_type", "registered_date",
+    "status", "shelter_name", "assigned_date",
+}
+
+
+# ══════════════════════════════════════════
+#  Rows
+# ══════════════════════════════════════════
+def flatten(item):
+    """Report row {citizen, status, shelter_name, assigned_date} → one flat dict."""
+    row = {c: item["citizen"][c] for c in CITIZEN_COLUMNS}
+    row["status"] = item["status"]
+    row["shelter_name"] = item["shelter_name"]
+    row["assigned_date"] = item["assigned_date"]
+    return row
+
+
+def summary_row(stats):
+    """Summary stats dict → one flat dict (by_type becomes <type>.<count> keys)."""
+    row = {k: v for k, v in stats.items() if k != "by_type"}
+    for ctype, counts in stats["by_type"].items():
+        for key, value in counts.items():
+            row[f"{ctype}.{key}"] = value
+    return row
+
+
+def export_columns(kind):
+    return CITIZEN_COLUMNS if kind == "unassigned" else ROW_COLUMNS
+
+
+def iter_export_rows(kind):
+    """Flat rows for `kind` (assigned / unassigned / full), streamed."""
+    status = None if kind == "full" else kind
+    columns = export_columns(kind)
+    for item in iter_report_rows(status=status):
+        row = flatten(item)
+        yield {c: row[c] for c in columns}
+
+
+# ══════════════════════════════════════════
+#  Writers: (rows, columns, binary file) → rows written
+# ══════════════════════════════════════════
+def write_csv(rows, columns, f):
+    text = _text(f)
+    writer = csv.DictWriter(text, fieldnames=columns)
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    text.flush()
+    text.detach()
+    return count
+
+
+def write_jsonl(rows, columns, f):
+    text = _text(f)
+    count = 0
+    for row in rows:
+        text.write(json.dumps(row, ensure_ascii=False) + "\n")
+        count += 1
+    text.flush()
+    text.detach()
+    return count
+
+
+def write_columnar(rows, columns, f):
+    with gzip.GzipFile(fileobj=f, mode="wb") as gz:
+        text = _text(gz)
+        text.write(json.dumps({"format": COLUMNAR_FORMAT, "columns": columns}) + "\n")
+
+        count = 0
+        group = {c: [] for c in columns}
+        size = 0
+        for row in rows:
+            for c in columns:
+                group[c].append(row[c])
+            size += 1
+            if size >= ROW_GROUP_SIZE:
+                text.write(_encode_group(group, size) + "\n")
+                count += size
+                group = {c: [] for c in columns}
+                size = 0
+        if size:
+            text.write(_encode_group(group, size) + "\n")
+            count += size
+        text.flush()
+        text.detach()
+    return count
+
+
+WRITERS = {"csv": write_csv, "jsonl": write_jsonl, "columnar": write_columnar}
+
+
+def _text(f):
+    return io.TextIOWrapper(f, encoding="utf-8", newline="")
+
+
+def _encode_group(group, size):
+    encoded = {}
+    for name, values in group.items():
+        if name in DICTIONARY_COLUMNS:
+            codes = {}
+            encoded[name] = {
+                "codes": [codes.setdefault(v, len(codes)) for v in values],
+                "dictionary": list(codes),
+            }
+        else:
+            encoded[name] = values
+    return json.dumps({"rows": size, "columns": encoded}, ensure_ascii=False)
+
+
+def read_columnar(path):
+    """Yield rows (dicts) back from a columnar export, one row group at a time."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("format") != COLUMNAR_FORMAT:
+            raise ValueError(f"not a {COLUMNAR_FORMAT} file: {path}")
+        columns = header["columns"]
+        for line in f:
+            group = json.loads(line)
+            decoded = []
+            for name in columns:
+                values = group["columns"][name]
+                if isinstance(values, dict):
+                    values = [values["dictionary"][i] for i in values["codes"]]
+                decoded.append(values)
+            for values in zip(*decoded):
+                yield dict(zip(columns, values))
+
+
+# ══════════════════════════════════════════
+#  Export
+# ══════════════════════════════════════════
+def export_report(kind, fmt, f):
+    """Write report `kind` in format `fmt` to the binary file `f`; returns rows written."""
+    if kind not in EXPORT_KINDS:
+        raise ValueError(f"unknown report: {kind!r} (use one of {', '.join(EXPORT_KINDS)})")
+    if fmt not in WRITERS:
+        raise ValueError(f"unknown format: {fmt!r} (use one of {', '.join(EXPORT_FORMATS)})")
+
+    if kind == "summary":
+        row = summary_row(report_snapshot().stats)
+        return WRITERS[fmt]([row], list(row), f)
+    return WRITERS[fmt](iter_export_rows(kind), export_columns(kind), f)
+
+
+def export_report_file(kind, fmt, path):
+    """export_report into `path`, replaced atomically once complete."""
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            count = export_report(kind, fmt, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return count
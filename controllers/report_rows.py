@@ -0,0 +1,62 @@
+"""
+Report rows แบบ streaming: สร้างแถวรายงานทีละแถวด้วย generator
+แล้วแบ่งเป็นหน้า (page) ส่งให้ View แสดงทีละหน้า
+ไม่มีการสร้างรายการเต็ม (full_list) ในหน่วยความจำ
+"""
+from models.citizen_model import CitizenModel
+from models.shelter_model import ShelterModel
+from models.assignment_model import AssignmentModel
+from models.records import ReportRow
+
+PAGE_SIZE = 50
+
+
+def paginate(rows, page_size=PAGE_SIZE):
+    """Group any iterable into lists of `page_size` (the last may be shorter)."""
+    page = []
+    for row in rows:
+        page.append(row)
+        if len(page) >= page_size:
+            yield page
+            page = []
+    if page:
+        yield page
+
+
+def iter_citizens(citizen_type=None, health_status=None):
+    """Citizens straight from storage, optionally filtered by type / health."""
+    for c in CitizenModel.iter_all():
+        if citizen_type and c["citizen_type"] != citizen_type:
+            continue
+        if health_status and c["health_status"] != health_status:
+            continue
+        yield c
+
+
+def iter_report_rows(status=None, citizen_type=None, health_status=None):
+    """
+    Yield ReportRow(citizen, status, shelter_name, assigned_date) for every
+    citizen, the same items as ReportSnapshot.full_list.
+    status = None | "assigned" | "unassigned" keeps only that group.
+    """
+    shelter_names = {s["shelter_id"]: s["name"] for s in ShelterModel.get_all()}
+    # looked up once for the whole report, not once (one file check) per citizen
+    active = {a["citizen_id"]: a for a in AssignmentModel.get_active()}
+
+    for c in iter_citizens(citizen_type, health_status):
+        a = active.get(c["citizen_id"])
+        if a:
+            if status == "unassigned":
+                continue
+            yield ReportRow(c, "assigned", shelter_names.get(a["shelter_id"], "?"), a["assigned_date"])
+        else:
+            if status == "assigned":
+                continue
+            yield ReportRow(c, "unassigned", "-", "-")
+
+
+def report_counts():
+    """(total, assigned, unassigned) from counters only, without scanning citizens."""
+    total = CitizenModel.count()
+    assigned = AssignmentModel.count_active()
+    return total, assigned, total - assigned
@@ -0,0 +1,102 @@
+"""
+ReportSnapshot: ข้อมูลรายงานทั้งหมดที่คำนวณจากการโหลดแต่ละตารางเพียงครั้งเดียว
+(ผู้ได้ที่พัก / ผู้ตกค้าง / รายงานเต็ม / สถิติภาพรวม + แยกตามประเภท)
+เก็บ cache ไว้จนกว่าข้อมูลจะเปลี่ยน (ดูจาก backend().version())
+ทุกเมนูของหน้ารายงานจึงใช้ snapshot เดียวกันได้โดยไม่ต้องอ่านไฟล์ซ้ำ
+"""
+from models.citizen_model import CitizenModel
+from models.shelter_model import ShelterModel
+from models.assignment_model import AssignmentModel
+from models.storage import backend
+from models.records import ReportRow
+from models import metrics
+
+
+class ReportSnapshot:
+    """
+    citizens        = all citizen records (loaded on first read)
+    assigned_list   = [ReportRow(citizen, status, shelter_name, assigned_date), ...]
+    unassigned_list = [citizen, ...]
+    full_list       = assigned + unassigned items, in citizen order
+    stats           = dict for ReportView.show_summary
+
+    stats is counted as soon as the snapshot is built (CitizenModel.type_counts:
+    CitizenColumns, or a process pool over large CSV files with up to
+    `workers` processes); citizens and the three lists are only built the
+    first time one of them is read, so summary-only callers never load a
+    row per citizen.
+    """
+
+    def __init__(self, shelters, active_assignments, workers=None):
+        self._citizens = None
+        self._shelters = shelters
+        self._assign_map = {}
+        occupancy = {}
+        for a in active_assignments:
+            self._assign_map[a["citizen_id"]] = a
+            occupancy[a["shelter_id"]] = occupancy.get(a["shelter_id"], 0) + 1
+        self._lists = None
+
+        total, assigned, by_type = CitizenModel.type_counts(self._assign_map, workers)
+        self.stats = {
+            "total_citizens": total,
+            "assigned_count": assigned,
+            "unassigned_count": total - assigned,
+            "total_shelters": len(shelters),
+            "total_capacity": sum(s["max_capacity"] for s in shelters),
+            "total_occupancy": sum(occupancy.get(s["shelter_id"], 0) for s in shelters),
+            "by_type": by_type,
+        }
+
+    @property
+    def citizens(self):
+        if self._citizens is None:
+            self._citizens = CitizenModel.get_all()
+        return self._citizens
+
+    def _build_lists(self):
+        if self._lists is not None:
+            return self._lists
+        shelter_names = {s["shelter_id"]: s["name"] for s in self._shelters}
+        assigned_list, unassigned_list, full_list = [], [], []
+        for c in self.citizens:
+            a = self._assign_map.get(c["citizen_id"])
+            if a:
+                item = ReportRow(c, "assigned", shelter_names.get(a["shelter_id"], "?"),
+                                 a["assigned_date"])
+                assigned_list.append(item)
+                full_list.append(item)
+            else:
+                unassigned_list.append(c)
+                full_list.append(ReportRow(c, "unassigned", "-", "-"))
+        self._lists = (assigned_list, unassigned_list, full_list)
+        return self._lists
+
+    @property
+    def assigned_list(self):
+        return self._build_lists()[0]
+
+    @property
+    def unassigned_list(self):
+        return self._build_lists()[1]
+
+    @property
+    def full_list(self):
+        return self._build_lists()[2]
+
+
+# ─── cache: one snapshot per data version ───
+_cache = {"version": None, "snapshot": None}
+
+
+def report_snapshot():
+    """Current ReportSnapshot; rebuilt only when the stored data changed."""
+    version = backend().version()
+    if _cache["snapshot"] is None or _cache["version"] != version:
+        with metrics.timer("report_snapshot.build"):
+            _cache["snapshot"] = ReportSnapshot(
+                ShelterModel.get_all(),
+                AssignmentModel.get_active(),
+            )
+        _cache["version"] = version
+    return _cache["snapshot"]
@@ -7,17 +7,59 @@ Business Rules
   2. เด็ก (อายุ < 15) และผู้สูงอายุ (อายุ >= 60) ได้รับการจัดสรรก่อน
   3. ผู้มีความเสี่ยงด้านสุขภาพ (chronic/critical) ต้องถูกจัดไปยังศูนย์ที่มีความเสี่ยงต่ำ (risk_level <= 2)
   4. ประชาชนหนึ่งคนลงทะเบียนได้เพียงครั้งเดียว (handled in CitizenModel)
+  5. ประชาชนได้ที่พักเฉพาะศูนย์ในเขต (region) เดียวกัน ("" = ไม่แบ่งเขต)
+
+Auto-Assign มี 2 โหมด (SHELTER_ALLOCATION หรือ argument mode=)
+  greedy → ทีละคนตามลำดับความสำคัญ เลือกศูนย์ที่ดีที่สุดที่ยังว่าง (ค่าเริ่มต้น)
+  global → จัดให้ได้จำนวนคนมากที่สุด โดยยังเลือกคนตามลำดับความสำคัญ
+           (ไม่ปล่อยให้คนสุขภาพดีใช้ศูนย์ risk ≤ 2 จนผู้ป่วยลำดับหลังไม่มีที่)
+เขตไม่แย่งเตียงกัน จึงวางแผนแยกทีละเขตใน process pool (SHELTER_WORKERS)
+แล้วรวมผลบันทึกครั้งเดียว ผลเหมือนวางแผนทีละเขตตามลำดับ
 """
-from models.citizen_model import CitizenModel
+import heapq
+import os
+
+from models.citizen_model import CitizenModel, priority_key
 from models.shelter_model import ShelterModel
 from models.assignment_model import AssignmentModel
-from views.shelter_view import ShelterView
-
-
+from models.waitlist_model import WaitlistModel
+from models.sequence import id_number
+from models.storage import backend
+from models.metrics import instrument
+from models import optional
+from controllers.shelter_selector import ShelterSelector, LOW_RISK_MAX
+
+
+NUMPY_SORT_MIN = 50_000  # use the NumPy path from this many citizens up
+ALLOCATION_MODES = ("greedy", "global")
+DEFAULT_MODE = os.environ.get("SHELTER_ALLOCATION", "greedy")
+STORE_ERROR = "เกิดข้อผิดพลาด"  # planned placement rejected by AssignmentModel.add_many
+NO_REGION_SHELTER = "ไม่มีศูนย์พักพิงในเขตนี้"
+# regions are planned in a process pool from this many citizens up
+PARALLEL_MIN = 20_000
+WORKERS = int(os.environ.get("SHELTER_WORKERS") or os.cpu_count() or 1)
+
+
+def _plan_partition(task):
+    """
+    Process-pool entry point: plan one region on its own copy of the
+    shelters. Returns (results, planned, pairs) with shelters given by
+    position in the copy, since the dicts do not come back to the caller.
+    """
+    sorted_citizens, shelters, mode = task
+    results, planned, pairs = ShelterController._plan_region(sorted_citizens, shelters, mode)
+    position = {id(s): i for i, s in enumerate(shelters)}
+    return results, [(idx, position[id(shelter)]) for idx, shelter in planned], pairs
+
+
+@instrument
 class ShelterController:
     """Bridges Models ↔ ShelterView with business logic."""
 
     def __init__(self):
+        # views are imported here, not at module level, so batch callers
+        # (main.py subcommands) can use the logic without loading them
+        from views.shelter_view import ShelterView
         self.view = ShelterView
 
     def run(self):
@@ -31,28 +73,33 @@ class ShelterController:
                 self._auto_assign()
             elif choice == "3":
                 self._manual_assign()
+            elif choice == "4":
+                self._discharge()
+            elif choice == "5":
+                self._discharge_shelter()
+            elif choice == "6":
+                self._transfer()
             elif choice == "0":
                 break
             else:
-                self.view.show_error("กรุณาเลือก 0-3")
+                self.view.show_error("กรุณาเลือก 0-6")
 
     # ══════════════════════════════════════════
     #  Show shelters with occupancy
     # ══════════════════════════════════════════
     def _show_shelters(self):
-        shelters = ShelterModel.get_all()
-        for s in shelters:
-            s["current_occupancy"] = AssignmentModel.count_by_shelter(s["shelter_id"])
+        shelters = self.shelters_with_occupancy()
         self.view.show_all_shelters(shelters)
 
     # ══════════════════════════════════════════
     #  Helper: get shelters enriched with occupancy
     # ══════════════════════════════════════════
     @staticmethod
-    def _get_shelters_with_occupancy():
+    def shelters_with_occupancy():
         shelters = ShelterModel.get_all()
+        occupancy = AssignmentModel.occupancy_map()
         for s in shelters:
-            s["current_occupancy"] = AssignmentModel.count_by_shelter(s["shelter_id"])
+            s["current_occupancy"] = occupancy.get(s["shelter_id"], 0)
             s["available"] = s["max_capacity"] - s["current_occupancy"]
         return shelters
 
@@ -79,72 +126,366 @@ class ShelterController:
           - then by citizen_type: risk_group > vip > general
           - then by health: critical > chronic > healthy
           - then by registration date (earlier = higher priority)
-        """
-        def sort_key(c):
-            # Priority 1: age group (children & elderly first)
-            is_priority_age = 0 if (c["age"] < 15 or c["age"] >= 60) else 1
-
-            # Priority 2: citizen type
-            type_order = {"risk_group": 0, "vip": 1, "general": 2}
-            type_rank = type_order.get(c["citizen_type"], 3)
 
-            # Priority 3: health severity
-            health_order = {"critical": 0, "chronic": 1, "healthy": 2}
-            health_rank = health_order.get(c["health_status"], 3)
-
-            # Priority 4: registration date (earlier first)
-            reg_date = c.get("registered_date", "9999-99-99")
+        Each citizen carries a precomputed `priority_key` (packed int, see
+        models.citizen_model.priority_key), so sorting compares plain ints.
+        Large lists are sorted with NumPy when it is installed.
+        """
+        keys = [
+            c["priority_key"] if "priority_key" in c else priority_key(c)
+            for c in citizens
+        ]
 
-            return (is_priority_age, type_rank, health_rank, reg_date)
+        np = optional.numpy() if len(citizens) >= NUMPY_SORT_MIN else None
+        if np is not None:
+            order = np.argsort(np.fromiter(keys, dtype=np.int64, count=len(keys)), kind="stable")
+            return [citizens[i] for i in order.tolist()]
 
-        return sorted(citizens, key=sort_key)
+        order = sorted(range(len(citizens)), key=keys.__getitem__)
+        return [citizens[i] for i in order]
 
     # ══════════════════════════════════════════
     #  Business Rule: find best shelter for citizen
     #  ผู้มีปัญหาสุขภาพ → ศูนย์ risk_level ≤ 2
     # ══════════════════════════════════════════
     @staticmethod
-    def _find_best_shelter(citizen, shelters):
+    def _find_best_shelter(citizen, selector):
         """
         Find the best available shelter for a citizen.
         - If health is chronic/critical → must be risk_level ≤ 2
         - Otherwise → any available shelter, prefer lower risk
+          (risk_level ascending, then available descending)
+        `selector` is a ShelterSelector built from the live shelter list.
         Returns shelter dict or None.
         """
         needs_low_risk = citizen["health_status"] in ("chronic", "critical")
+        return selector.best(needs_low_risk)
 
-        # Filter available shelters
-        candidates = [s for s in shelters if s["available"] > 0]
-
-        if needs_low_risk:
-            # Business Rule: health risk → low risk shelter only
-            candidates = [s for s in candidates if s["risk_level"] <= 2]
-
-        if not candidates:
-            return None
-
-        # Sort by risk_level ascending (safest first), then by available descending
-        candidates.sort(key=lambda s: (s["risk_level"], -s["available"]))
-        return candidates[0]
+    # ══════════════════════════════════════════
+    #  Global mode: who gets a bed (maximum head-count)
+    # ══════════════════════════════════════════
+    @staticmethod
+    def _global_chooser(sorted_citizens, selector):
+        """
+        Shelter chooser for global mode: places as many citizens as the free
+        beds allow, and among all such maximum sets the one with the best
+        priority order.
+
+        Only two kinds of citizen exist (needs a low-risk bed or not), so a
+        set of s low-risk + h other citizens fits exactly when
+            s ≤ free low-risk beds  and  s + h ≤ all free beds
+        Accepting citizens in priority order while the set still fits is the
+        greedy algorithm on this transversal matroid: it yields a maximum
+        matching (the min-cost-flow optimum for priority costs) in O(n),
+        with no flow network to build.
+        Accepted citizens are then placed in priority order like greedy
+        mode, except that others only get a low-risk bed while one is left
+        over for every accepted low-risk citizen still to come.
+        Returns choose(citizen) → shelter dict or None.
+        """
+        low_free, all_free = selector.free[True], selector.free[False]
+        accepted = set()
+        low_taken = taken = 0
+        for citizen in sorted_citizens:
+            if taken == all_free:
+                break
+            needs_low_risk = citizen["health_status"] in ("chronic", "critical")
+            if needs_low_risk and low_taken == low_free:
+                continue
+            accepted.add(citizen["citizen_id"])
+            taken += 1
+            low_taken += needs_low_risk
+
+        low_to_place = low_taken
+
+        def choose(citizen):
+            nonlocal low_to_place
+            if citizen["citizen_id"] not in accepted:
+                return None
+            if citizen["health_status"] in ("chronic", "critical"):
+                low_to_place -= 1
+                return selector.best(True)
+            return selector.best(False, reserve_low=low_to_place)
+
+        return choose
 
     # ══════════════════════════════════════════
     #  Auto-Assign: allocate all unassigned
     # ══════════════════════════════════════════
     def _auto_assign(self):
-        unassigned = self._get_unassigned_citizens()
-        if not unassigned:
+        results = self.auto_assign()
+        if not results:
             self.view.show_info("ไม่มีประชาชนที่รอจัดสรร")
             return
+        self.view.show_assignment_results(results)
+
+    @staticmethod
+    def auto_assign(mode=None, exclude=()):
+        """
+        Allocate every waiting citizen and persist the batch.
+        mode = "greedy" | "global" (default SHELTER_ALLOCATION, else greedy).
+        exclude = citizen ids to leave out of this run (see
+        discharge_and_refill()); they are released for the next run.
+        Returns one result dict per citizen
+        {citizen_id, citizen_name, shelter_id, shelter_name, status: ok/fail, reason};
+        empty when nobody is waiting.
+        Also rewrites the waitlist used by auto_assign_incremental().
+        """
+        with backend().transaction():
+            all_citizens = CitizenModel.get_all()
+            assigned_ids = ShelterController._not_waiting_ids()
+            skip_ids = assigned_ids | set(exclude)
+            unassigned = [c for c in all_citizens if c["citizen_id"] not in skip_ids]
+
+            # Sort by priority
+            sorted_citizens = ShelterController._priority_sort(unassigned)
+
+            # Get live shelter data
+            shelters = ShelterController.shelters_with_occupancy()
+            results = ShelterController._allocate(sorted_citizens, shelters, mode)
+
+            ShelterController._save_waitlist(
+                len(all_citizens), [], sorted_citizens, results, shelters,
+                set(exclude) - assigned_ids,
+            )
+        return results
+
+    @staticmethod
+    def _not_waiting_ids():
+        """
+        Citizens Auto-Assign leaves out: those with an active assignment.
+        Discharged citizens wait again like anyone never placed.
+        """
+        return AssignmentModel.get_assigned_citizen_ids()
+
+    # ══════════════════════════════════════════
+    #  Incremental Auto-Assign
+    #  เฉพาะผู้ลงทะเบียนใหม่ + ผู้รอที่มีที่ว่างคืนมาให้
+    # ══════════════════════════════════════════
+    @staticmethod
+    def auto_assign_incremental(mode=None, exclude=()):
+        """
+        Same placements as auto_assign(), but only looks at citizens that can
+        be affected since the last run (the saved waitlist):
+          - new registrations (everyone past the `seen` mark)
+          - citizens discharged since (WaitlistModel.release events)
+          - waiting citizens whose pool got a bed back: any shelter for healthy
+            citizens, a low-risk shelter (risk ≤ 2) for chronic/critical ones
+        Everyone else on the waitlist failed because their pool was full, and
+        with no bed returned since, they would fail again.
+        Falls back to a full auto_assign() when there is no saved state, or
+        when more citizens are waiting than the waitlist, the new registrations
+        and the releases explain (assignments.csv was edited by hand).
+        Works in either mode: a citizen left on the waitlist by either one
+        failed because their pool had no bed left.
+        exclude = citizen ids to leave out of this run (see
+        discharge_and_refill()); they stay released for the next run.
+        Returns result dicts for the citizens it evaluated.
+        """
+        with backend().transaction():
+            state = WaitlistModel.load()
+            total = CitizenModel.count()
+            if state is None or state["seen"] > total:
+                return ShelterController.auto_assign(mode, exclude)
+
+            # Events since the last run: beds returned, new registrations, releases
+            shelters = ShelterController.shelters_with_occupancy()
+            last_available = state["available"]
+            freed = [s for s in shelters if s["available"] > last_available.get(s["shelter_id"], 0)]
+            low_risk_freed = any(s["risk_level"] <= LOW_RISK_MAX for s in freed)
+
+            assigned_ids = ShelterController._not_waiting_ids()
+            skip_ids = assigned_ids | set(exclude)
+            candidates = []
+            seen_ids = set()
+
+            def consider(citizen):
+                if citizen and citizen["citizen_id"] not in seen_ids \
+                        and citizen["citizen_id"] not in skip_ids:
+                    seen_ids.add(citizen["citizen_id"])
+                    candidates.append(citizen)
+
+            for citizen in CitizenModel.get_since(state["seen"]):
+                consider(citizen)
+            for citizen_id in state["released"]:
+                consider(CitizenModel.get_by_id(citizen_id))
+
+            kept = []
+            for entry in state["waiting"]:
+                _, citizen_id, needs_low_risk = entry
+                if citizen_id in seen_ids or citizen_id in skip_ids:
+                    continue  # already a candidate, or placed by hand since
+                if (low_risk_freed if needs_low_risk else freed):
+                    consider(CitizenModel.get_by_id(citizen_id))
+                else:
+                    kept.append(entry)
+
+            # everyone waiting must be a candidate or still on the waitlist
+            waiting = total - len(skip_ids)
+            if waiting != len(candidates) + len(kept):
+                return ShelterController.auto_assign(mode, exclude)
+
+            # registration (id) order first: equal priority keys then tie-break
+            # exactly as in the full run
+            candidates.sort(key=lambda c: id_number(c["citizen_id"]))
+            sorted_citizens = ShelterController._priority_sort(candidates)
+            results = ShelterController._allocate(sorted_citizens, shelters, mode)
+
+            ShelterController._save_waitlist(
+                total, kept, sorted_citizens, results, shelters,
+                set(exclude) - assigned_ids,
+            )
+        return results
+
+    @staticmethod
+    def _save_waitlist(seen, kept, sorted_citizens, results, shelters, released=()):
+        """
+        Persist the waitlist: entries still waiting + this run's failures, in
+        priority order. Releases are consumed, except `released` (left out of
+        this run) which the next run picks up.
+        """
+        if any(r["reason"] == STORE_ERROR for r in results):
+            # not a full pool: the waitlist rule would not hold for them
+            WaitlistModel.clear()
+            return
+        failed = {r["citizen_id"] for r in results if r["status"] == "fail"}
+        entries = [
+            [c["priority_key"] if "priority_key" in c else priority_key(c),
+             c["citizen_id"],
+             c["health_status"] in ("chronic", "critical")]
+            for c in sorted_citizens if c["citizen_id"] in failed
+        ]
+        order = lambda entry: (entry[0], id_number(entry[1]))
+        WaitlistModel.save(
+            seen,
+            list(heapq.merge(kept, entries, key=order)),
+            {s["shelter_id"]: s["available"] for s in shelters if s["available"] > 0},
+            sorted(released, key=id_number),
+        )
+
+    # ══════════════════════════════════════════
+    #  Allocation core: place citizens (already in priority order)
+    # ══════════════════════════════════════════
+    @staticmethod
+    def _allocate(sorted_citizens, shelters, mode=None):
+        """
+        Placement of `sorted_citizens` into `shelters` (annotated by
+        shelters_with_occupancy; their counts are updated in place), persisted
+        with one AssignmentModel.add_many. Returns one result dict per citizen.
+        """
+        results, planned, pairs = ShelterController._plan(sorted_citizens, shelters, mode)
+
+        # ── Persist the batch ──
+        outcomes = AssignmentModel.add_many(pairs)
+        for (idx, shelter), (success, _) in zip(planned, outcomes):
+            if not success:
+                shelter["available"] += 1
+                shelter["current_occupancy"] -= 1
+                results[idx].update({
+                    "shelter_id": "-",
+                    "shelter_name": "-",
+                    "status": "fail",
+                    "reason": STORE_ERROR,
+                })
 
-        # Sort by priority
-        sorted_citizens = self._priority_sort(unassigned)
+        return results
 
-        # Get live shelter data
-        shelters = self._get_shelters_with_occupancy()
+    @staticmethod
+    def _plan(sorted_citizens, shelters, mode=None, workers=None):
+        """
+        Plan every placement in memory (nothing is written).
+        Returns (results, planned, pairs): result dicts, (result_index, shelter)
+        per placement and the (citizen_id, shelter_id) pairs to store.
+
+        Citizens only get a shelter of their own region ("" = no region), so
+        regions never compete for beds and are planned independently: in a
+        process pool of `workers` (default SHELTER_WORKERS) for large runs.
+        The merged plan lists placements in overall priority order, exactly
+        what planning the regions one after another gives.
+        """
+        mode = mode or DEFAULT_MODE
+        if mode not in ALLOCATION_MODES:
+            raise ValueError(f"unknown allocation mode: {mode!r} (use 'greedy' or 'global')")
+
+        regions = {}    # region → (positions in sorted_citizens, citizens, shelters)
+        for i, citizen in enumerate(sorted_citizens):
+            region = regions.setdefault(citizen.get("region", ""), ([], [], []))
+            region[0].append(i)
+            region[1].append(citizen)
+        for shelter in shelters:
+            if shelter.get("region", "") in regions:
+                regions[shelter.get("region", "")][2].append(shelter)
+
+        if len(regions) == 1 and len(next(iter(regions.values()))[2]) == len(shelters):
+            return ShelterController._plan_region(sorted_citizens, shelters, mode)
+        return ShelterController._plan_regions(sorted_citizens, regions, mode, workers)
 
+    @staticmethod
+    def _plan_regions(sorted_citizens, regions, mode, workers=None):
+        """_plan() over several regions: plan each one, then merge."""
+        results = [None] * len(sorted_citizens)
+        tasks, parts = [], []
+        for positions, citizens, region_shelters in regions.values():
+            if not region_shelters:
+                for i, citizen in zip(positions, citizens):
+                    results[i] = ShelterController._fail_result(citizen, NO_REGION_SHELTER)
+                continue
+            tasks.append((citizens, [dict(s) for s in region_shelters], mode))
+            parts.append((positions, region_shelters))
+
+        workers = WORKERS if workers is None else workers
+        if workers > 1 and len(tasks) > 1 and len(sorted_citizens) >= PARALLEL_MIN:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(min(workers, len(tasks))) as pool:
+                outcomes = list(pool.map(_plan_partition, tasks))
+        else:
+            outcomes = map(_plan_partition, tasks)
+
+        merged = []     # (position in sorted_citizens, shelter, pair)
+        for (positions, region_shelters), (region_results, planned, pairs) in zip(parts, outcomes):
+            for i, result in zip(positions, region_results):
+                results[i] = result
+            for (idx, shelter_position), pair in zip(planned, pairs):
+                merged.append((positions[idx], region_shelters[shelter_position], pair))
+        merged.sort(key=lambda item: item[0])
+
+        # replay the beds taken by each region on the caller's shelter dicts
+        planned, pairs = [], []
+        for idx, shelter, pair in merged:
+            shelter["available"] -= 1
+            shelter["current_occupancy"] += 1
+            planned.append((idx, shelter))
+            pairs.append(pair)
+        return results, planned, pairs
+
+    @staticmethod
+    def _fail_result(citizen, reason):
+        return {
+            "citizen_id": citizen["citizen_id"],
+            "citizen_name": f"{citizen['first_name']} {citizen['last_name']}",
+            "shelter_id": "-",
+            "shelter_name": "-",
+            "status": "fail",
+            "reason": reason,
+        }
+
+    @staticmethod
+    def _plan_region(sorted_citizens, shelters, mode):
+        """_plan() for citizens who may use any of `shelters` (one region)."""
+        selector = ShelterSelector(shelters)
+        if mode == "global":
+            choose = ShelterController._global_chooser(sorted_citizens, selector)
+        else:
+            def choose(citizen):
+                return ShelterController._find_best_shelter(citizen, selector)
+
+        # Plan every placement in memory first, then persist the whole
+        # batch with one write (AssignmentModel.add_many)
         results = []
+        planned = []   # (result_index, shelter) for each pending assignment
+        pairs = []
         for citizen in sorted_citizens:
-            best_shelter = self._find_best_shelter(citizen, shelters)
+            best_shelter = choose(citizen)
             c_name = f"{citizen['first_name']} {citizen['last_name']}"
 
             if best_shelter is None:
@@ -154,94 +495,229 @@ class ShelterController:
                 else:
                     reason = "ศูนย์พักพิงเต็มทุกแห่ง"
 
+                results.append(ShelterController._fail_result(citizen, reason))
+            else:
+                # Reserve the bed locally so later citizens see the new count
+                selector.take(best_shelter)
+
+                planned.append((len(results), best_shelter))
+                pairs.append((citizen["citizen_id"], best_shelter["shelter_id"]))
                 results.append({
                     "citizen_id": citizen["citizen_id"],
                     "citizen_name": c_name,
-                    "shelter_id": "-",
-                    "shelter_name": "-",
-                    "status": "fail",
-                    "reason": reason,
+                    "shelter_id": best_shelter["shelter_id"],
+                    "shelter_name": best_shelter["name"],
+                    "status": "ok",
+                    "reason": "",
                 })
-            else:
-                # Assign
-                success, _ = AssignmentModel.add(citizen["citizen_id"], best_shelter["shelter_id"])
-                if success:
-                    # Update local available count
-                    best_shelter["available"] -= 1
-                    best_shelter["current_occupancy"] += 1
-
-                    results.append({
-                        "citizen_id": citizen["citizen_id"],
-                        "citizen_name": c_name,
-                        "shelter_id": best_shelter["shelter_id"],
-                        "shelter_name": best_shelter["name"],
-                        "status": "ok",
-                        "reason": "",
-                    })
-                else:
-                    results.append({
-                        "citizen_id": citizen["citizen_id"],
-                        "citizen_name": c_name,
-                        "shelter_id": "-",
-                        "shelter_name": "-",
-                        "status": "fail",
-                        "reason": "เกิดข้อผิดพลาด",
-                    })
 
-        self.view.show_assignment_results(results)
+        return results, planned, pairs
 
     # ══════════════════════════════════════════
     #  Manual-Assign: single citizen
     # ══════════════════════════════════════════
     def _manual_assign(self):
         unassigned = self._get_unassigned_citizens()
-        shelters = self._get_shelters_with_occupancy()
+        shelters = self.shelters_with_occupancy()
         available_shelters = [s for s in shelters if s["available"] > 0]
 
         citizen_id, shelter_id = self.view.manual_assign_form(unassigned, available_shelters)
         if citizen_id is None:
             return
 
-        # ── Validate citizen ──
-        citizen = CitizenModel.get_by_id(citizen_id)
-        if not citizen:
-            self.view.show_error(f"ไม่พบประชาชนรหัส {citizen_id}")
-            return
+        success, result = self.manual_assign(citizen_id, shelter_id)
+        if success:
+            citizen = CitizenModel.get_by_id(citizen_id)
+            shelter = ShelterModel.get_by_id(shelter_id)
+            self.view.show_success(
+                f"จัดสรรสำเร็จ: {citizen['first_name']} {citizen['last_name']} → {shelter['name']}"
+            )
+        else:
+            self.view.show_error(result)
 
-        if AssignmentModel.get_by_citizen(citizen_id):
-            self.view.show_error("ประชาชนคนนี้ได้รับที่พักแล้ว")
-            return
+    @staticmethod
+    def manual_assign(citizen_id, shelter_id):
+        """
+        Assign one citizen to a chosen shelter, enforcing the business rules.
+        Checks and write run in one transaction (as in transfer()), so two
+        processes cannot both take the last bed.
+        Returns (True, assignment_dict) or (False, error_msg).
+        """
+        with backend().transaction():
+            # ── Validate citizen ──
+            citizen = CitizenModel.get_by_id(citizen_id)
+            if not citizen:
+                return False, f"ไม่พบประชาชนรหัส {citizen_id}"
+
+            if AssignmentModel.get_by_citizen(citizen_id):
+                return False, "ประชาชนคนนี้ได้รับที่พักแล้ว"
+
+            # ── Validate shelter ──
+            error = ShelterController._check_shelter(citizen, shelter_id)
+            if error:
+                return False, error
 
-        # ── Validate shelter ──
+            # ── Assign ──
+            return AssignmentModel.add(citizen_id, shelter_id)
+
+    @staticmethod
+    def _check_shelter(citizen, shelter_id):
+        """
+        Can `citizen` take a bed in `shelter_id`? (exists, Business Rules 1 and 3)
+        Returns an error message, or None when the placement is allowed.
+        """
         shelter = None
-        for s in shelters:
+        for s in ShelterController.shelters_with_occupancy():
             if s["shelter_id"] == shelter_id:
                 shelter = s
                 break
 
         if not shelter:
-            self.view.show_error(f"ไม่พบศูนย์พักพิงรหัส {shelter_id}")
-            return
+            return f"ไม่พบศูนย์พักพิงรหัส {shelter_id}"
+
+        # Business Rule: regions do not share beds
+        if citizen.get("region", "") != shelter.get("region", ""):
+            return (
+                f"ศูนย์ {shelter['name']} อยู่นอกเขตของประชาชน "
+                f"(ประชาชน: {citizen['region'] or '-'}, ศูนย์: {shelter['region'] or '-'})"
+            )
 
         # Business Rule: shelter full
         if shelter["available"] <= 0:
-            self.view.show_error(f"ศูนย์ {shelter['name']} เต็มแล้ว (ความจุ {shelter['max_capacity']})")
-            return
+            return f"ศูนย์ {shelter['name']} เต็มแล้ว (ความจุ {shelter['max_capacity']})"
 
         # Business Rule: health risk → low risk shelter
-        if citizen["health_status"] in ("chronic", "critical") and shelter["risk_level"] > 2:
-            self.view.show_error(
+        if citizen["health_status"] in ("chronic", "critical") and shelter["risk_level"] > LOW_RISK_MAX:
+            return (
                 f"ผู้มีปัญหาสุขภาพ ({citizen['health_status']}) "
                 f"ต้องจัดไปศูนย์ที่มีความเสี่ยง ≤ 2 "
                 f"(ศูนย์นี้ risk_level = {shelter['risk_level']})"
             )
+        return None
+
+    # ══════════════════════════════════════════
+    #  Discharge / Transfer
+    #  เตียงที่ว่างลงนับทันที (occupancy counter แก้ในที่)
+    #  และ auto_assign_incremental() รอบถัดไปจะให้ผู้รอคิวคนถัดไป
+    #  ผู้ที่ออกแล้วกลับเข้าคิว Auto-Assign เหมือนผู้ที่ยังไม่ได้ที่พัก
+    # ══════════════════════════════════════════
+    def _discharge(self):
+        citizen_id = self.view.discharge_form()
+        if citizen_id is None:
             return
+        success, result = self.discharge(citizen_id)
+        if not success:
+            self.view.show_error(result)
+            return
+        shelter = ShelterModel.get_by_id(result["shelter_id"])
+        self.view.show_success(f"{citizen_id} ออกจาก {shelter['name'] if shelter else result['shelter_id']} แล้ว")
+        self._offer_refill([result])
 
-        # ── Assign ──
-        success, result = AssignmentModel.add(citizen_id, shelter_id)
-        if success:
-            self.view.show_success(
-                f"จัดสรรสำเร็จ: {citizen['first_name']} {citizen['last_name']} → {shelter['name']}"
-            )
-        else:
+    def _discharge_shelter(self):
+        shelter_id = self.view.discharge_shelter_form(self.shelters_with_occupancy())
+        if shelter_id is None:
+            return
+        success, result = self.discharge_shelter(shelter_id)
+        if not success:
             self.view.show_error(result)
+            return
+        self.view.show_success(f"ให้ผู้พักออกจากศูนย์ {shelter_id} แล้ว {len(result)} คน")
+        if result:
+            self._offer_refill(result)
+
+    def _transfer(self):
+        shelters = self.shelters_with_occupancy()
+        available_shelters = [s for s in shelters if s["available"] > 0]
+        citizen_id, shelter_id = self.view.transfer_form(available_shelters)
+        if citizen_id is None:
+            return
+        success, result = self.transfer(citizen_id, shelter_id)
+        if not success:
+            self.view.show_error(result)
+            return
+        shelter = ShelterModel.get_by_id(shelter_id)
+        self.view.show_success(f"ย้าย {citizen_id} ไป {shelter['name']} แล้ว")
+
+    def _offer_refill(self, discharged):
+        """Hand the freed beds to the waitlist right away if the user wants."""
+        if self.view.ask_refill():
+            self._auto_assign_incremental(exclude={a["citizen_id"] for a in discharged})
+
+    def _auto_assign_incremental(self, exclude=()):
+        results = self.auto_assign_incremental(exclude=exclude)
+        if not results:
+            self.view.show_info("ไม่มีประชาชนที่รอจัดสรร")
+            return
+        self.view.show_assignment_results(results)
+
+    @staticmethod
+    def discharge(citizen_id):
+        """
+        Discharge one citizen: their bed is free immediately and goes to the
+        next waitlisted citizen on the next (incremental) Auto-Assign.
+        Returns (True, discharged_assignment) or (False, error_msg).
+        """
+        if not CitizenModel.get_by_id(citizen_id):
+            return False, f"ไม่พบประชาชนรหัส {citizen_id}"
+        with backend().transaction():
+            success, result = AssignmentModel.discharge(citizen_id)
+            if success:
+                WaitlistModel.release([citizen_id])
+        return success, result
+
+    @staticmethod
+    def discharge_shelter(shelter_id):
+        """
+        Discharge everyone in one shelter (e.g. the shelter is closing).
+        Returns (True, [discharged_assignment, ...]) or (False, error_msg).
+        """
+        if not ShelterModel.get_by_id(shelter_id):
+            return False, f"ไม่พบศูนย์พักพิงรหัส {shelter_id}"
+        with backend().transaction():
+            discharged = AssignmentModel.discharge_shelter(shelter_id)
+            if discharged:
+                WaitlistModel.release([a["citizen_id"] for a in discharged])
+        return True, discharged
+
+    @staticmethod
+    def discharge_and_refill(citizen_id=None, shelter_id=None, mode=None):
+        """
+        discharge(citizen_id) or discharge_shelter(shelter_id), then hand the
+        freed beds to waiting citizens in the same transaction. Those just
+        discharged are left out of that run: their beds go to the waitlist.
+        Returns (True, [discharged_assignment, ...], refill_results)
+        or (False, error_msg, None).
+        """
+        with backend().transaction():
+            if shelter_id:
+                success, result = ShelterController.discharge_shelter(shelter_id)
+            else:
+                success, result = ShelterController.discharge(citizen_id)
+                result = [result] if success else result
+            if not success:
+                return False, result, None
+            exclude = {a["citizen_id"] for a in result}
+            return True, result, ShelterController.auto_assign_incremental(mode, exclude)
+
+    @staticmethod
+    def transfer(citizen_id, shelter_id):
+        """
+        Move an assigned citizen to another shelter, enforcing the same
+        rules as manual_assign(). The old bed is freed in the same write.
+        Returns (True, new_assignment) or (False, error_msg).
+        """
+        with backend().transaction():
+            citizen = CitizenModel.get_by_id(citizen_id)
+            if not citizen:
+                return False, f"ไม่พบประชาชนรหัส {citizen_id}"
+
+            current = AssignmentModel.get_by_citizen(citizen_id)
+            if not current:
+                return False, "ประชาชนคนนี้ยังไม่ได้รับที่พัก"
+            if current["shelter_id"] == shelter_id:
+                return False, f"ประชาชนคนนี้อยู่ที่ศูนย์ {shelter_id} อยู่แล้ว"
+
+            error = ShelterController._check_shelter(citizen, shelter_id)
+            if error:
+                return False, error
+            return AssignmentModel.transfer(citizen_id, shelter_id)
@@ -0,0 +1,81 @@
+"""
+ShelterSelector: โครงสร้างเลือกศูนย์พักพิงที่ดีที่สุดแบบ heap
+ใช้ใน Auto-Assign แทนการกรอง + sort รายการศูนย์ใหม่ทุกครั้งต่อประชาชนหนึ่งคน
+
+ลำดับการเลือกเหมือนเดิมทุกประการ:
+  risk_level น้อยก่อน → ที่ว่างมากก่อน → ลำดับในไฟล์ shelters.csv
+
+โหมด global (reserve_low): ผู้ที่ไม่ต้องการศูนย์ความเสี่ยงต่ำจะได้ศูนย์ risk ≤ 2
+ก็ต่อเมื่อยังมีที่ว่างในกลุ่มนั้นเกินจำนวนที่กันไว้ให้ผู้ป่วย มิฉะนั้นได้ศูนย์ risk > 2 ที่ดีที่สุด
+"""
+import heapq
+
+LOW_RISK_MAX = 2  # Business Rule 3: chronic/critical → risk_level ≤ 2
+
+
+class ShelterSelector:
+    """
+    Two priority queues over the same shelter dicts:
+      pool[False] → every shelter with a free bed
+      pool[True]  → only shelters with risk_level ≤ LOW_RISK_MAX
+    plus a third one, high, with only risk_level > LOW_RISK_MAX (used when
+    low-risk beds are reserved). `free[pool]` is the number of free beds.
+    Entries are (risk_level, -available, position). An entry whose
+    `available` no longer matches the shelter is stale and is dropped
+    lazily when it reaches the top, so each update costs O(log S).
+    """
+
+    def __init__(self, shelters):
+        """shelters = dicts with shelter_id, risk_level, available, current_occupancy."""
+        self._shelters = list(shelters)
+        self._position = {s["shelter_id"]: i for i, s in enumerate(self._shelters)}
+        self._pools = {False: [], True: []}
+        self._high = []
+        self.free = {False: 0, True: 0}
+        for i, s in enumerate(self._shelters):
+            self._push(i, s)
+            if s["available"] > 0:
+                self.free[False] += s["available"]
+                if s["risk_level"] <= LOW_RISK_MAX:
+                    self.free[True] += s["available"]
+
+    def _push(self, i, shelter):
+        if shelter["available"] <= 0:
+            return
+        entry = (shelter["risk_level"], -shelter["available"], i)
+        heapq.heappush(self._pools[False], entry)
+        if shelter["risk_level"] <= LOW_RISK_MAX:
+            heapq.heappush(self._pools[True], entry)
+        else:
+            heapq.heappush(self._high, entry)
+
+    def best(self, needs_low_risk, reserve_low=0):
+        """
+        Best shelter with a free bed (low-risk pool only if needed), or None.
+        reserve_low = low-risk beds to keep for others: a citizen who does not
+        need one only gets a low-risk shelter while more than that are free.
+        """
+        shelter = self._top(self._pools[needs_low_risk])
+        if (reserve_low and not needs_low_risk and shelter is not None
+                and shelter["risk_level"] <= LOW_RISK_MAX
+                and self.free[True] <= reserve_low):
+            shelter = self._top(self._high)
+        return shelter
+
+    def _top(self, heap):
+        while heap:
+            _, neg_available, i = heap[0]
+            shelter = self._shelters[i]
+            if shelter["available"] > 0 and -neg_available == shelter["available"]:
+                return shelter
+            heapq.heappop(heap)  # stale entry
+        return None
+
+    def take(self, shelter):
+        """Reserve one bed in `shelter` and re-queue it with its new count."""
+        shelter["available"] -= 1
+        shelter["current_occupancy"] += 1
+        self.free[False] -= 1
+        if shelter["risk_level"] <= LOW_RISK_MAX:
+            self.free[True] -= 1
+        self._push(self._position[shelter["shelter_id"]], shelter)
@@ -3,9 +3,7 @@ import os
 
 sys.path.insert(0, os.path.dirname(__file__))
 
-from controllers.citizen_controller import CitizenController
-from controllers.shelter_controller import ShelterController
-from controllers.report_controller import ReportController
+from models import metrics
 
 
 def print_banner():
@@ -28,12 +26,23 @@ def main_menu():
     print("  1) 📋  หน้าลงทะเบียนประชาชน      (View 1)")
     print("  2) 🏠  หน้าจัดสรรที่พัก            (View 2)")
     print("  3) 📊  หน้ารายงานผล               (View 3)")
+    if metrics.ENABLED:
+        print("  4) ⏱   สถิติการทำงาน (metrics)")
     print("  0) 🚪  ออกจากโปรแกรม")
     print("═" * 50)
     return input("  เลือก: ").strip()
 
 
 def main():
+    # Arguments → batch mode (see cli.py); none → interactive menu
+    if len(sys.argv) > 1:
+        from cli import run
+        sys.exit(run(sys.argv[1:]))
+
+    from controllers.citizen_controller import CitizenController
+    from controllers.shelter_controller import ShelterController
+    from controllers.report_controller import ReportController
+
     print_banner()
 
     # Initialize controllers
@@ -50,11 +59,15 @@ def main():
             shelter_ctrl.run()
         elif choice == "3":
             report_ctrl.run()
+        elif choice == "4" and metrics.ENABLED:
+            print()
+            print(metrics.format_report())
         elif choice == "0":
             print("\n  👋  ขอบคุณที่ใช้งานระบบ\n")
             break
         else:
-            print("  ❌  กรุณาเลือก 0-3")
+            # item 4 (metrics) is on the menu only when SHELTER_METRICS is on
+            print(f"  ❌  กรุณาเลือก 0-{4 if metrics.ENABLED else 3}")
 
 
 if __name__ == "__main__":
@@ -2,89 +2,172 @@
 Model: AssignmentModel
 ดูแลข้อมูลการจัดสรรที่พักพิง (assignments.csv)
 """
-import csv
-import os
 from datetime import date
 
-DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
-ASSIGNMENTS_FILE = os.path.join(DATA_DIR, "assignments.csv")
+from models.storage import backend, DuplicateError
+from models.metrics import instrument
 
 FIELDS = ["assignment_id", "citizen_id", "shelter_id", "assigned_date", "status"]
 
+ACTIVE = "active"
+DISCHARGED = "discharged"
 
+ALREADY_ASSIGNED = "ประชาชนคนนี้ได้รับการจัดสรรแล้ว (Already assigned)"
+NOT_ASSIGNED = "ประชาชนคนนี้ยังไม่ได้รับที่พัก (Not assigned)"
+
+
+@instrument
 class AssignmentModel:
     """Data access for assignments table."""
 
     # ──────────── READ ────────────
     @staticmethod
     def get_all():
-        assignments = []
-        with open(ASSIGNMENTS_FILE, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row.get("assignment_id"):  # skip blank rows
-                    assignments.append(row)
-        return assignments
+        return list(backend().assignments())
 
     @staticmethod
     def get_active():
         """Return only active (not discharged) assignments."""
-        return [a for a in AssignmentModel.get_all() if a["status"] == "active"]
+        return [a for a in backend().assignments() if a["status"] == ACTIVE]
 
     @staticmethod
     def get_by_citizen(citizen_id):
         """Check if a citizen already has an active assignment."""
-        for a in AssignmentModel.get_active():
-            if a["citizen_id"] == citizen_id:
-                return a
-        return None
+        return backend().active_assignment(citizen_id)
 
     @staticmethod
     def count_by_shelter(shelter_id):
         """Count active occupants in a shelter."""
-        return sum(1 for a in AssignmentModel.get_active() if a["shelter_id"] == shelter_id)
+        return backend().occupancy().get(shelter_id, 0)
+
+    @staticmethod
+    def occupancy_map():
+        """
+        Active occupants of every shelter in one call: {shelter_id: count}.
+        Shelters with nobody assigned are absent (use .get(sid, 0)).
+        """
+        return backend().occupancy()
+
+    @staticmethod
+    def count_active():
+        """Number of active assignments, from the assignment rows (counter, no scan)."""
+        return backend().active_assignment_count()
+
+    @staticmethod
+    def get_active_in_shelter(shelter_id):
+        """Active assignments of one shelter (index lookup)."""
+        return backend().active_in_shelter(shelter_id)
 
     @staticmethod
     def get_assigned_citizen_ids():
         """Return set of citizen_ids that have active assignments."""
-        return {a["citizen_id"] for a in AssignmentModel.get_active()}
+        return backend().assigned_citizen_ids()
 
     # ──────────── WRITE ────────────
-    @staticmethod
-    def _write_all(assignments):
-        with open(ASSIGNMENTS_FILE, "w", encoding="utf-8", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=FIELDS)
-            writer.writeheader()
-            writer.writerows(assignments)
-
     @staticmethod
     def add(citizen_id, shelter_id):
         """
         Create a new assignment.
         Returns (True, assignment_dict) or (False, error_msg).
         """
-        assignments = AssignmentModel.get_all()
-
-        # Check duplicate
-        for a in assignments:
-            if a["citizen_id"] == citizen_id and a["status"] == "active":
-                return False, "ประชาชนคนนี้ได้รับการจัดสรรแล้ว (Already assigned)"
-
-        # Auto-generate ID
-        if assignments:
-            max_num = max(int(a["assignment_id"][1:]) for a in assignments)
-            new_id = f"A{max_num + 1:03d}"
-        else:
-            new_id = "A001"
-
-        new_assignment = {
-            "assignment_id": new_id,
-            "citizen_id": citizen_id,
-            "shelter_id": shelter_id,
-            "assigned_date": str(date.today()),
-            "status": "active",
-        }
-
-        assignments.append(new_assignment)
-        AssignmentModel._write_all(assignments)
+        success, result = AssignmentModel.add_many([(citizen_id, shelter_id)])[0]
+        return success, result
+
+    @staticmethod
+    def add_many(pairs):
+        """
+        Create many assignments in one pass (bulk auto-assign).
+        pairs = [(citizen_id, shelter_id), ...]
+
+        Checks duplicates against existing active assignments (index lookup)
+        and within the batch, takes one id block for the new rows and stores
+        them in one backend write, all inside one transaction.
+        Returns a list with one (True, assignment_dict) or (False, error_msg)
+        per input pair, in the same order.
+        """
+        db = backend()
+        batch_ids = set()
+        today = str(date.today())
+
+        results = []
+        new_rows = []
+        try:
+            with db.transaction():
+                for citizen_id, shelter_id in pairs:
+                    if citizen_id in batch_ids or db.active_assignment(citizen_id):
+                        results.append((False, ALREADY_ASSIGNED))
+                        continue
+
+                    new_assignment = {
+                        "assignment_id": None,  # numbered below, one id block per batch
+                        "citizen_id": citizen_id,
+                        "shelter_id": shelter_id,
+                        "assigned_date": today,
+                        "status": ACTIVE,
+                    }
+                    batch_ids.add(citizen_id)
+                    new_rows.append(new_assignment)
+                    results.append((True, new_assignment))
+
+                if new_rows:
+                    for row, new_id in zip(new_rows, db.next_ids("A", len(new_rows))):
+                        row["assignment_id"] = new_id
+                    db.insert_assignments(new_rows)
+        except DuplicateError:
+            # another writer got there first; the transaction was rolled back
+            return [(False, ALREADY_ASSIGNED) for _ in pairs]
+        return results
+
+    # ──────────── DISCHARGE / TRANSFER ────────────
+    # Ended assignments are stored as a new version of the row with status
+    # "discharged" (no table rescan: the backend updates the occupancy
+    # counter and the active-by-citizen index for those rows only).
+    @staticmethod
+    def discharge(citizen_id):
+        """
+        End a citizen's active assignment (frees one bed).
+        Returns (True, discharged_assignment) or (False, error_msg).
+        """
+        db = backend()
+        with db.transaction():
+            active = db.active_assignment(citizen_id)
+            if not active:
+                return False, NOT_ASSIGNED
+            discharged = dict(active, status=DISCHARGED)
+            db.save_assignments([discharged])
+        return True, discharged
+
+    @staticmethod
+    def discharge_shelter(shelter_id):
+        """
+        Discharge everyone in a shelter with one backend write.
+        Returns the discharged assignments (empty if nobody was there).
+        """
+        db = backend()
+        with db.transaction():
+            discharged = [dict(a, status=DISCHARGED) for a in db.active_in_shelter(shelter_id)]
+            if discharged:
+                db.save_assignments(discharged)
+        return discharged
+
+    @staticmethod
+    def transfer(citizen_id, shelter_id):
+        """
+        Move a citizen to another shelter: the active assignment is discharged
+        and a new one created, both in one backend write.
+        Returns (True, new_assignment) or (False, error_msg).
+        """
+        db = backend()
+        with db.transaction():
+            active = db.active_assignment(citizen_id)
+            if not active:
+                return False, NOT_ASSIGNED
+            new_assignment = {
+                "assignment_id": db.next_ids("A")[0],
+                "citizen_id": citizen_id,
+                "shelter_id": shelter_id,
+                "assigned_date": str(date.today()),
+                "status": ACTIVE,
+            }
+            db.save_assignments([dict(active, status=DISCHARGED), new_assignment])
         return True, new_assignment
@@ -2,19 +2,50 @@
 Model: CitizenModel
 ดูแลข้อมูลประชาชน (citizens.csv)
 """
-import csv
-import os
 from datetime import date
 
-DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
-CITIZENS_FILE = os.path.join(DATA_DIR, "citizens.csv")
+from models.storage import backend, DuplicateError
+from models.metrics import instrument
 
 FIELDS = [
     "citizen_id", "national_id", "first_name", "last_name",
-    "age", "health_status", "citizen_type", "registered_date", "phone"
+    "age", "health_status", "citizen_type", "registered_date", "phone", "region"
 ]
 
+# ─── Allocation priority (see ShelterController._priority_sort) ───
+TYPE_ORDER = {"risk_group": 0, "vip": 1, "general": 2}
+HEALTH_ORDER = {"critical": 0, "chronic": 1, "healthy": 2}
+DATE_RANK_MAX = 99999999  # "9999-99-99"
+DATE_BITS = 27            # 2**27 > 99999999
 
+AGE_MIN, AGE_MAX = 0, 130
+DUPLICATE_NATIONAL_ID = "เลขบัตรประชาชนนี้ลงทะเบียนแล้ว (Duplicate national ID)"
+
+
+def _date_rank(value):
+    """YYYY-MM-DD → YYYYMMDD as int (same order as comparing the strings)."""
+    digits = (value or "9999-99-99").replace("-", "")
+    return int(digits) if len(digits) == 8 and digits.isdigit() else DATE_RANK_MAX
+
+
+def priority_key(citizen):
+    """
+    Allocation priority packed into one int (smaller = allocated first):
+      bit 31      age group  (0 = child < 15 or elderly >= 60)
+      bits 29-30  citizen_type rank  (risk_group, vip, general)
+      bits 27-28  health rank  (critical, chronic, healthy)
+      bits 0-26   registered_date as YYYYMMDD
+    Comparing keys gives the same order as comparing the tuple
+    (age group, type rank, health rank, registered_date).
+    """
+    age_rank = 0 if (citizen["age"] < 15 or citizen["age"] >= 60) else 1
+    type_rank = TYPE_ORDER.get(citizen["citizen_type"], 3)
+    health_rank = HEALTH_ORDER.get(citizen["health_status"], 3)
+    head = (age_rank << 4) | (type_rank << 2) | health_rank
+    return (head << DATE_BITS) | _date_rank(citizen.get("registered_date"))
+
+
+@instrument
 class CitizenModel:
     """Data access for citizens table."""
 
@@ -22,78 +53,142 @@ class CitizenModel:
     @staticmethod
     def get_all():
         """Return list of all citizens as dicts."""
-        citizens = []
-        with open(CITIZENS_FILE, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                row["age"] = int(row["age"])
-                citizens.append(row)
-        return citizens
+        return list(backend().citizens())
+
+    @staticmethod
+    def iter_all():
+        """Yield citizens one by one (for paged views on large populations)."""
+        return backend().iter_citizens()
+
+    @staticmethod
+    def iter_columns(columns):
+        """
+        Yield one tuple per citizen holding only `columns` (names from FIELDS).
+        Much cheaper than get_all() when the table is not loaded yet:
+        the CSV backend reads just those columns from the mapped file.
+        """
+        return backend().citizen_columns(columns)
+
+    @staticmethod
+    def type_counts(assigned_ids, workers=None):
+        """
+        (total, assigned, by_type) for the report summary; see
+        StorageBackend.citizen_type_counts. Large CSV files are counted
+        in a process pool (REPORT_WORKERS, models.parallel_counts).
+        """
+        return backend().citizen_type_counts(assigned_ids, workers)
+
+    @staticmethod
+    def get_since(position):
+        """Citizens registered after the first `position` (for incremental runs)."""
+        return backend().citizens_since(position)
 
     @staticmethod
     def get_by_id(citizen_id):
-        for c in CitizenModel.get_all():
-            if c["citizen_id"] == citizen_id:
-                return c
-        return None
+        return backend().citizen_by_id(citizen_id)
 
     @staticmethod
     def get_by_national_id(national_id):
-        for c in CitizenModel.get_all():
-            if c["national_id"] == national_id:
-                return c
-        return None
+        return backend().citizen_by_national_id(national_id)
 
     @staticmethod
     def get_by_type(citizen_type):
         """Filter citizens by type: general, risk_group, vip."""
-        return [c for c in CitizenModel.get_all() if c["citizen_type"] == citizen_type]
+        return [c for c in backend().citizens() if c["citizen_type"] == citizen_type]
 
-    # ──────────── WRITE ────────────
+    # ──────────── VALIDATION ────────────
     @staticmethod
-    def _write_all(citizens):
-        """Overwrite entire CSV with updated list."""
-        with open(CITIZENS_FILE, "w", encoding="utf-8", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=FIELDS)
-            writer.writeheader()
-            writer.writerows(citizens)
+    def validate(citizen_data):
+        """
+        Check one registration (form or import file) before it is stored.
+        Converts national_id to str and age to int in place.
+        Returns None if valid, otherwise an error message.
+        """
+        national_id = str(citizen_data.get("national_id") or "").strip()
+        if len(national_id) != 13 or not national_id.isdigit():
+            return "เลขบัตรประชาชนต้องเป็นตัวเลข 13 หลัก"
+        # stored as the string: a numeric id (JSON) would miss the duplicate index
+        citizen_data["national_id"] = national_id
 
+        try:
+            citizen_data["age"] = int(citizen_data.get("age"))
+        except (TypeError, ValueError):
+            return "อายุต้องเป็นตัวเลข"
+        if not AGE_MIN <= citizen_data["age"] <= AGE_MAX:
+            return f"อายุต้องอยู่ระหว่าง {AGE_MIN}-{AGE_MAX} ปี"
+
+        if not citizen_data.get("first_name") or not citizen_data.get("last_name"):
+            return "ต้องระบุชื่อและนามสกุล"
+        if citizen_data.get("health_status") not in HEALTH_ORDER:
+            return f"สุขภาพไม่ถูกต้อง: {citizen_data.get('health_status')}"
+        if citizen_data.get("citizen_type") not in TYPE_ORDER:
+            return f"ประเภทไม่ถูกต้อง: {citizen_data.get('citizen_type')}"
+        citizen_data["region"] = str(citizen_data.get("region") or "").strip()
+        return None
+
+    # ──────────── WRITE ────────────
     @staticmethod
     def add(citizen_data):
         """
         Add a new citizen. Auto-generates citizen_id.
         Returns (True, citizen_dict) on success, (False, error_msg) on failure.
         """
-        citizens = CitizenModel.get_all()
-
-        # Business Rule หลักตือ ประชาชนหนึ่งคนลงทะเบียนได้เพียงครั้งเดียว
-        for c in citizens:
-            if c["national_id"] == citizen_data["national_id"]:
-                return False, "เลขบัตรประชาชนนี้ลงทะเบียนแล้ว (Duplicate national ID)"
-
-        # Auto-generate next citizen_id
-        if citizens:
-            max_num = max(int(c["citizen_id"][1:]) for c in citizens)
-            new_id = f"C{max_num + 1:03d}"
-        else:
-            new_id = "C001"
-
-        new_citizen = {
-            "citizen_id": new_id,
-            "national_id": citizen_data["national_id"],
-            "first_name": citizen_data["first_name"],
-            "last_name": citizen_data["last_name"],
-            "age": citizen_data["age"],
-            "health_status": citizen_data["health_status"],
-            "citizen_type": citizen_data["citizen_type"],
-            "registered_date": str(date.today()),
-            "phone": citizen_data.get("phone", "-"),
-        }
-
-        citizens.append(new_citizen)
-        CitizenModel._write_all(citizens)
-        return True, new_citizen
+        return CitizenModel.add_many([citizen_data])[0]
+
+    @staticmethod
+    def add_many(citizen_datas):
+        """
+        Add a batch of citizens in one transaction (bulk import).
+        Duplicates are checked against stored national_ids (index lookup)
+        and within the batch (set); the rest get one id block and one write.
+        Returns one (True, citizen_dict) or (False, error_msg) per input.
+        """
+        db = backend()
+        today = str(date.today())
+        seen = set()
+
+        results = []
+        new_citizens = []
+        try:
+            with db.transaction():
+                for citizen_data in citizen_datas:
+                    national_id = citizen_data["national_id"]
+
+                    # Business Rule หลักตือ ประชาชนหนึ่งคนลงทะเบียนได้เพียงครั้งเดียว
+                    if national_id in seen or db.citizen_by_national_id(national_id):
+                        results.append((False, DUPLICATE_NATIONAL_ID))
+                        continue
+                    seen.add(national_id)
+
+                    new_citizen = {
+                        "citizen_id": None,  # numbered below, one id block per batch
+                        "national_id": national_id,
+                        "first_name": citizen_data["first_name"],
+                        "last_name": citizen_data["last_name"],
+                        "age": citizen_data["age"],
+                        "health_status": citizen_data["health_status"],
+                        "citizen_type": citizen_data["citizen_type"],
+                        "registered_date": today,
+                        "phone": citizen_data.get("phone") or "-",
+                        "region": citizen_data.get("region") or "",
+                    }
+                    new_citizen["priority_key"] = priority_key(new_citizen)
+                    new_citizens.append(new_citizen)
+                    results.append((True, new_citizen))
+
+                if new_citizens:
+                    # Auto-generate next citizen_ids
+                    for c, new_id in zip(new_citizens, db.next_ids("C", len(new_citizens))):
+                        c["citizen_id"] = new_id
+                    db.insert_citizens(new_citizens)
+        except DuplicateError:
+            # another writer registered one of them first; nothing was stored.
+            # Retry one by one so only the real duplicates are reported.
+            if len(citizen_datas) == 1:
+                return [(False, DUPLICATE_NATIONAL_ID)]
+            return [CitizenModel.add_many([c])[0] for c in citizen_datas]
+        return results
 
     @staticmethod
     def count():
-        return len(CitizenModel.get_all())
+        return backend().citizen_count()
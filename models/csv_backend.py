@@ -0,0 +1,255 @@
+"""
+CsvBackend: เก็บข้อมูลเป็นไฟล์ CSV ในโฟลเดอร์ data/ (ค่าเริ่มต้นของระบบ)
+อ่านผ่าน repository (cache + hash index), ออกรหัสผ่าน sequence,
+เพิ่มข้อมูลแบบ append และเขียนใหม่ทั้งไฟล์เฉพาะตอน compact()
+
+หลายโปรเซสใช้โฟลเดอร์เดียวกันได้: transaction() ถือ lock ไฟล์ data/.lock
+แบบ exclusive ระหว่างตรวจสอบ → ออกรหัส → เขียน จึงไม่มีการเขียนทับกัน
+
+assignments.csv มี write-ahead journal (data/assignments.csv.journal, models.journal):
+โปรเซสที่ตายกลางการเขียนไม่ทิ้งแถวครึ่ง ๆ หรือ batch ที่ไม่ครบไว้ และ fsync
+รวมครั้งเดียวต่อ transaction ชั้นนอกสุด / group_commit()
+"""
+import contextlib
+import functools
+import os
+
+from models import repository, csv_scan, parallel_counts
+from models.filelock import file_lock
+from models.journal import journal
+from models.sequence import sequence
+from models.storage import StorageBackend
+from models.citizen_model import FIELDS as CITIZEN_FIELDS, priority_key
+from models.shelter_model import ShelterModel
+from models.assignment_model import FIELDS as ASSIGNMENT_FIELDS
+from models.records import citizen_record, shelter_record, assignment_record
+
+# columns with few distinct values: a column scan decodes each value once
+CITIZEN_SHARED = ("health_status", "citizen_type", "registered_date", "region")
+ASSIGNMENT_SHARED = ("shelter_id", "assigned_date", "status")
+CITIZEN_TYPES = {"age": int}
+
+
+# ─── row parsers: CSV strings → typed records (models.records) ───
+def _parse_citizen(row):
+    row["age"] = int(row["age"])
+    row["priority_key"] = priority_key(row)
+    return citizen_record(row)
+
+
+def _parse_shelter(row):
+    row["max_capacity"] = int(row["max_capacity"])
+    row["risk_level"] = int(row["risk_level"])
+    return shelter_record(row)
+
+
+def _parse_assignment(row):
+    if not row.get("assignment_id"):
+        return None  # skip blank rows
+    return assignment_record(row)
+
+
+class CsvBackend(StorageBackend):
+    """StorageBackend over citizens.csv, shelters.csv and assignments.csv."""
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self.citizens_file = os.path.join(data_dir, "citizens.csv")
+        self.shelters_file = os.path.join(data_dir, "shelters.csv")
+        self.assignments_file = os.path.join(data_dir, "assignments.csv")
+        self.sequence = sequence(os.path.join(data_dir, "sequences.json"))
+        self.lock = file_lock(os.path.join(data_dir, ".lock"))
+        self.journal = journal(self.assignments_file, self.lock)
+
+    # ──────────── cached tables (each spec built once per backend) ────────────
+    @functools.cached_property
+    def _citizens(self):
+        """Citizens table, indexed by citizen_id and national_id."""
+        return repository.table(
+            self.citizens_file,
+            CITIZEN_FIELDS,
+            parse_row=_parse_citizen,
+            record=citizen_record,
+            lock=self.lock,
+            unique={
+                "citizen_id": lambda c: c["citizen_id"],
+                "national_id": lambda c: c["national_id"],
+            },
+        )
+
+    @functools.cached_property
+    def _shelters(self):
+        """Shelters table, indexed by shelter_id."""
+        return repository.table(
+            self.shelters_file,
+            ShelterModel.FIELDS,
+            parse_row=_parse_shelter,
+            record=shelter_record,
+            lock=self.lock,
+            unique={"shelter_id": lambda s: s["shelter_id"]},
+        )
+
+    @functools.cached_property
+    def _assignments(self):
+        """
+        Assignments table, indexed by (citizen_id, status) and
+        (shelter_id, status), with an active-occupancy counter per shelter
+        and a row counter per status.
+        Keyed by assignment_id: an appended row with a known id is the new
+        version of that assignment (discharge / transfer).
+        """
+        return repository.table(
+            self.assignments_file,
+            ASSIGNMENT_FIELDS,
+            parse_row=_parse_assignment,
+            record=assignment_record,
+            lock=self.lock,
+            key=lambda a: a["assignment_id"],
+            journal=self.journal,
+            group={
+                "citizen_status": lambda a: (a["citizen_id"], a["status"]),
+                "shelter_status": lambda a: (a["shelter_id"], a["status"]),
+            },
+            counter={
+                "occupancy": lambda a: a["shelter_id"] if a["status"] == "active" else None,
+                "status": lambda a: a["status"],
+            },
+        )
+
+    def _scan(self, path, shared):
+        """Column reader over a file whose table is not cached (models.csv_scan)."""
+        return csv_scan.scan(path, shared, lock=self.lock)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Exclusive cross-process lock; tables re-check their files inside it.
+        Journaled writes inside are committed (one fsync) when the outermost
+        transaction ends, before the lock is released.
+        """
+        with self.lock.hold(exclusive=True), self.journal.group():
+            yield self
+
+    def group_commit(self):
+        return self.journal.group()
+
+    # ──────────── citizens ────────────
+    def citizens(self):
+        return self._citizens.all()
+
+    def citizen_columns(self, columns):
+        # cached table: project the rows; otherwise map the file and decode
+        # only `columns` instead of loading every field of every row
+        if self._citizens.is_current():
+            return super().citizen_columns(columns)
+        rows = self._scan(self.citizens_file, CITIZEN_SHARED).rows(columns)
+        convert = [CITIZEN_TYPES.get(c) for c in columns]
+        if not any(convert):
+            return rows
+        return (tuple(f(v) if f else v for f, v in zip(convert, row)) for row in rows)
+
+    def citizen_type_counts(self, assigned_ids, workers=None):
+        # large file: ranges of rows counted in a process pool (models.parallel_counts)
+        workers = parallel_counts.WORKERS if workers is None else workers
+        if workers > 1:
+            scan = self._scan(self.citizens_file, CITIZEN_SHARED)
+            if len(scan) >= parallel_counts.PARALLEL_MIN:
+                return parallel_counts.type_counts(scan, assigned_ids, workers)
+        return super().citizen_type_counts(assigned_ids, workers)
+
+    def citizens_since(self, position):
+        return self._citizens.all()[position:]
+
+    def citizen_count(self):
+        return len(self._citizens.all())
+
+    def citizen_by_id(self, citizen_id):
+        return self._citizens.get("citizen_id", citizen_id)
+
+    def citizen_by_national_id(self, national_id):
+        return self._citizens.get("national_id", national_id)
+
+    def insert_citizens(self, citizens):
+        with self.transaction():
+            self._citizens.append(citizens)
+
+    # ──────────── shelters ────────────
+    def shelters(self):
+        # copies, so controllers may annotate them (current_occupancy, available)
+        return [dict(s) for s in self._shelters.all()]
+
+    def shelter_by_id(self, shelter_id):
+        shelter = self._shelters.get("shelter_id", shelter_id)
+        return dict(shelter) if shelter else None
+
+    # ──────────── assignments ────────────
+    def assignments(self):
+        return self._assignments.all()
+
+    def active_assignment(self, citizen_id):
+        active = self._assignments.group("citizen_status", (citizen_id, "active"))
+        return active[0] if active else None
+
+    def occupancy(self):
+        return self._assignments.counter("occupancy")
+
+    def active_in_shelter(self, shelter_id):
+        return list(self._assignments.group("shelter_status", (shelter_id, "active")))
+
+    def active_assignment_count(self):
+        return self._assignments.count("status", "active")
+
+    def _citizen_ids_with_status(self, status):
+        table = self._assignments
+        if table.is_current():
+            return {a["citizen_id"] for a in table.all() if a["status"] == status}
+        # not cached: three columns of the file, latest version of each assignment
+        table.recover()
+        latest = {}
+        rows = self._scan(self.assignments_file, ASSIGNMENT_SHARED).rows(
+            ("assignment_id", "citizen_id", "status")
+        )
+        for assignment_id, citizen_id, row_status in rows:
+            if assignment_id:
+                latest[assignment_id] = (citizen_id, row_status)
+        return {citizen_id for citizen_id, row_status in latest.values() if row_status == status}
+
+    def assigned_citizen_ids(self):
+        return self._citizen_ids_with_status("active")
+
+    def insert_assignments(self, assignments):
+        with self.transaction():
+            self._assignments.append(assignments)
+
+    def save_assignments(self, assignments):
+        # new versions are appended; compact() drops the superseded rows
+        with self.transaction():
+            self._assignments.append(assignments)
+
+    # ──────────── maintenance ────────────
+    def version(self):
+        # file stats only: asking for the version must not load the tables
+        signatures = []
+        for path in (self.citizens_file, self.shelters_file, self.assignments_file):
+            st = os.stat(path)
+            signatures.append((st.st_mtime_ns, st.st_size))
+        return tuple(signatures)
+
+    def next_ids(self, prefix, count=1):
+        if prefix == "C":
+            table, column = self._citizens, "citizen_id"
+        else:
+            table, column = self._assignments, "assignment_id"
+        with self.transaction():
+            return self.sequence.allocate(
+                prefix, count,
+                existing_ids=lambda: (row[column] for row in table.all()),
+            )
+
+    def compact(self):
+        with self.transaction():
+            for table in (self._citizens, self._assignments):
+                table.rewrite(list(table.all()))
+
+    def state_path(self, name):
+        return os.path.join(self.data_dir, name)
@@ -0,0 +1,227 @@
+"""
+CsvScan: อ่านไฟล์ CSV แบบ memory-map เฉพาะคอลัมน์ที่ต้องการ
+ไม่ต้องโหลดทั้งตารางเข้า cache (repository) และไม่ถอดรหัสทุกช่องทุกแถว
+
+  offsets    = ตำแหน่ง byte เริ่มต้นของแต่ละแถว (array "Q") + ตำแหน่งท้ายไฟล์
+               สร้างครั้งแรกครั้งเดียว ไฟล์ที่ถูก append (inode เดิม ขนาดเพิ่ม)
+               สร้างต่อเฉพาะส่วนที่เพิ่ม ไฟล์ที่ถูกเขียนใหม่ (compact) สร้างใหม่
+  rows(cols) = tuple ของค่าเฉพาะคอลัมน์ที่ขอ ตามลำดับในไฟล์
+               แถวที่ไม่มี " ใช้ bytes.split ตัดแค่ถึงคอลัมน์สุดท้ายที่ขอ
+               แถวที่มี " (ช่องที่มี , หรือขึ้นบรรทัดใหม่) ใช้ csv.reader
+  shared     = คอลัมน์ที่ค่าซ้ำกันมาก (health_status, status, ...) ถอดรหัส
+               ครั้งเดียวต่อค่า แล้วใช้ string ตัวเดียวกันทุกแถว
+
+ถ้ามี NumPy จะหาตำแหน่งขึ้นบรรทัดใหม่ด้วย NumPy (ไฟล์ที่ไม่มี ")
+โปรเซสอื่นใช้ offset index ที่สร้างแล้วได้ผ่าน attach() (เช่น ส่งมาทาง shared memory
+ใน models.parallel_counts) โดยไม่ต้องอ่านทั้งไฟล์เพื่อสร้างใหม่
+"""
+import contextlib
+import csv
+import mmap
+import os
+from array import array
+
+from models import metrics, optional
+
+NEWLINE = ord("\n")
+
+
+class CsvScan:
+    """Column-projected reader over one CSV file (header on the first line)."""
+
+    def __init__(self, path, shared=(), lock=None):
+        self.path = path
+        self.shared = set(shared)
+        self.lock = lock
+        self.header = []
+        self.offsets = array("Q")   # row starts, then the end of the last row
+        self._signature = None      # (inode, size, mtime_ns) the index covers
+        self._attached = False      # index given by attach(): never rebuilt
+
+    # ──────────── offset index ────────────
+    def _stat_signature(self):
+        st = os.stat(self.path)
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def reading(self):
+        """Shared lock on the file: no compact() can swap it while held."""
+        if self.lock is None:
+            return contextlib.nullcontext()
+        return self.lock.hold(exclusive=False)
+
+    def refresh(self):
+        """Bring the offset index up to date with the file."""
+        with self.reading():
+            self._refresh()
+        return self
+
+    def attach(self, header, offsets):
+        """
+        Use a prebuilt index (e.g. another process's, from shared memory)
+        instead of building one. The file is never re-indexed afterwards,
+        so rows() reads only the rows `offsets` covers.
+        """
+        self.header = list(header)
+        self.offsets = offsets
+        self._attached = True
+        return self
+
+    def _refresh(self):
+        if self._attached:
+            return
+        signature = self._stat_signature()
+        if signature == self._signature:
+            return
+        old = self._signature
+        appended = bool(old and self.header) and old[0] == signature[0] and signature[1] >= old[1]
+        with metrics.timer(f"csv.scan_index {os.path.basename(self.path)}"):
+            with self._map(signature[1]) as mm:
+                if appended:
+                    end = self.offsets.pop()
+                    self.offsets.extend(self._row_starts(mm, end, signature[1]))
+                else:
+                    self.offsets = self._row_starts(mm, 0, signature[1])
+                    self.header = []
+                    if self.offsets:
+                        start = self.offsets.pop(0)
+                        stop = self.offsets[0] if self.offsets else signature[1]
+                        self.header = self._split_all(mm[start:stop])
+                self.offsets.append(signature[1])
+        self._signature = signature
+
+    def _map(self, size):
+        f = open(self.path, "rb")
+        try:
+            if size == 0:
+                return _Empty(f)
+            return _Mapped(f, mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ))
+        except BaseException:
+            f.close()
+            raise
+
+    @staticmethod
+    def _row_starts(mm, pos, end):
+        """Start offset of every non-blank CSV record in mm[pos:end]."""
+        if pos >= end:
+            return array("Q")
+        np = optional.numpy()
+        if np is not None and mm.find(b'"', pos, end) == -1:
+            data = np.frombuffer(mm, dtype=np.uint8, count=end - pos, offset=pos)
+            starts = np.flatnonzero(data == NEWLINE) + (pos + 1)
+            starts = np.concatenate(([pos], starts[starts < end]))
+            lengths = np.diff(np.append(starts, end))
+            short = np.flatnonzero(lengths <= 2)    # "", "\n", "\r\n": maybe blank
+            if len(short):
+                blank = [i for i in short.tolist() if not mm[starts[i]:starts[i] + lengths[i]].strip()]
+                starts = np.delete(starts, blank)
+            return array("Q", starts.astype(np.uint64).tobytes())
+
+        starts = array("Q")
+        find = mm.find
+        record_start = pos
+        in_quotes = False
+        while pos < end:
+            newline = find(b"\n", pos, end)
+            stop = end if newline == -1 else newline + 1
+            if find(b'"', pos, stop) != -1 and mm[pos:stop].count(b'"') % 2:
+                in_quotes = not in_quotes
+            if not in_quotes:
+                if stop - record_start > 2 or mm[record_start:stop].strip():
+                    starts.append(record_start)
+                record_start = stop
+            pos = stop
+        return starts
+
+    @staticmethod
+    def _split_all(line):
+        return next(csv.reader([line.decode("utf-8").rstrip("\r\n")]), [])
+
+    # ──────────── reading ────────────
+    def __len__(self):
+        return max(len(self.refresh().offsets) - 1, 0)
+
+    def rows(self, columns, start=0, stop=None):
+        """
+        Yield one tuple of str per row (rows start..stop-1) holding only
+        `columns`, in file order. Missing trailing fields, and columns the
+        file has no header for (added later, see Table.append), read as "".
+        """
+        # index + map under the shared lock: a compact() cannot swap the
+        # file in between; the map keeps reading the version it opened
+        with self.reading():
+            self._refresh()
+            offsets = self.offsets
+            count = len(offsets) - 1    # rows appended while we iterate are not ours
+            stop = count if stop is None else min(stop, count)
+            if not self.header or start >= stop:    # no header or no rows wanted
+                return
+            mapped = self._map(offsets[stop])
+        missing = len(self.header)   # index past every field → ""
+        wanted = [self.header.index(c) if c in self.header else missing for c in columns]
+        last = max(wanted, default=0)
+        caches = [{} if c in self.shared else None for c in columns]
+        plan = list(zip(wanted, caches))
+
+        with mapped as mm:
+            read = 0
+            for i in range(start, stop):
+                line = mm[offsets[i]:offsets[i + 1]].rstrip(b"\r\n")
+                read += len(line)
+                if b'"' in line:
+                    fields = self._split_all(line)
+                    values = [fields[k] if k < len(fields) else "" for k in wanted]
+                    yield tuple(values)
+                    continue
+                fields = line.split(b",", last + 1)
+                values = []
+                for k, cache in plan:
+                    raw = fields[k] if k < len(fields) else b""
+                    if cache is None:
+                        values.append(raw.decode("utf-8"))
+                    else:
+                        value = cache.get(raw)
+                        if value is None:
+                            value = cache[raw] = raw.decode("utf-8")
+                        values.append(value)
+                yield tuple(values)
+            metrics.add_bytes(self.path, read=read)
+
+
+class _Mapped:
+    """Open file + its read-only map, closed together."""
+
+    def __init__(self, f, mm):
+        self.f, self.mm = f, mm
+
+    def __enter__(self):
+        return self.mm
+
+    def __exit__(self, *exc):
+        self.mm.close()
+        self.f.close()
+
+
+class _Empty(_Mapped):
+    """Empty files cannot be mapped: behave like a zero-length map."""
+
+    def __init__(self, f):
+        super().__init__(f, b"")
+
+    def __exit__(self, *exc):
+        self.f.close()
+
+
+# ─── process-wide registry: one CsvScan (and offset index) per file path ───
+_scans = {}
+
+
+def scan(path, shared=(), lock=None):
+    """Return the shared CsvScan for `path`, creating it on first use."""
+    s = _scans.get(path)
+    if s is None:
+        s = _scans[path] = CsvScan(path, shared, lock)
+    return s
+
+
+def clear():
+    _scans.clear()
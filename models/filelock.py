@@ -0,0 +1,97 @@
+"""
+FileLock: lock ข้ามโปรเซสผ่านไฟล์ (data/.lock)
+ใช้ fcntl.flock บน Linux/macOS และ msvcrt.locking บน Windows
+เพื่อให้หลายเครื่อง/หลายหน้าต่างที่รัน main.py กับโฟลเดอร์ data/ เดียวกัน
+ลงทะเบียนและจัดสรรพร้อมกันได้โดยไม่ทับข้อมูลกัน
+"""
+import contextlib
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """
+    Re-entrant lock shared by threads of this process and, through the lock
+    file, by other processes.
+      hold(exclusive=True)  → writers (one at a time)
+      hold(exclusive=False) → readers reloading a file (many at a time)
+    Nested hold() calls join the outer one; a shared hold is upgraded
+    to exclusive if a nested call needs it. Windows only has exclusive locks.
+    current_hold() tells a thread which outermost hold it is inside, so
+    callers can skip re-checking files nobody else can write until it ends.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._fd = None
+        self._depth = 0
+        self._exclusive = False
+        self._mutex = threading.RLock()
+        self._owner = None      # thread holding the lock
+        self._holds = 0         # outermost holds so far (their serial numbers)
+
+    def _lock(self, exclusive):
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        else:
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            msvcrt.locking(self._fd, msvcrt.LK_LOCK, 1)
+
+    def _unlock(self):
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+
+    @contextlib.contextmanager
+    def hold(self, exclusive=True):
+        if fcntl is None:
+            exclusive = True
+        with self._mutex:
+            if self._depth == 0:
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                self._lock(exclusive)
+                self._exclusive = exclusive
+                self._owner = threading.get_ident()
+                self._holds += 1
+            elif exclusive and not self._exclusive:
+                self._lock(True)
+                self._exclusive = True
+
+            self._depth += 1
+            try:
+                yield self
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._owner = None
+                    self._unlock()
+                    os.close(self._fd)
+                    self._fd = None
+
+    def current_hold(self):
+        """Serial number of the outermost hold of the calling thread, or None."""
+        if self._depth and self._owner == threading.get_ident():
+            return self._holds
+        return None
+
+
+# ─── process-wide registry: one FileLock per lock file ───
+_locks = {}
+_registry_mutex = threading.Lock()
+
+
+def file_lock(path):
+    """Return the shared FileLock for `path`."""
+    with _registry_mutex:
+        lock = _locks.get(path)
+        if lock is None:
+            lock = _locks[path] = FileLock(path)
+        return lock
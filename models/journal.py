@@ -0,0 +1,317 @@
+"""
+Journal: write-ahead journal สำหรับไฟล์ที่เพิ่มข้อมูลแบบ append (assignments.csv)
+ถ้าโปรเซสตายกลางการเขียน ไฟล์ข้อมูลจะไม่เหลือแถวครึ่ง ๆ หรือ batch ที่เขียนไม่ครบ
+
+ไฟล์ <data>.journal (binary):
+  B <inode> <size> <mtime>\\n             = จุด checkpoint: ไฟล์ข้อมูล (inode นี้) ยาว size
+                                           byte และ fsync แล้ว (mtime = st_mtime_ns ตอนนั้น)
+  R <offset> <length> <crc32>\\n<bytes>   = การเขียนหนึ่งครั้ง (ทั้ง batch) ที่ตำแหน่ง offset
+                                           บันทึกลง journal ก่อนเขียนไฟล์ข้อมูล
+  D <offset> <length> <crc32>\\n          = batch ใหญ่ (≥ LARGE_RECORD) ที่เขียนลงไฟล์ข้อมูล
+                                           และ fsync แล้ว (บันทึกแค่จุด commit)
+  S <size> <mtime>\\n                     = ก่อน fsync แต่ละครั้ง: ไฟล์ข้อมูลหลังการเขียนที่ commit
+
+commit = fsync ของ journal (ไม่ fsync ไฟล์ข้อมูลทุกครั้ง)
+  group() รวมหลายการเขียนให้ fsync ครั้งเดียวตอนออกจาก group ชั้นนอกสุด
+  (CsvBackend.transaction() และ writer task ของ server.py ใช้ group)
+checkpoint = fsync ไฟล์ข้อมูลแล้วเริ่ม journal ใหม่ เมื่อ journal ยาวเกิน CHECKPOINT_BYTES
+
+recover() (ก่อนอ่าน / เขียนไฟล์ข้อมูล เมื่อไฟล์เปลี่ยนโดยโปรเซสอื่น หรือเปิดครั้งแรก):
+  R ที่ครบ → เขียนซ้ำส่วนที่ไฟล์ข้อมูลขาดหรือไม่ตรง (replay)
+  record ที่ไม่ครบ / crc ไม่ตรง → ตัดทิ้งจาก journal (ยังไม่ได้ commit)
+  ไฟล์ข้อมูลที่ยาวเกินจุด commit สุดท้าย → ตัดส่วนเกินทิ้ง (roll back)
+  ไฟล์ข้อมูลถูกแก้ด้วยมือในที่เดิม (inode เดิม) → ไม่ replay เริ่ม journal ใหม่จากไฟล์ตามที่เป็น
+    แก้ด้วยมือ = สั้นกว่าจุด checkpoint หรือ mtime ใหม่กว่า commit สุดท้าย
+    และข้อมูลหลังจุด checkpoint ไม่ตรงกับ record (ที่ไม่ใช่แค่ขาดหายหรือเป็น NUL จากเครื่องดับ)
+"""
+import contextlib
+import os
+import threading
+import zlib
+
+from models import metrics
+
+CHECKPOINT_BYTES = 4 * 1024 * 1024
+# batches at least this large are fsynced in place and logged as a commit marker
+LARGE_RECORD = 1024 * 1024
+
+
+class Journal:
+    """Write-ahead journal of the appends to one data file (see the module doc)."""
+
+    def __init__(self, data_path, lock=None):
+        self.data_path = data_path
+        self.path = data_path + ".journal"
+        self.lock = lock
+        self._local = threading.local()     # .depth = open group() calls of this thread
+        self._dirty = False     # records written since the last journal fsync
+        self._state = None      # (journal, data) stats after our last look / write
+
+    # ──────────── helpers ────────────
+    def _locked(self, exclusive):
+        if self.lock is None:
+            return contextlib.nullcontext()
+        return self.lock.hold(exclusive)
+
+    @staticmethod
+    def _stat(path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def _current_state(self):
+        return (self._stat(self.path), self._stat(self.data_path))
+
+    @staticmethod
+    def _fsync(path):
+        with open(path, "rb+") as f:
+            os.fsync(f.fileno())
+
+    def _base(self):
+        """(inode, size) from the journal's first line, or None."""
+        try:
+            with open(self.path, "rb") as f:
+                parts = f.readline().split()
+        except FileNotFoundError:
+            return None
+        if len(parts) not in (3, 4) or parts[0] != b"B":
+            return None
+        try:
+            return int(parts[1]), int(parts[2])
+        except ValueError:
+            return None
+
+    def _read(self):
+        """
+        Parse the journal → (base, records, valid_end, committed_mtime).
+        base = (inode, size) or None; records = [(start, kind, offset, length, payload)]
+        with start = the record's position in the journal;
+        valid_end = journal length up to the last complete record;
+        committed_mtime = the data file's mtime at the last commit (S) or
+        checkpoint (B), None if the journal does not say.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None, [], 0, None
+        base, records, pos, committed_mtime = None, [], 0, None
+        while pos < len(data):
+            newline = data.find(b"\n", pos)
+            if newline == -1:
+                break
+            parts = data[pos:newline].split()
+            try:
+                kind, numbers = parts[0], [int(p) for p in parts[1:]]
+            except (IndexError, ValueError):
+                break
+            if kind == b"B" and len(numbers) in (2, 3) and pos == 0:
+                base = tuple(numbers[:2])
+                committed_mtime = numbers[2] if len(numbers) == 3 else None
+                pos = newline + 1
+                continue
+            if kind == b"S" and len(numbers) == 2 and base is not None:
+                committed_mtime = numbers[1]
+                pos = newline + 1
+                continue
+            if kind not in (b"R", b"D") or len(numbers) != 3 or base is None:
+                break
+            offset, length, crc = numbers
+            payload = None
+            end = newline + 1
+            if kind == b"R":
+                payload = data[end:end + length]
+                if len(payload) != length or zlib.crc32(payload) != crc:
+                    break   # torn write: never committed
+                end += length
+            records.append((pos, kind, offset, length, payload))
+            pos = end
+        return base, records, pos, committed_mtime
+
+    # ──────────── group commit ────────────
+    @property
+    def _depth(self):
+        return getattr(self._local, "depth", 0)
+
+    @contextlib.contextmanager
+    def group(self):
+        """Writes inside share one journal fsync, when the outermost group ends."""
+        self._local.depth = self._depth + 1
+        try:
+            yield self
+        finally:
+            self._local.depth -= 1
+            if self._local.depth == 0:
+                self.sync()
+
+    def sync(self):
+        """fsync the journal: every record written so far is committed."""
+        if self._dirty:
+            # the data file as committed: a later change by hand shows in its mtime
+            with self._locked(exclusive=True):
+                data = self._stat(self.data_path)
+                self._append_journal(b"S %d %d\n" % (data[1], data[2]))
+            with metrics.timer("journal.fsync"):
+                self._fsync(self.path)
+            self._dirty = False
+            self._state = self._current_state()
+
+    # ──────────── writing ────────────
+    def write(self, f, offset, data):
+        """
+        Append `data` at `offset` of the open data file `f`, logged first.
+        Call with the exclusive lock held. Commits at once outside group().
+        On an error nothing of it stays in either file.
+        """
+        journal_size = self._prepare()
+        large = len(data) >= LARGE_RECORD
+        header = b"%s %d %d %d\n" % (b"D" if large else b"R", offset, len(data), zlib.crc32(data))
+        try:
+            if not large:
+                self._append_journal(header + data)
+            f.write(data)
+            f.flush()
+            if large:
+                # the batch itself is durable first; the marker commits it
+                os.fsync(f.fileno())
+                self._append_journal(header)
+        except BaseException:
+            f.truncate(offset)
+            with open(self.path, "rb+") as j:
+                j.truncate(journal_size)
+            raise
+        metrics.add_bytes(self.path, written=len(header) + (0 if large else len(data)))
+        self._dirty = True
+        self._state = self._current_state()
+        if self._depth == 0:
+            self.sync()
+
+    def _append_journal(self, data):
+        with open(self.path, "ab") as j:
+            j.write(data)
+
+    def _prepare(self):
+        """Journal size before the next record; starts / checkpoints the journal."""
+        base = self._base()
+        size = os.path.getsize(self.path) if base is not None else 0
+        if base is None or base[0] != self._stat(self.data_path)[0] or size >= CHECKPOINT_BYTES:
+            self.checkpoint()
+            size = os.path.getsize(self.path)
+        return size
+
+    def checkpoint(self):
+        """
+        fsync the data file and start an empty journal at its current size.
+        Call with the exclusive lock held, after the data file is consistent.
+        """
+        with metrics.timer("journal.checkpoint"):
+            if os.path.exists(self.data_path):
+                self._fsync(self.data_path)
+            self.reset()
+
+    def reset(self):
+        """Start an empty journal for the data file as it is now (already fsynced)."""
+        data = self._stat(self.data_path)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            if data is not None:
+                f.write(b"B %d %d %d\n" % data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+        self._state = self._current_state()
+
+    # ──────────── recovery ────────────
+    def recover(self):
+        """
+        Make the data file match the journal after a crash: replay committed
+        records it lacks, cut off what was never committed. Cheap when
+        neither file changed since this process last looked.
+        """
+        if self._current_state() == self._state:
+            return False
+        with self._locked(exclusive=True):
+            with metrics.timer("journal.recover"):
+                repaired = self._recover()
+            self._state = self._current_state()
+        return repaired
+
+    def _recover(self):
+        base, records, valid_end, committed_mtime = self._read()
+        data = self._stat(self.data_path)
+        if base is None or data is None or base[0] != data[0]:
+            # no journal yet, or the data file was rewritten (compact) since:
+            # the rewrite is complete and fsynced, nothing in here applies to it
+            return False
+        if self._edited(base, records, committed_mtime, data):
+            # changed in place by hand: the file as it is now is the new start
+            self.checkpoint()
+            return False
+
+        repaired = False
+        end = base[1]
+        with open(self.data_path, "rb+") as f:
+            for start, kind, offset, length, payload in records:
+                # D is written after its data was fsynced, so it cannot be
+                # short unless the file was cut by hand: stop trusting there
+                if offset != end or (kind == b"D" and f.seek(0, os.SEEK_END) < offset + length):
+                    valid_end = start
+                    break
+                if kind == b"R":
+                    f.seek(offset)
+                    if f.read(length) != payload:
+                        f.seek(offset)
+                        f.truncate()
+                        f.write(payload)
+                        repaired = True
+                end = offset + length
+            if f.seek(0, os.SEEK_END) > end:
+                f.truncate(end)     # uncommitted tail of a write that died
+                repaired = True
+            if repaired:
+                f.flush()
+                os.fsync(f.fileno())
+        if valid_end < os.path.getsize(self.path):
+            with open(self.path, "rb+") as j:
+                j.truncate(valid_end)
+                os.fsync(j.fileno())
+        return repaired
+
+
+    def _edited(self, base, records, committed_mtime, data):
+        """
+        True if the data file was changed in place since the last commit by
+        something other than a Journal: it is shorter than the checkpoint, or
+        it is newer than the last commit and its bytes after the checkpoint
+        differ from the records. Bytes only missing, or NUL (a crash before
+        the data reached the disk), do not count.
+        """
+        if data[1] < base[1]:
+            return True
+        if committed_mtime is None or data[2] <= committed_mtime:
+            return False
+        with open(self.data_path, "rb") as f:
+            for _, kind, offset, length, payload in records:
+                if kind != b"R":
+                    continue
+                f.seek(offset)
+                found = f.read(length)
+                if found != payload[:len(found)] and \
+                        any(a != b and a != 0 for a, b in zip(found, payload)):
+                    return True
+        return False
+
+
+# ─── process-wide registry: one Journal per data file ───
+_journals = {}
+
+
+def journal(data_path, lock=None):
+    """Return the shared Journal for `data_path`, creating it on first use."""
+    j = _journals.get(data_path)
+    if j is None:
+        j = _journals[data_path] = Journal(data_path, lock)
+    return j
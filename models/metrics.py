@@ -0,0 +1,188 @@
+"""
+Metrics: จับเวลา / นับจำนวนครั้ง / นับ byte ของงานหลักในระบบ
+ปิดไว้เป็นค่าเริ่มต้น เปิดด้วย environment variable
+
+  SHELTER_METRICS=1                 เปิดการเก็บสถิติ
+  SHELTER_METRICS_FILE=metrics.json เขียนสถิติเป็น JSON ตอนจบโปรแกรม
+
+ตอนปิด instrument() คืน class เดิมโดยไม่ห่ออะไรเลย (ไม่มี overhead)
+และจุดนับ byte / timer เป็นแค่การเช็ค ENABLED ครั้งเดียว
+
+ดูผลได้จากเมนูหลัก (ข้อ 4 จะขึ้นเมื่อเปิดใช้), GET /metrics ของ server.py
+หรือไฟล์ JSON ตอนจบโปรแกรม
+"""
+import atexit
+import bisect
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+
+ENABLED = os.environ.get("SHELTER_METRICS", "").lower() in ("1", "true", "yes", "on")
+METRICS_FILE = os.environ.get("SHELTER_METRICS_FILE")
+
+# histogram bucket upper bounds in seconds: 1-2-5 steps from 1 µs to 10 s
+BUCKETS = [m * 10.0 ** e for e in range(-6, 1) for m in (1, 2, 5)] + [10.0]
+
+_lock = threading.Lock()
+_timings = {}   # name → {count, errors, total, max, buckets}
+_bytes = {}     # path → {read, written}
+
+
+# ══════════════════════════════════════════
+#  Recording
+# ══════════════════════════════════════════
+def record(name, seconds, error=False):
+    """Add one call of `name` that took `seconds`."""
+    with _lock:
+        t = _timings.get(name)
+        if t is None:
+            t = _timings[name] = {
+                "count": 0, "errors": 0, "total": 0.0, "max": 0.0,
+                "buckets": [0] * (len(BUCKETS) + 1),
+            }
+        t["count"] += 1
+        t["errors"] += error
+        t["total"] += seconds
+        t["max"] = max(t["max"], seconds)
+        t["buckets"][bisect.bisect_left(BUCKETS, seconds)] += 1
+
+
+def add_bytes(path, read=0, written=0):
+    """Count bytes read from / written to a data file (no-op when disabled)."""
+    if not ENABLED:
+        return
+    with _lock:
+        b = _bytes.setdefault(os.path.basename(path), {"read": 0, "written": 0})
+        b["read"] += read
+        b["written"] += written
+
+
+@contextlib.contextmanager
+def _timer(name):
+    start = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        record(name, time.perf_counter() - start, error)
+
+
+def timer(name):
+    """Context manager timing its block as `name` (nullcontext when disabled)."""
+    return _timer(name) if ENABLED else contextlib.nullcontext()
+
+
+def timed(name, func):
+    """`func` wrapped so every call is recorded as `name`."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        error = False
+        try:
+            return func(*args, **kwargs)
+        except BaseException:
+            error = True
+            raise
+        finally:
+            record(name, time.perf_counter() - start, error)
+    return wrapper
+
+
+def instrument(cls, skip=("run",)):
+    """
+    Class decorator: time every method of `cls` as "<Class>.<method>".
+    Static methods stay static. Dunder methods and `skip` are left alone
+    (`run` is the interactive menu loop, which would only measure waiting
+    for input). Returns `cls` untouched when metrics are disabled.
+    """
+    if not ENABLED:
+        return cls
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith("__") or attr in skip:
+            continue
+        name = f"{cls.__name__}.{attr}"
+        if isinstance(value, staticmethod):
+            setattr(cls, attr, staticmethod(timed(name, value.__func__)))
+        elif callable(value):
+            setattr(cls, attr, timed(name, value))
+    return cls
+
+
+# ══════════════════════════════════════════
+#  Reading
+# ══════════════════════════════════════════
+def _percentile(t, fraction):
+    """Upper bound of the histogram bucket holding the given fraction of calls."""
+    target = t["count"] * fraction
+    seen = 0
+    for i, n in enumerate(t["buckets"]):
+        seen += n
+        if seen >= target and n:
+            return min(BUCKETS[i], t["max"]) if i < len(BUCKETS) else t["max"]
+    return t["max"]
+
+
+def snapshot():
+    """All metrics as a JSON-friendly dict."""
+    with _lock:
+        timings = {}
+        for name, t in sorted(_timings.items()):
+            timings[name] = {
+                "count": t["count"],
+                "errors": t["errors"],
+                "total_s": t["total"],
+                "mean_s": t["total"] / t["count"],
+                "p50_s": _percentile(t, 0.50),
+                "p95_s": _percentile(t, 0.95),
+                "max_s": t["max"],
+                "histogram": {
+                    (f"<={b:g}" if i < len(BUCKETS) else f">{BUCKETS[-1]:g}"): n
+                    for i, (b, n) in enumerate(zip(BUCKETS + [None], t["buckets"])) if n
+                },
+            }
+        return {"enabled": ENABLED, "timings": timings, "bytes": dict(_bytes)}
+
+
+def format_report():
+    """Text table of the current metrics (slowest total time first)."""
+    data = snapshot()
+    if not data["timings"] and not data["bytes"]:
+        return "  (ยังไม่มีข้อมูล)"
+
+    lines = []
+    fmt = "  {:<42} {:>7} {:>11} {:>9} {:>9} {:>9}"
+    lines.append(fmt.format("name", "calls", "total ms", "mean ms", "p95 ms", "max ms"))
+    ordered = sorted(data["timings"].items(), key=lambda item: -item[1]["total_s"])
+    for name, t in ordered:
+        lines.append(fmt.format(
+            name[:42], t["count"], f"{t['total_s'] * 1e3:.1f}", f"{t['mean_s'] * 1e3:.3f}",
+            f"{t['p95_s'] * 1e3:.3f}", f"{t['max_s'] * 1e3:.3f}",
+        ))
+    if data["bytes"]:
+        lines.append("")
+        lines.append("  {:<42} {:>14} {:>14}".format("file", "bytes read", "bytes written"))
+        for path, b in sorted(data["bytes"].items()):
+            lines.append("  {:<42} {:>14,} {:>14,}".format(path, b["read"], b["written"]))
+    return "\n".join(lines)
+
+
+def reset():
+    with _lock:
+        _timings.clear()
+        _bytes.clear()
+
+
+def _dump_on_exit():
+    if METRICS_FILE:
+        with open(METRICS_FILE, "w", encoding="utf-8") as f:
+            json.dump(snapshot(), f, indent=2)
+
+
+if ENABLED:
+    atexit.register(_dump_on_exit)
@@ -0,0 +1,17 @@
+"""
+Optional: dependency ที่ไม่บังคับติดตั้ง import ตอนใช้ครั้งแรก ไม่ใช่ตอนโหลดโมดูล
+คำสั่ง main.py ที่ไม่ได้วางแผนจัดสรร / นับรายงานขนาดใหญ่ จึงไม่ต้องรอโหลด NumPy
+"""
+_numpy = False      # not looked up yet
+
+
+def numpy():
+    """The numpy module, or None when it is not installed."""
+    global _numpy
+    if _numpy is False:
+        try:
+            import numpy as np
+        except ImportError:  # optional: only speeds up large sorts / counts / scans
+            np = None
+        _numpy = np
+    return _numpy
@@ -0,0 +1,127 @@
+"""
+ParallelCounts: นับสถิติประชาชน (ทั้งหมด / ได้ที่พัก / แยกตามประเภท)
+แบบ map/reduce ใน process pool สำหรับ citizens.csv ขนาดใหญ่
+
+  map    แบ่งแถวเป็นช่วงเท่า ๆ กัน แต่ละ worker นับช่วงของตัวเองจาก
+         memory-map ของไฟล์เดียวกัน (CsvScan.attach) สิ่งที่ส่งให้ worker
+         อยู่ใน shared memory ไม่ได้ pickle เป็น list ของ dict
+           offsets  = offset index ของ CsvScan (8 byte ต่อแถว)
+           assigned = bitmap 1 byte ต่อเลขรหัสประชาชน (C007 → ช่อง 7)
+                      1 = มีที่พัก active
+         แต่ละ worker คืน {citizen_type: [total, assigned]} ของช่วงนั้น
+  reduce รวมผลตามลำดับช่วง → (total, assigned, by_type) โดย by_type
+         เรียงตามลำดับที่พบครั้งแรก เหมือน CitizenColumns.counts_by
+
+ใช้ REPORT_WORKERS โปรเซส (ค่าเริ่มต้นเท่าจำนวน CPU, 1 = ไม่ใช้ pool)
+เมื่อไฟล์มีอย่างน้อย PARALLEL_MIN แถว
+"""
+import os
+
+from models import metrics
+from models.csv_scan import CsvScan
+from models.sequence import id_number
+
+# files with fewer rows are counted in this process
+PARALLEL_MIN = 200_000
+WORKERS = int(os.environ.get("REPORT_WORKERS") or os.cpu_count() or 1)
+COLUMNS = ("citizen_id", "citizen_type")
+
+
+def _shared_copy(data):
+    """New shared-memory block holding the bytes of `data`."""
+    from multiprocessing import shared_memory
+    data = memoryview(data).cast("B")
+    block = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+    block.buf[:len(data)] = data
+    return block
+
+
+def _count_rows(task):
+    """
+    Process-pool entry point (map): counts of rows start..stop-1.
+    Blocks are attached by name; nothing but names and numbers is pickled.
+    """
+    from multiprocessing import shared_memory
+    path, shared, header, offsets_name, offset_count, bitmap_name, bitmap_size, start, stop = task
+    offsets_block = shared_memory.SharedMemory(offsets_name)
+    bitmap_block = shared_memory.SharedMemory(bitmap_name)
+    raw = offsets_block.buf[:offset_count * 8]
+    offsets = raw.cast("Q")
+    bitmap = bitmap_block.buf
+    by_type = {}
+    try:
+        scan = CsvScan(path, shared).attach(header, offsets)
+        for citizen_id, citizen_type in scan.rows(COLUMNS, start, stop):
+            counts = by_type.get(citizen_type)
+            if counts is None:
+                counts = by_type[citizen_type] = [0, 0]
+            counts[0] += 1
+            number = id_number(citizen_id)
+            if number < bitmap_size and bitmap[number]:
+                counts[1] += 1
+    finally:
+        # views first: a block cannot close while a view still uses it
+        offsets.release()
+        raw.release()
+        offsets_block.close()
+        bitmap_block.close()
+    return by_type
+
+
+def _reduce(partials):
+    """Merge per-range counts, in range order, into (total, assigned, by_type)."""
+    merged = {}
+    for by_type in partials:
+        for value, (total, assigned) in by_type.items():
+            counts = merged.setdefault(value, [0, 0])
+            counts[0] += total
+            counts[1] += assigned
+    by_type = {
+        value: {"total": total, "assigned": assigned, "unassigned": total - assigned}
+        for value, (total, assigned) in merged.items()
+    }
+    return (
+        sum(c["total"] for c in by_type.values()),
+        sum(c["assigned"] for c in by_type.values()),
+        by_type,
+    )
+
+
+def type_counts(scan, assigned_ids, workers=None):
+    """
+    (total, assigned, by_type) over every row of `scan` (a citizens CsvScan),
+    counted in `workers` processes. `assigned_ids` = citizen ids with an
+    active assignment. Same result as CitizenColumns over the same rows.
+    """
+    workers = WORKERS if workers is None else workers
+    numbers = [id_number(citizen_id) for citizen_id in assigned_ids]
+    bitmap = bytearray(max(numbers, default=0) + 1)
+    for number in numbers:
+        bitmap[number] = 1
+
+    # shared lock for the whole run: workers read the file by path, so
+    # it must not be rewritten (compact) before they are done
+    with scan.reading(), metrics.timer("parallel_counts.type_counts"):
+        count = len(scan)
+        workers = max(1, min(workers, count))
+        bounds = [count * i // workers for i in range(workers + 1)]
+        offsets_block = _shared_copy(scan.offsets)
+        bitmap_block = _shared_copy(bitmap)
+        try:
+            tasks = [
+                (scan.path, tuple(scan.shared), scan.header,
+                 offsets_block.name, len(scan.offsets), bitmap_block.name, len(bitmap),
+                 bounds[i], bounds[i + 1])
+                for i in range(workers)
+            ]
+            if workers > 1:
+                from concurrent.futures import ProcessPoolExecutor
+                with ProcessPoolExecutor(workers) as pool:
+                    partials = list(pool.map(_count_rows, tasks))
+            else:
+                partials = [_count_rows(task) for task in tasks]
+        finally:
+            for block in (offsets_block, bitmap_block):
+                block.close()
+                block.unlink()
+    return _reduce(partials)
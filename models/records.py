@@ -0,0 +1,89 @@
+"""
+Records: แถวข้อมูลแบบกะทัดรัด (named tuple ไม่มี __dict__) แทน dict ต่อแถว
+ประชาชนล้านคนใช้หน่วยความจำน้อยลงหลายเท่า และค่าที่ซ้ำกันมาก
+(health_status, citizen_type, วันที่, status) ถูก intern ให้ใช้ string ตัวเดียวกัน
+
+อ่านได้เหมือน dict ทุกอย่าง: row["age"], row.get("phone"), "priority_key" in row,
+dict(row), dict(row, status="discharged") — controller / view เดิมใช้ได้โดยไม่ต้องแก้
+และไม่ต้องคัดลอก แต่แก้ค่าในแถวไม่ได้ (แถวใน cache ห้ามแก้อยู่แล้ว)
+ต้องการ dict จริง (เช่นส่งเป็น JSON) ใช้ dict(row)
+"""
+import sys
+from collections import namedtuple
+
+from models.citizen_model import FIELDS as CITIZEN_FIELDS
+from models.shelter_model import ShelterModel
+from models.assignment_model import FIELDS as ASSIGNMENT_FIELDS
+
+intern = sys.intern
+
+
+def record_type(name, fields):
+    """
+    Named tuple class whose rows also read like a read-only dict.
+    row["field"] goes straight to the C attribute lookup
+    (object.__getattribute__), without a Python-level call.
+    """
+    base = namedtuple(name, fields)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def keys(self):
+        return self._fields
+
+    def items(self):
+        return zip(self._fields, self)
+
+    return type(name, (base,), {
+        "__slots__": (),
+        "__getitem__": object.__getattribute__,
+        "__contains__": lambda self, key: key in self._fields,
+        "get": get,
+        "keys": keys,
+        "items": items,
+    })
+
+
+Citizen = record_type("Citizen", CITIZEN_FIELDS + ["priority_key"])
+Shelter = record_type("Shelter", ShelterModel.FIELDS)
+Assignment = record_type("Assignment", ASSIGNMENT_FIELDS)
+
+# report item: {citizen, status, shelter_name, assigned_date}
+ReportRow = record_type("ReportRow", ["citizen", "status", "shelter_name", "assigned_date"])
+
+
+_projections = {}
+
+
+def projection(fields):
+    """Record type for a subset of columns (one class per tuple of names)."""
+    fields = tuple(fields)
+    cls = _projections.get(fields)
+    if cls is None:
+        cls = _projections[fields] = record_type("Projection", fields)
+    return cls
+
+
+def citizen_record(row):
+    """Typed citizen dict (age int, priority_key set) → Citizen."""
+    return Citizen(
+        row["citizen_id"], row["national_id"], row["first_name"], row["last_name"],
+        row["age"], intern(row["health_status"]), intern(row["citizen_type"]),
+        intern(row["registered_date"]), row["phone"], intern(row.get("region") or ""),
+        row["priority_key"],
+    )
+
+
+def shelter_record(row):
+    return Shelter(
+        row["shelter_id"], row["name"], row["max_capacity"], row["risk_level"],
+        intern(row.get("region") or ""),
+    )
+
+
+def assignment_record(row):
+    return Assignment(
+        row["assignment_id"], row["citizen_id"], intern(row["shelter_id"]),
+        intern(row["assigned_date"]), intern(row["status"]),
+    )
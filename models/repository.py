@@ -0,0 +1,315 @@
+"""
+Repository: in-memory table cache
+โหลดไฟล์ CSV แต่ละตารางเพียงครั้งเดียวต่อ process แล้วเก็บไว้ในหน่วยความจำ
+พร้อม hash index สำหรับค้นหาแบบ O(1)
+ถ้าไฟล์ถูกแก้จากภายนอก (mtime / size เปลี่ยน) จะโหลดใหม่อัตโนมัติ
+ระหว่างถือ lock (เช่นใน transaction) ตรวจไฟล์ครั้งเดียว ไม่ใช่ทุกการค้นหา
+
+การเขียน:
+  append()  → ต่อท้ายไฟล์เฉพาะแถวใหม่ + fsync (ใช้ตอนเพิ่มข้อมูลปกติ)
+              ตารางที่มี journal (models.journal) บันทึกลง journal ก่อน
+              และ fsync แค่ journal (group commit ได้)
+  rewrite() → เขียนใหม่ทั้งไฟล์แบบ atomic (ใช้ตอน compaction เท่านั้น
+              และครั้งแรกที่ append ลงไฟล์ที่หัวคอลัมน์ยังเป็นแบบเก่า)
+
+ตารางที่มี key (เช่น assignment_id): แถวที่ต่อท้ายด้วย key ซ้ำคือ "รุ่นใหม่"
+ของแถวเดิม จะแทนที่แถวเดิมในตำแหน่งเดิม (แก้ index เฉพาะแถวนั้น)
+การแก้สถานะจึงเป็นแค่ append แล้ว rewrite() ตอน compact ค่อยรวบแถวเก่าทิ้ง
+"""
+import contextlib
+import csv
+import io
+import os
+
+from models import metrics
+
+
+class Table:
+    """
+    Rows of one CSV file plus hash indexes over them.
+
+    unique  = {index_name: key_fn}  → key → first row with that key
+    group   = {index_name: key_fn}  → key → list of rows with that key
+    counter = {counter_name: key_fn} → key → number of rows with that key
+    A key_fn may return None to leave a row out of that index.
+    key     = optional primary key_fn: a later row with the same key replaces
+              the earlier one (same position in `rows`, indexes updated for
+              those two rows only), so updates can be appended.
+    lock    = optional FileLock shared with other processes: reloads take it
+              shared, writes take it exclusive.
+    record  = optional function turning a typed row being appended (a plain
+              dict) into the row type parse_row produces (see models.records).
+    journal = optional Journal (models.journal): appends are logged there
+              first, and a write that died half way is replayed or rolled
+              back before the file is next read or written.
+    """
+
+    def __init__(self, path, fields, parse_row=None, unique=None, group=None, counter=None,
+                 lock=None, key=None, record=None, journal=None):
+        self.path = path
+        self.fields = fields
+        self.parse_row = parse_row
+        self.lock = lock
+        self.unique_keys = unique or {}
+        self.group_keys = group or {}
+        self.counter_keys = counter or {}
+        self.key = key
+        self.record = record
+        self.journal = journal
+
+        self.rows = []
+        self.slots = {}     # primary key → position in rows (tables with a key)
+        self.unique = {}
+        self.groups = {}
+        self.counts = {}
+        self._signature = None
+        self._checked_hold = None   # lock hold the file was last checked in
+
+    # ──────────── freshness ────────────
+    def _stat_signature(self):
+        st = os.stat(self.path)
+        return (st.st_mtime_ns, st.st_size)
+
+    def _locked(self, exclusive):
+        if self.lock is None:
+            return contextlib.nullcontext()
+        return self.lock.hold(exclusive)
+
+    def _hold(self):
+        return self.lock.current_hold() if self.lock is not None else None
+
+    def refresh(self):
+        """
+        Reload the file if it changed since it was last read. While this
+        thread holds the lock the file is checked once: no other process
+        can write it until the hold ends.
+        """
+        hold = self._hold()
+        if hold is not None and hold == self._checked_hold:
+            return self
+        if self._stat_signature() != self._signature:
+            # a writer may be mid-append: wait for it, then read a stable file
+            with self._locked(exclusive=False):
+                self.recover()
+                self._load(self._stat_signature())
+        self._checked_hold = hold
+        return self
+
+    def recover(self):
+        """Finish or roll back a journaled write that died half way (no-op without a journal)."""
+        if self.journal is not None:
+            self.journal.recover()
+
+    def signature(self):
+        """(mtime_ns, size) of the file as currently loaded, after a refresh."""
+        return self.refresh()._signature
+
+    def is_current(self):
+        """True if the rows are already cached and the file has not changed since."""
+        if self._signature is None:
+            return False
+        hold = self._hold()
+        return (hold is not None and hold == self._checked_hold) \
+            or self._stat_signature() == self._signature
+
+    def invalidate(self):
+        """Force the next access to re-read the file."""
+        self._signature = None
+        self._checked_hold = None
+
+    def _load(self, signature):
+        with metrics.timer(f"csv.load {os.path.basename(self.path)}"):
+            rows = []
+            with open(self.path, "r", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    if self.parse_row is not None:
+                        row = self.parse_row(row)
+                    if row is not None:
+                        rows.append(row)
+            self._set_rows(rows, signature)
+        metrics.add_bytes(self.path, read=signature[1])
+
+    # ──────────── indexes ────────────
+    def _set_rows(self, rows, signature):
+        self._signature = signature
+        self.unique = {name: {} for name in self.unique_keys}
+        self.groups = {name: {} for name in self.group_keys}
+        self.counts = {name: {} for name in self.counter_keys}
+        self.slots = {}
+        if self.key is None:
+            self.rows = rows
+            for row in rows:
+                self._index(row)
+        else:
+            self.rows = []
+            for row in rows:
+                self._add(row)
+
+    def _add(self, row):
+        """Add one row to the cache, replacing an older version of it if any."""
+        if self.key is not None:
+            key = self.key(row)
+            position = self.slots.get(key)
+            if position is not None:
+                self._unindex(self.rows[position])
+                self.rows[position] = row
+                self._index(row)
+                return
+            self.slots[key] = len(self.rows)
+        self.rows.append(row)
+        self._index(row)
+
+    def _index(self, row):
+        for name, key_fn in self.unique_keys.items():
+            key = key_fn(row)
+            if key is not None:
+                self.unique[name].setdefault(key, row)
+        for name, key_fn in self.group_keys.items():
+            key = key_fn(row)
+            if key is not None:
+                self.groups[name].setdefault(key, []).append(row)
+        for name, key_fn in self.counter_keys.items():
+            key = key_fn(row)
+            if key is not None:
+                counts = self.counts[name]
+                counts[key] = counts.get(key, 0) + 1
+
+    def _unindex(self, row):
+        """Take a replaced row out of every index (the reverse of _index)."""
+        for name, key_fn in self.unique_keys.items():
+            key = key_fn(row)
+            if key is not None and self.unique[name].get(key) is row:
+                del self.unique[name][key]
+        for name, key_fn in self.group_keys.items():
+            key = key_fn(row)
+            if key is None:
+                continue
+            rows = self.groups[name].get(key, [])
+            for i, r in enumerate(rows):
+                if r is row:
+                    del rows[i]
+                    break
+            if not rows:
+                self.groups[name].pop(key, None)
+        for name, key_fn in self.counter_keys.items():
+            key = key_fn(row)
+            if key is not None:
+                counts = self.counts[name]
+                counts[key] -= 1
+                if not counts[key]:
+                    del counts[key]
+
+    # ──────────── lookups ────────────
+    def all(self):
+        return self.refresh().rows
+
+    def get(self, index, key):
+        """Single row from a unique index, or None."""
+        return self.refresh().unique[index].get(key)
+
+    def group(self, index, key):
+        """List of rows from a group index (empty list if none)."""
+        return self.refresh().groups[index].get(key, [])
+
+    def count(self, counter, key):
+        return self.refresh().counts[counter].get(key, 0)
+
+    def counter(self, counter):
+        """Copy of a whole counter map {key: count}."""
+        return dict(self.refresh().counts[counter])
+
+    # ──────────── WRITE ────────────
+    def _encode(self, rows, header=False):
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=self.fields, extrasaction="ignore")
+        if header:
+            writer.writeheader()
+        writer.writerows(rows)
+        return buf.getvalue().encode("utf-8")
+
+    def _outdated_header(self):
+        """True if the file's header is not `fields` (written before a column was added)."""
+        with open(self.path, "rb") as f:
+            line = f.readline().decode("utf-8-sig").strip()
+        return bool(line) and next(csv.reader([line])) != self.fields
+
+    def append(self, new_rows):
+        """
+        Append `new_rows` to the end of the file (one write + fsync).
+        Writes the header first if the file is empty, and a line break first
+        if the last line has none. Indexes are updated for the new rows only.
+        A file with an older header is first rewritten with the current one,
+        so the new rows keep every column.
+        """
+        with self._locked(exclusive=True):
+            self.recover()
+            if self._outdated_header():
+                self.rewrite(list(self.all()))
+            self._append(new_rows)
+
+    def _append(self, new_rows):
+        with open(self.path, "ab+") as f:
+            # someone else wrote since our last read → reload after appending
+            stale = self._stat_signature() != self._signature
+            size = f.seek(0, os.SEEK_END)
+            prefix = b""
+            if size == 0:
+                prefix = self._encode([], header=True)
+            else:
+                f.seek(size - 1)
+                if f.read(1) not in (b"\n", b"\r"):
+                    prefix = b"\r\n"
+            data = prefix + self._encode(new_rows)
+            with metrics.timer(f"csv.append {os.path.basename(self.path)}"):
+                if self.journal is not None:
+                    self.journal.write(f, size, data)
+                else:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+            metrics.add_bytes(self.path, written=len(data))
+            if stale:
+                self._load(self._stat_signature())
+            else:
+                self.extend(new_rows)
+
+    def rewrite(self, rows):
+        """
+        Compaction: rewrite the whole file atomically
+        (temp file in the same folder + fsync + os.replace).
+        """
+        with self._locked(exclusive=True):
+            tmp_path = self.path + ".tmp"
+            data = self._encode(rows, header=True)
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            metrics.add_bytes(self.path, written=len(data))
+            os.replace(tmp_path, self.path)
+            if self.journal is not None:
+                self.journal.reset()    # its records were for the replaced file
+            self._set_rows(rows, self._stat_signature())
+
+    def extend(self, new_rows):
+        """Add rows that are already on disk to the cache and its indexes."""
+        for row in new_rows:
+            self._add(self.record(row) if self.record is not None else row)
+        self._signature = self._stat_signature()
+
+
+# ─── process-wide registry: one Table per file path ───
+_tables = {}
+
+
+def table(path, fields, **spec):
+    """Return the shared Table for `path`, creating it on first use."""
+    t = _tables.get(path)
+    if t is None:
+        t = _tables[path] = Table(path, fields, **spec)
+    return t
+
+
+def clear():
+    """Drop every cached table (next access reloads from disk)."""
+    _tables.clear()
@@ -0,0 +1,80 @@
+"""
+Sequence: ตัวออกรหัสถัดไป (C001, A001, ...) แบบ O(1)
+เก็บเลขสูงสุดที่ออกไปแล้ว (high-water mark) ของแต่ละ prefix ไว้ใน data/sequences.json
+ครั้งแรกที่ใช้ prefix ใดใน process จะเทียบกับรหัสที่มีอยู่จริงในไฟล์ CSV
+ถ้าไฟล์ sequence หายหรือล้าหลัง ก็จะไม่ออกรหัสซ้ำ
+"""
+import json
+import os
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+SEQUENCE_FILE = os.path.join(DATA_DIR, "sequences.json")
+
+
+def id_number(record_id):
+    """Numeric part of an id ('C007' → 7). Use this, not the string, to order ids."""
+    return int(record_id[1:])
+
+
+def format_id(prefix, number):
+    """7 → 'C007'. Numbers past 999 simply grow wider ('C1000')."""
+    return f"{prefix}{number:03d}"
+
+
+class IdSequence:
+    """Persisted high-water marks, one per id prefix."""
+
+    def __init__(self, path):
+        self.path = path
+        self.high = {}  # prefix → highest number handed out or seen in the CSV
+
+    def _read_file(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write_file(self, marks):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(marks, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def recover(self, prefix, existing_ids):
+        """Raise the mark for `prefix` to the largest id already stored."""
+        top = max((id_number(x) for x in existing_ids), default=0)
+        self.high[prefix] = max(self.high.get(prefix, 0), top)
+
+    def allocate(self, prefix, count=1, existing_ids=None):
+        """
+        Hand out `count` consecutive ids for `prefix` (a block for batch inserts).
+        existing_ids = zero-arg callable returning the ids in the table;
+        it is called once per process, the first time the prefix is used.
+        """
+        if count <= 0:
+            return []
+        if prefix not in self.high and existing_ids is not None:
+            self.recover(prefix, existing_ids())
+
+        marks = self._read_file()
+        start = max(self.high.get(prefix, 0), marks.get(prefix, 0)) + 1
+        end = start + count - 1
+
+        self.high[prefix] = end
+        marks[prefix] = end
+        self._write_file(marks)
+        return [format_id(prefix, n) for n in range(start, end + 1)]
+
+
+# ─── process-wide registry: one IdSequence per file ───
+_sequences = {}
+
+
+def sequence(path=None):
+    """Return the shared IdSequence for `path` (default: data/sequences.json)."""
+    path = path or SEQUENCE_FILE
+    seq = _sequences.get(path)
+    if seq is None:
+        seq = _sequences[path] = IdSequence(path)
+    return seq
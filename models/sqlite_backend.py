@@ -0,0 +1,324 @@
+"""
+SqliteBackend: เก็บข้อมูลทั้ง 3 ตารางในไฟล์ SQLite ไฟล์เดียว
+  - national_id เป็น UNIQUE INDEX (business rule ข้อ 4)
+  - citizen_id ที่ status = 'active' เป็น partial UNIQUE INDEX
+    (คนหนึ่งมีที่พัก active ได้แห่งเดียว)
+  - ทุกการเขียนอยู่ใน transaction (BEGIN IMMEDIATE)
+
+นำเข้าข้อมูลจาก data/*.csv ครั้งเดียว:
+  python -m models.sqlite_backend data/ data/shelter.db
+"""
+import sqlite3
+import sys
+
+from models.storage import StorageBackend, DuplicateError
+from models.sequence import id_number, format_id
+from models.records import Citizen, Assignment
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS citizens (
+    citizen_id      TEXT PRIMARY KEY,
+    national_id     TEXT NOT NULL,
+    first_name      TEXT NOT NULL,
+    last_name       TEXT NOT NULL,
+    age             INTEGER NOT NULL,
+    health_status   TEXT NOT NULL,
+    citizen_type    TEXT NOT NULL,
+    registered_date TEXT NOT NULL,
+    phone           TEXT NOT NULL,
+    region          TEXT NOT NULL DEFAULT '',
+    priority_key    INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS citizens_national_id ON citizens (national_id);
+
+CREATE TABLE IF NOT EXISTS shelters (
+    shelter_id   TEXT PRIMARY KEY,
+    name         TEXT NOT NULL,
+    max_capacity INTEGER NOT NULL,
+    risk_level   INTEGER NOT NULL,
+    region       TEXT NOT NULL DEFAULT ''
+);
+
+CREATE TABLE IF NOT EXISTS assignments (
+    assignment_id TEXT PRIMARY KEY,
+    citizen_id    TEXT NOT NULL,
+    shelter_id    TEXT NOT NULL,
+    assigned_date TEXT NOT NULL,
+    status        TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS assignments_active_citizen
+    ON assignments (citizen_id) WHERE status = 'active';
+CREATE INDEX IF NOT EXISTS assignments_shelter_status ON assignments (shelter_id, status);
+
+CREATE TABLE IF NOT EXISTS sequences (
+    prefix TEXT PRIMARY KEY,
+    high   INTEGER NOT NULL
+);
+"""
+
+CITIZEN_COLUMNS = [
+    "citizen_id", "national_id", "first_name", "last_name", "age",
+    "health_status", "citizen_type", "registered_date", "phone", "region", "priority_key",
+]
+SHELTER_COLUMNS = ["shelter_id", "name", "max_capacity", "risk_level", "region"]
+# explicit list, in Citizen record order: migrated databases have region last
+CITIZEN_SELECT = ", ".join(CITIZEN_COLUMNS)
+
+# columns added after the first schema: (table, column, definition)
+ADDED_COLUMNS = [
+    ("citizens", "region", "region TEXT NOT NULL DEFAULT ''"),
+    ("shelters", "region", "region TEXT NOT NULL DEFAULT ''"),
+]
+ASSIGNMENT_COLUMNS = ["assignment_id", "citizen_id", "shelter_id", "assigned_date", "status"]
+
+# prefix → (table, id column) used to recover a missing sequence row
+SEQUENCE_SOURCES = {"C": ("citizens", "citizen_id"), "A": ("assignments", "assignment_id")}
+
+
+def _insert_sql(table, columns):
+    names = ", ".join(columns)
+    params = ", ".join(f":{c}" for c in columns)
+    return f"INSERT INTO {table} ({names}) VALUES ({params})"
+
+
+def _upsert_sql(table, columns, key):
+    updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c != key)
+    return f"{_insert_sql(table, columns)} ON CONFLICT ({key}) DO UPDATE SET {updates}"
+
+
+class SqliteBackend(StorageBackend):
+    """StorageBackend over one SQLite database file."""
+
+    def __init__(self, path):
+        self.path = path
+        # autocommit mode; transaction() issues BEGIN / COMMIT itself.
+        # server.py writes from its writer thread (never at the same time as reads)
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+        self._depth = 0
+
+    def _migrate(self):
+        """Add the ADDED_COLUMNS a database created by an older version lacks."""
+        for table, column, definition in ADDED_COLUMNS:
+            names = {row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+            if column not in names:
+                self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {definition}")
+
+    def _rows(self, sql, params=(), record=dict):
+        return [record(r) for r in self.conn.execute(sql, params)]
+
+    def _one(self, sql, params=(), record=dict):
+        row = self.conn.execute(sql, params).fetchone()
+        return record(row) if row else None
+
+    def _insert(self, table, columns, rows, sql=None):
+        try:
+            with self.transaction():
+                self.conn.executemany(sql or _insert_sql(table, columns), rows)
+        except sqlite3.IntegrityError as e:
+            raise DuplicateError(str(e)) from e
+
+    # ──────────── transactions ────────────
+    def transaction(self):
+        return _Transaction(self)
+
+    # ──────────── citizens ────────────
+    def citizens(self):
+        return self._rows(
+            f"SELECT {CITIZEN_SELECT} FROM citizens ORDER BY rowid", record=Citizen._make
+        )
+
+    def iter_citizens(self, batch_size=1000):
+        # separate cursor, fetched in batches: memory stays flat
+        cursor = self.conn.execute(f"SELECT {CITIZEN_SELECT} FROM citizens ORDER BY rowid")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield Citizen._make(row)
+
+    def citizen_columns(self, columns, batch_size=1000):
+        unknown = [c for c in columns if c not in CITIZEN_COLUMNS]
+        if unknown:
+            raise KeyError(f"citizens has no column {unknown[0]}")
+        cursor = self.conn.execute(f"SELECT {', '.join(columns)} FROM citizens ORDER BY rowid")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield tuple(row)
+
+    def citizens_since(self, position):
+        return self._rows(
+            f"SELECT {CITIZEN_SELECT} FROM citizens ORDER BY rowid LIMIT -1 OFFSET ?",
+            (position,), Citizen._make,
+        )
+
+    def citizen_count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM citizens").fetchone()[0]
+
+    def citizen_by_id(self, citizen_id):
+        return self._one(
+            f"SELECT {CITIZEN_SELECT} FROM citizens WHERE citizen_id = ?", (citizen_id,), Citizen._make
+        )
+
+    def citizen_by_national_id(self, national_id):
+        return self._one(
+            f"SELECT {CITIZEN_SELECT} FROM citizens WHERE national_id = ?", (national_id,), Citizen._make
+        )
+
+    def insert_citizens(self, citizens):
+        self._insert("citizens", CITIZEN_COLUMNS, citizens)
+
+    # ──────────── shelters ────────────
+    def shelters(self):
+        return self._rows("SELECT * FROM shelters ORDER BY rowid")
+
+    def shelter_by_id(self, shelter_id):
+        return self._one("SELECT * FROM shelters WHERE shelter_id = ?", (shelter_id,))
+
+    def insert_shelters(self, shelters):
+        self._insert("shelters", SHELTER_COLUMNS, shelters)
+
+    # ──────────── assignments ────────────
+    def assignments(self):
+        return self._rows("SELECT * FROM assignments ORDER BY rowid", record=Assignment._make)
+
+    def active_assignment(self, citizen_id):
+        return self._one(
+            "SELECT * FROM assignments WHERE citizen_id = ? AND status = 'active'",
+            (citizen_id,), Assignment._make,
+        )
+
+    def occupancy(self):
+        return dict(self.conn.execute(
+            "SELECT shelter_id, COUNT(*) FROM assignments"
+            " WHERE status = 'active' GROUP BY shelter_id"
+        ).fetchall())
+
+    def active_assignment_count(self):
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM assignments WHERE status = 'active'"
+        ).fetchone()[0]
+
+    def active_in_shelter(self, shelter_id):
+        return self._rows(
+            "SELECT * FROM assignments WHERE shelter_id = ? AND status = 'active' ORDER BY rowid",
+            (shelter_id,), Assignment._make,
+        )
+
+    def assigned_citizen_ids(self):
+        return {r[0] for r in self.conn.execute(
+            "SELECT citizen_id FROM assignments WHERE status = 'active'"
+        )}
+
+    def insert_assignments(self, assignments):
+        self._insert("assignments", ASSIGNMENT_COLUMNS, assignments)
+
+    def save_assignments(self, assignments):
+        # upsert keeps the rowid, so assignments() order is unchanged
+        self._insert(
+            "assignments", ASSIGNMENT_COLUMNS, assignments,
+            sql=_upsert_sql("assignments", ASSIGNMENT_COLUMNS, "assignment_id"),
+        )
+
+    # ──────────── maintenance ────────────
+    def version(self):
+        # data_version moves on commits from other connections,
+        # total_changes on our own writes
+        data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        return (data_version, self.conn.total_changes)
+
+    def next_ids(self, prefix, count=1):
+        if count <= 0:
+            return []
+        with self.transaction():
+            row = self.conn.execute(
+                "SELECT high FROM sequences WHERE prefix = ?", (prefix,)
+            ).fetchone()
+            if row is None:
+                # recover from the table once, then keep the counter
+                table, column = SEQUENCE_SOURCES[prefix]
+                high = max((id_number(r[0]) for r in self.conn.execute(
+                    f"SELECT {column} FROM {table}"
+                )), default=0)
+            else:
+                high = row[0]
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sequences (prefix, high) VALUES (?, ?)",
+                (prefix, high + count),
+            )
+        return [format_id(prefix, n) for n in range(high + 1, high + count + 1)]
+
+    def compact(self):
+        self.conn.execute("VACUUM")
+
+    def state_path(self, name):
+        return f"{self.path}.{name}"
+
+
+class _Transaction:
+    """
+    BEGIN IMMEDIATE … COMMIT / ROLLBACK; a nested use is a SAVEPOINT inside
+    the outer one, so its error undoes only its own writes (the outer
+    transaction may catch the error and still commit).
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.savepoint = None
+
+    def __enter__(self):
+        if self.db._depth == 0:
+            self.db.conn.execute("BEGIN IMMEDIATE")
+        else:
+            self.savepoint = f"sp{self.db._depth}"
+            self.db.conn.execute(f"SAVEPOINT {self.savepoint}")
+        self.db._depth += 1
+        return self.db
+
+    def __exit__(self, exc_type, exc, tb):
+        self.db._depth -= 1
+        if self.savepoint:
+            if exc_type:
+                self.db.conn.execute(f"ROLLBACK TO {self.savepoint}")
+            self.db.conn.execute(f"RELEASE {self.savepoint}")
+        else:
+            self.db.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+# ══════════════════════════════════════════
+#  One-shot importer: data/*.csv → SQLite
+# ══════════════════════════════════════════
+def import_csv(data_dir, db_path):
+    """
+    Copy citizens, shelters and assignments from the CSV files in
+    `data_dir` into a new SQLite database, keeping every id.
+    Returns the SqliteBackend.
+    """
+    from models.csv_backend import CsvBackend
+
+    source = CsvBackend(data_dir)
+    db = SqliteBackend(db_path)
+    with db.transaction():
+        # sqlite3 binds named parameters from dicts only
+        db.insert_shelters(source.shelters())
+        db.insert_citizens([dict(c) for c in source.citizens()])
+        db.insert_assignments([dict(a) for a in source.assignments()])
+    return db
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("usage: python -m models.sqlite_backend <data_dir> <db_path>")
+        sys.exit(2)
+    imported = import_csv(sys.argv[1], sys.argv[2])
+    print(f"imported {imported.citizen_count()} citizens, "
+          f"{len(imported.shelters())} shelters, "
+          f"{len(imported.assignments())} assignments → {sys.argv[2]}")
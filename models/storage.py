@@ -0,0 +1,183 @@
+"""
+Storage: เลือก backend สำหรับเก็บข้อมูลของทั้ง 3 ตาราง
+  csv    → ไฟล์ data/*.csv (ค่าเริ่มต้น)
+  sqlite → ไฟล์ฐานข้อมูลเดียว (ค่าเริ่มต้น data/shelter.db)
+
+เลือกผ่าน environment variable:
+  SHELTER_STORAGE = csv | sqlite
+  SHELTER_DATA_DIR = โฟลเดอร์ข้อมูล (ค่าเริ่มต้น data/)
+  SHELTER_DB      = path ของไฟล์ SQLite
+
+Model ทุกตัวเรียกผ่าน backend() เท่านั้น ไม่แตะไฟล์เอง
+"""
+import contextlib
+import itertools
+import os
+
+from models.columnar import CitizenColumns
+
+DATA_DIR = os.environ.get(
+    "SHELTER_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "data"),
+)
+
+
+class DuplicateError(Exception):
+    """A unique rule (national_id, one active assignment per citizen) was violated."""
+
+
+class StorageBackend:
+    """
+    Interface every backend implements.
+    Rows are read-only records (models.records) that read like dicts with
+    the CSV column names; ints are already ints (age, max_capacity,
+    risk_level) and citizens carry `priority_key`. Rows returned by read
+    methods cannot be modified, except shelters(), which returns fresh dicts.
+    Write methods take plain dicts.
+    """
+
+    def transaction(self):
+        """Context manager: reads + writes inside it are one atomic unit."""
+        raise NotImplementedError
+
+    def group_commit(self):
+        """
+        Context manager: writes inside it (each still its own transaction)
+        may share one flush to disk, when it ends. Nothing written inside
+        is durable before then.
+        """
+        return contextlib.nullcontext()
+
+    # ──────────── citizens ────────────
+    def citizens(self):
+        raise NotImplementedError
+
+    def iter_citizens(self):
+        """Citizens one by one, in registration order (lazy where the backend can)."""
+        return iter(self.citizens())
+
+    def citizen_columns(self, columns):
+        """
+        One tuple per citizen holding only `columns` (names from FIELDS),
+        in registration order, typed like citizens() (age is an int).
+        Backends read just those columns where they can.
+        """
+        return (tuple(c[k] for k in columns) for c in self.iter_citizens())
+
+    def citizen_type_counts(self, assigned_ids, workers=None):
+        """
+        (total, assigned, by_type) over all citizens: by_type =
+        {citizen_type: {total, assigned, unassigned}} in first-seen order,
+        assigned = citizens whose id is in `assigned_ids`. Backends may
+        count in up to `workers` processes; the result is the same.
+        """
+        columns = CitizenColumns(self.citizen_columns(CitizenColumns.COLUMNS), assigned_ids)
+        assigned = columns.assigned_count()
+        return len(columns), assigned, columns.counts_by("citizen_type")
+
+    def citizens_since(self, position):
+        """Citizens registered after the first `position` ones (registration order)."""
+        return list(itertools.islice(self.iter_citizens(), position, None))
+
+    def citizen_count(self):
+        raise NotImplementedError
+
+    def citizen_by_id(self, citizen_id):
+        raise NotImplementedError
+
+    def citizen_by_national_id(self, national_id):
+        raise NotImplementedError
+
+    def insert_citizens(self, citizens):
+        """Store new citizens (ids already allocated). May raise DuplicateError."""
+        raise NotImplementedError
+
+    # ──────────── shelters ────────────
+    def shelters(self):
+        raise NotImplementedError
+
+    def shelter_by_id(self, shelter_id):
+        raise NotImplementedError
+
+    # ──────────── assignments ────────────
+    def assignments(self):
+        raise NotImplementedError
+
+    def active_assignment(self, citizen_id):
+        raise NotImplementedError
+
+    def occupancy(self):
+        """{shelter_id: active_count} for every shelter with someone in it."""
+        raise NotImplementedError
+
+    def active_in_shelter(self, shelter_id):
+        """Active assignments of one shelter (index lookup, no table scan)."""
+        raise NotImplementedError
+
+    def active_assignment_count(self):
+        """Number of active assignments (= citizens with a bed)."""
+        return len(self.assigned_citizen_ids())
+
+    def assigned_citizen_ids(self):
+        raise NotImplementedError
+
+    def insert_assignments(self, assignments):
+        """Store new assignments (ids already allocated). May raise DuplicateError."""
+        raise NotImplementedError
+
+    def save_assignments(self, assignments):
+        """
+        Store rows in order: a row whose assignment_id exists replaces that
+        assignment (e.g. status → discharged), any other row is inserted.
+        May raise DuplicateError.
+        """
+        raise NotImplementedError
+
+    # ──────────── maintenance ────────────
+    def version(self):
+        """Hashable token that changes whenever any table changes (for caches)."""
+        raise NotImplementedError
+
+    def next_ids(self, prefix, count=1):
+        """Allocate `count` new ids for prefix 'C' (citizens) or 'A' (assignments)."""
+        raise NotImplementedError
+
+    def compact(self):
+        """Rewrite / vacuum the underlying storage."""
+        raise NotImplementedError
+
+    def state_path(self, name):
+        """Path of a small side file kept with this store (e.g. waitlist.json)."""
+        raise NotImplementedError
+
+
+# ─── the process-wide backend ───
+_backend = None
+
+
+def create_backend(kind=None, data_dir=None, db_path=None):
+    """Build a backend by name ('csv' or 'sqlite')."""
+    kind = kind or os.environ.get("SHELTER_STORAGE", "csv")
+    data_dir = data_dir or DATA_DIR
+
+    if kind == "csv":
+        from models.csv_backend import CsvBackend
+        return CsvBackend(data_dir)
+    if kind == "sqlite":
+        from models.sqlite_backend import SqliteBackend
+        return SqliteBackend(db_path or os.environ.get("SHELTER_DB") or os.path.join(data_dir, "shelter.db"))
+    raise ValueError(f"unknown storage backend: {kind!r} (use 'csv' or 'sqlite')")
+
+
+def backend():
+    """The backend every model uses (created from the environment on first use)."""
+    global _backend
+    if _backend is None:
+        _backend = create_backend()
+    return _backend
+
+
+def set_backend(new_backend):
+    """Swap the process-wide backend (e.g. point the app at another data folder)."""
+    global _backend
+    _backend = new_backend
@@ -0,0 +1,72 @@
+"""
+Model: WaitlistModel
+สถานะของ Auto-Assign แบบ incremental (waitlist.json ข้างไฟล์ข้อมูล)
+
+  seen      = จำนวนประชาชน (ตามลำดับลงทะเบียน) ที่ผ่านการจัดสรรมาแล้ว
+              คนลำดับที่ seen ขึ้นไปคือผู้ลงทะเบียนใหม่
+  waiting   = [[priority_key, citizen_id, needs_low_risk], ...]
+              ผู้ที่จัดสรรไม่ได้ เรียงตามลำดับความสำคัญ (เหมือน _priority_sort)
+  available = {shelter_id: ที่ว่าง} ของศูนย์ที่ยังว่างตอนจบรอบล่าสุด
+              ศูนย์ที่ว่างเพิ่มจากค่านี้ = มีที่ว่างคืนมา
+  released  = [citizen_id, ...] ผู้ที่ออกจากศูนย์หลังรอบล่าสุด (event จาก release())
+"""
+import json
+import os
+
+from models.storage import backend
+from models.metrics import instrument
+
+WAITLIST_FILE = "waitlist.json"
+
+
+@instrument
+class WaitlistModel:
+    """Persisted allocation waitlist (one JSON file per data store)."""
+
+    @staticmethod
+    def path():
+        return backend().state_path(WAITLIST_FILE)
+
+    @staticmethod
+    def load():
+        """The saved state as {seen, waiting, available, released}, or None if there is none."""
+        try:
+            with open(WaitlistModel.path(), "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        if not all(key in state for key in ("seen", "waiting", "available")):
+            return None
+        state.setdefault("released", [])
+        return state
+
+    @staticmethod
+    def save(seen, waiting, available, released=()):
+        """Replace the saved state atomically (temp file + os.replace)."""
+        path = WaitlistModel.path()
+        tmp_path = path + ".tmp"
+        data = json.dumps({"seen": seen, "waiting": waiting, "available": available,
+                           "released": list(released)})
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def release(citizen_ids):
+        """
+        Event: these citizens left their shelter and wait again.
+        Call inside the transaction that ended their assignments.
+        """
+        state = WaitlistModel.load()
+        if state is None:
+            return  # no state: the next run is a full pass anyway
+        WaitlistModel.save(state["seen"], state["waiting"], state["available"],
+                           state["released"] + list(citizen_ids))
+
+    @staticmethod
+    def clear():
+        """Forget the state; the next incremental run does a full pass."""
+        try:
+            os.remove(WaitlistModel.path())
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,436 @@
+"""
+HTTP/JSON API: ให้แท็บเล็ตภาคสนามเรียกใช้ระบบผ่าน HTTP (asyncio, stdlib เท่านั้น)
+
+  python main.py serve [--host 127.0.0.1] [--port 8080]
+
+  GET  /health
+  GET  /citizens?type=&health=&page=&page_size=
+  GET  /citizens/<citizen_id>
+  POST /citizens                 {national_id, first_name, last_name, age,
+                                  health_status, citizen_type, phone}
+  GET  /shelters                 ศูนย์พักพิง + จำนวนผู้เข้าพัก
+  POST /assignments              {citizen_id, shelter_id}   (Manual-Assign)
+  POST /assignments/auto         Auto-Assign ทุกคนที่รอจัดสรร
+                                 (?incremental=1 แบบ incremental, ?mode=greedy|global)
+  POST /assignments/discharge    {citizen_id} หรือ {shelter_id}, refill: true = จัดสรรที่ว่างต่อทันที
+  POST /assignments/transfer     {citizen_id, shelter_id}
+  GET  /reports/summary
+  GET  /reports/assigned|unassigned|full?page=&page_size=
+  GET  /metrics                  สถิติการทำงาน (เมื่อเปิด SHELTER_METRICS=1)
+
+─ ข้อมูลอยู่ใน cache ของ backend ตลอดอายุ process (โหลดไว้ตอนเริ่ม)
+  แต่ละ request แค่ตรวจว่าไฟล์เปลี่ยนหรือไม่ ไม่อ่านใหม่ทั้งไฟล์
+─ การเขียนทุกครั้งเข้าคิวเดียว ทำโดย writer task ตัวเดียวตามลำดับ
+  การเขียนที่รอในคิวพร้อมกันใช้ fsync ของ journal ร่วมกันครั้งเดียว (group commit)
+─ การเขียนและ fsync รันใน writer thread (ไม่บล็อก event loop)
+  GET รอเฉพาะช่วงที่ batch กำลังเขียนแถว ไม่รอ fsync การอ่านจึงไม่ชนกับการเขียน
+─ ไม่รับ body แบบ Transfer-Encoding: chunked (ตอบ 411 ต้องส่ง Content-Length)
+─ รองรับ HTTP/1.1 keep-alive
+"""
+import asyncio
+import contextlib
+import itertools
+import json
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qs
+
+from models.citizen_model import CitizenModel, FIELDS as CITIZEN_FIELDS
+from models.shelter_model import ShelterModel
+from models.assignment_model import AssignmentModel
+from models import metrics
+from models.storage import backend
+from controllers.shelter_controller import ShelterController, ALLOCATION_MODES
+from controllers.report_rows import iter_citizens, report_counts, PAGE_SIZE
+from controllers.report_snapshot import report_snapshot
+from controllers.report_export import iter_export_rows
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+MAX_BODY = 1 << 20       # 1 MiB per request body
+MAX_PAGE_SIZE = 1000
+
+
+class HttpError(Exception):
+    """Turned into a JSON error response with the given status."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# ══════════════════════════════════════════
+#  Helpers
+# ══════════════════════════════════════════
+def _int_param(query, name, default, minimum=1, maximum=None):
+    values = query.get(name)
+    if not values:
+        return default
+    try:
+        value = int(values[0])
+    except ValueError:
+        raise HttpError(400, f"{name} must be an integer")
+    if value < minimum or (maximum is not None and value > maximum):
+        raise HttpError(400, f"{name} out of range")
+    return value
+
+
+def _paging(query):
+    page = _int_param(query, "page", 1)
+    page_size = _int_param(query, "page_size", PAGE_SIZE, maximum=MAX_PAGE_SIZE)
+    return page, page_size
+
+
+def _page(rows, page, page_size):
+    start = (page - 1) * page_size
+    return list(itertools.islice(rows, start, start + page_size))
+
+
+def _public(citizen):
+    """Citizen as stored in the table (without internal keys like priority_key)."""
+    return {f: citizen[f] for f in CITIZEN_FIELDS}
+
+
+def _json_body(body):
+    try:
+        data = json.loads(body or b"{}")
+    except ValueError:
+        raise HttpError(400, "body must be JSON")
+    if not isinstance(data, dict):
+        raise HttpError(400, "body must be a JSON object")
+    return data
+
+
+# ══════════════════════════════════════════
+#  Server
+# ══════════════════════════════════════════
+class ApiServer:
+    """Routes JSON requests to the models / controllers."""
+
+    def __init__(self):
+        self.routes = [
+            ("GET", r"/health", self.health),
+            ("GET", r"/citizens", self.list_citizens),
+            ("POST", r"/citizens", self.register_citizen),
+            ("GET", r"/citizens/(?P<citizen_id>[^/]+)", self.get_citizen),
+            ("GET", r"/shelters", self.list_shelters),
+            ("POST", r"/assignments", self.manual_assign),
+            ("POST", r"/assignments/auto", self.auto_assign),
+            ("POST", r"/assignments/discharge", self.discharge),
+            ("POST", r"/assignments/transfer", self.transfer),
+            ("GET", r"/reports/summary", self.report_summary),
+            ("GET", r"/reports/(?P<kind>assigned|unassigned|full)", self.report_rows),
+            ("GET", r"/metrics", self.show_metrics),
+        ]
+        self.routes = [(m, re.compile(p + r"\Z"), h) for m, p, h in self.routes]
+        self.writes = None
+        self.executor = None    # the writer thread
+        self.idle = None        # set = no batch is writing rows; GETs wait for it
+
+    # ──────────── writer task ────────────
+    async def _writer(self):
+        """
+        The only place writes run: one at a time, in arrival order, in the
+        writer thread. Writes already queued run as one group commit (one
+        journal fsync); their requests are answered only after it.
+        GETs wait while the batch writes its rows, not during the fsync.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.writes.get()]
+            while not self.writes.empty():
+                batch.append(self.writes.get_nowait())
+            commit = contextlib.ExitStack()
+            self.idle.clear()
+            try:
+                outcomes = await loop.run_in_executor(self.executor, self._apply, batch, commit)
+            except Exception as e:
+                # group_commit() itself could not start: nothing was written
+                outcomes = [(future, None, e) for _, _, future in batch]
+            finally:
+                self.idle.set()
+            try:
+                await loop.run_in_executor(self.executor, commit.close)
+            except Exception as e:
+                # the rows are in the data files (and visible to reads), but
+                # the flush failed: they may not survive a crash
+                print(f"error: group commit: {e!r}", file=sys.stderr)
+                error = HttpError(500, "could not flush writes to disk; this one may be lost on a crash")
+                outcomes = [(future, None, error if failure is None else failure)
+                            for future, _, failure in outcomes]
+            for future, result, error in outcomes:
+                if future.cancelled():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+
+    @staticmethod
+    def _apply(batch, commit):
+        """
+        Writer thread: run each write of `batch` inside one group commit,
+        entered on `commit` and left open (closing it flushes).
+        A failed write has left nothing behind; the others still run.
+        """
+        commit.enter_context(backend().group_commit())
+        outcomes = []
+        for func, args, future in batch:
+            try:
+                outcomes.append((future, func(*args), None))
+            except Exception as e:
+                outcomes.append((future, None, e))
+        return outcomes
+
+    async def write(self, func, *args):
+        future = asyncio.get_running_loop().create_future()
+        await self.writes.put((func, args, future))
+        return await future
+
+    # ──────────── handlers: (query, body, **params) → (status, payload) ────────────
+    async def health(self, query, body):
+        return 200, {"status": "ok"}
+
+    async def list_citizens(self, query, body):
+        page, page_size = _paging(query)
+        citizen_type = (query.get("type") or [None])[0]
+        health_status = (query.get("health") or [None])[0]
+
+        if citizen_type or health_status:
+            # one pass: count every match, keep only the requested page
+            start = (page - 1) * page_size
+            items, total = [], 0
+            for c in iter_citizens(citizen_type, health_status):
+                if start <= total < start + page_size:
+                    items.append(_public(c))
+                total += 1
+        else:
+            total = CitizenModel.count()
+            items = [_public(c) for c in _page(CitizenModel.iter_all(), page, page_size)]
+        return 200, {"total": total, "page": page, "page_size": page_size, "items": items}
+
+    async def get_citizen(self, query, body, citizen_id):
+        citizen = CitizenModel.get_by_id(citizen_id)
+        if not citizen:
+            raise HttpError(404, f"ไม่พบประชาชนรหัส {citizen_id}")
+        assignment = AssignmentModel.get_by_citizen(citizen_id)
+        return 200, {"citizen": _public(citizen), "assignment": dict(assignment) if assignment else None}
+
+    async def register_citizen(self, query, body):
+        data = _json_body(body)
+        error = CitizenModel.validate(data)
+        if error:
+            raise HttpError(422, error)
+        success, result = await self.write(CitizenModel.add, data)
+        if not success:
+            raise HttpError(422, result)
+        return 201, _public(result)
+
+    async def list_shelters(self, query, body):
+        return 200, ShelterController.shelters_with_occupancy()
+
+    async def manual_assign(self, query, body):
+        data = _json_body(body)
+        citizen_id = str(data.get("citizen_id", "")).strip().upper()
+        shelter_id = str(data.get("shelter_id", "")).strip().upper()
+        if not citizen_id or not shelter_id:
+            raise HttpError(400, "citizen_id and shelter_id are required")
+        success, result = await self.write(ShelterController.manual_assign, citizen_id, shelter_id)
+        if not success:
+            raise HttpError(422, result)
+        return 201, result
+
+    async def auto_assign(self, query, body):
+        incremental = (query.get("incremental") or ["0"])[0] in ("1", "true", "yes")
+        mode = (query.get("mode") or [None])[0]
+        if mode is not None and mode not in ALLOCATION_MODES:
+            raise HttpError(400, "mode must be greedy or global")
+        if incremental:
+            results = await self.write(ShelterController.auto_assign_incremental, mode)
+        else:
+            results = await self.write(ShelterController.auto_assign, mode)
+        assigned = sum(1 for r in results if r["status"] == "ok")
+        return 200, {"assigned": assigned, "failed": len(results) - assigned, "results": results}
+
+    async def discharge(self, query, body):
+        data = _json_body(body)
+        citizen_id = str(data.get("citizen_id", "")).strip().upper()
+        shelter_id = str(data.get("shelter_id", "")).strip().upper()
+        if bool(citizen_id) == bool(shelter_id):
+            raise HttpError(400, "give either citizen_id or shelter_id")
+
+        def run():
+            if data.get("refill"):
+                return ShelterController.discharge_and_refill(citizen_id or None, shelter_id or None)
+            if shelter_id:
+                success, result = ShelterController.discharge_shelter(shelter_id)
+            else:
+                success, result = ShelterController.discharge(citizen_id)
+                result = [result] if success else result
+            return success, result, None
+
+        success, result, refill = await self.write(run)
+        if not success:
+            raise HttpError(422, result)
+        payload = {"discharged": result}
+        if refill is not None:
+            payload["assigned"] = [r for r in refill if r["status"] == "ok"]
+        return 200, payload
+
+    async def transfer(self, query, body):
+        data = _json_body(body)
+        citizen_id = str(data.get("citizen_id", "")).strip().upper()
+        shelter_id = str(data.get("shelter_id", "")).strip().upper()
+        if not citizen_id or not shelter_id:
+            raise HttpError(400, "citizen_id and shelter_id are required")
+        success, result = await self.write(ShelterController.transfer, citizen_id, shelter_id)
+        if not success:
+            raise HttpError(422, result)
+        return 201, result
+
+    async def report_summary(self, query, body):
+        return 200, report_snapshot().stats
+
+    async def report_rows(self, query, body, kind):
+        page, page_size = _paging(query)
+        total, assigned, unassigned = report_counts()
+        total = {"full": total, "assigned": assigned, "unassigned": unassigned}[kind]
+        items = _page(iter_export_rows(kind), page, page_size)
+        return 200, {"total": total, "page": page, "page_size": page_size, "items": items}
+
+    async def show_metrics(self, query, body):
+        return 200, metrics.snapshot()
+
+    # ──────────── HTTP ────────────
+    async def dispatch(self, method, target, body):
+        url = urlsplit(target)
+        path = url.path.rstrip("/") or "/"
+        query = parse_qs(url.query)
+
+        allowed = False
+        for route_method, pattern, handler in self.routes:
+            match = pattern.match(path)
+            if not match:
+                continue
+            if route_method != method:
+                allowed = True
+                continue
+            if method == "GET":
+                await self.idle.wait()
+            return await handler(query, body, **match.groupdict())
+        if allowed:
+            raise HttpError(405, f"{method} not allowed on {path}")
+        raise HttpError(404, f"no such endpoint: {path}")
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                keep_alive = await self._handle_request(request_line, reader, writer)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(self, request_line, reader, writer):
+        """Read one request, write its response; returns whether to keep the connection."""
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            self._respond(writer, 400, {"error": "bad request line"}, False)
+            return False
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+        if headers.get("transfer-encoding", "identity").lower() != "identity":
+            # the body cannot be skipped without decoding it: close
+            self._respond(writer, 411, {"error": "chunked bodies are not supported; send Content-Length"}, False)
+            return False
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            self._respond(writer, 400, {"error": "bad Content-Length"}, False)
+            return False
+        if length > MAX_BODY:
+            self._respond(writer, 413, {"error": "body too large"}, False)
+            return False
+        body = await reader.readexactly(length) if length else b""
+
+        try:
+            status, payload = await self.dispatch(method.upper(), target, body)
+        except HttpError as e:
+            status, payload = e.status, {"error": e.message}
+        except Exception as e:
+            print(f"error: {method} {target}: {e!r}", file=sys.stderr)
+            status, payload = 500, {"error": "internal error"}
+
+        self._respond(writer, status, payload, keep_alive)
+        return keep_alive
+
+    @staticmethod
+    def _respond(writer, status, payload, keep_alive):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        )
+        writer.write(head.encode("latin-1") + data)
+
+    # ──────────── lifecycle ────────────
+    def warm_up(self):
+        """Load every table (and the report snapshot) before the first request."""
+        CitizenModel.count()
+        ShelterModel.get_all()
+        AssignmentModel.occupancy_map()
+        report_snapshot()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, ready=None):
+        """Run until cancelled. `ready(server)` is called once listening."""
+        self.warm_up()
+        self.writes = asyncio.Queue()
+        self.idle = asyncio.Event()
+        self.idle.set()
+        # one thread: the journal's group depth and the file lock belong to it
+        self.executor = ThreadPoolExecutor(1, thread_name_prefix="writer")
+        writer_task = asyncio.create_task(self._writer())
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        try:
+            if ready:
+                ready(server)
+            async with server:
+                await server.serve_forever()
+        finally:
+            writer_task.cancel()
+            self.executor.shutdown(wait=True)
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Blocking entry point used by `main.py serve`."""
+    def ready(server):
+        address = server.sockets[0].getsockname()
+        print(f"listening on http://{address[0]}:{address[1]}", file=sys.stderr)
+
+    try:
+        asyncio.run(ApiServer().serve(host, port, ready))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,80 @@
+"""
+Shared fixtures: every test runs against its own data folder (tmp_path),
+never against data/ of the repository.
+"""
+import csv
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from models import repository, csv_scan                      # noqa: E402
+from models.storage import create_backend, set_backend      # noqa: E402
+from models.sqlite_backend import import_csv                # noqa: E402
+from models.citizen_model import FIELDS as CITIZEN_FIELDS   # noqa: E402
+from models.shelter_model import ShelterModel               # noqa: E402
+from models.assignment_model import FIELDS as ASSIGNMENT_FIELDS  # noqa: E402
+
+# (shelter_id, name, max_capacity, risk_level, region)
+SHELTERS = [
+    ("S001", "ศูนย์ทดสอบหนึ่ง", 5, 1, ""),
+    ("S002", "ศูนย์ทดสอบสอง", 50, 1, ""),
+]
+
+
+def write_csv(path, fields, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(fields)
+        writer.writerows(rows)
+
+
+def make_data_dir(path, shelters=SHELTERS):
+    """Empty citizens / assignments, plus `shelters`, under `path`."""
+    os.makedirs(path, exist_ok=True)
+    write_csv(os.path.join(path, "citizens.csv"), CITIZEN_FIELDS, [])
+    write_csv(os.path.join(path, "shelters.csv"), ShelterModel.FIELDS, shelters)
+    write_csv(os.path.join(path, "assignments.csv"), ASSIGNMENT_FIELDS, [])
+    return str(path)
+
+
+def use_data_dir(path, kind="csv"):
+    """
+    Point this process's models at `path` (fresh caches).
+    For "sqlite" the database starts as a copy of the CSV files there.
+    """
+    repository.clear()
+    csv_scan.clear()
+    db_path = os.path.join(path, "shelter.db")
+    if kind == "sqlite" and not os.path.exists(db_path):
+        import_csv(path, db_path).conn.close()
+    set_backend(create_backend(kind, path, db_path))
+
+
+def citizen(national_id, **fields):
+    """Valid registration data (healthy general adult) with overrides."""
+    data = {
+        "national_id": str(national_id),
+        "first_name": "ทดสอบ",
+        "last_name": "ระบบ",
+        "age": 30,
+        "health_status": "healthy",
+        "citizen_type": "general",
+        "phone": "-",
+    }
+    data.update(fields)
+    return data
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    path = make_data_dir(tmp_path / "data")
+    use_data_dir(path)
+    yield path
+    set_backend(None)
+    repository.clear()
+    csv_scan.clear()
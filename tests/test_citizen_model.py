@@ -0,0 +1,87 @@
+"""CitizenModel validation and the report summary over unusual rows."""
+import os
+
+import pytest
+
+from conftest import citizen
+
+
+@pytest.mark.parametrize("age, ok", [(-1, False), (0, True), (130, True), (131, False)])
+def test_validate_age_range(age, ok):
+    from models.citizen_model import CitizenModel
+    assert (CitizenModel.validate(citizen("1234567890123", age=age)) is None) == ok
+
+
+def test_summary_survives_out_of_range_age_in_file(data_dir):
+    # written before the range check existed
+    with open(os.path.join(data_dir, "citizens.csv"), "a", encoding="utf-8") as f:
+        f.write("C001,1234567890123,ก,ข,-5,healthy,general,2024-01-01,-,\n")
+    from controllers.report_snapshot import report_snapshot, _cache
+    _cache.update(version=None, snapshot=None)
+    stats = report_snapshot().stats
+    assert stats["total_citizens"] == 1
+    assert stats["by_type"]["general"]["unassigned"] == 1
+
+
+def test_duplicate_national_id_is_rejected(data_dir):
+    from models.citizen_model import CitizenModel, DUPLICATE_NATIONAL_ID
+    assert CitizenModel.add(citizen("1234567890123"))[0]
+    assert CitizenModel.add(citizen("1234567890123")) == (False, DUPLICATE_NATIONAL_ID)
+    assert CitizenModel.count() == 1
+
+
+def test_duplicates_within_a_batch(data_dir):
+    from models.citizen_model import CitizenModel
+    results = CitizenModel.add_many([citizen("1111111111111"), citizen("1111111111111"),
+                                     citizen("2222222222222")])
+    assert [ok for ok, _ in results] == [True, False, True]
+
+
+def test_national_id_kept_as_text(data_dir):
+    from models.citizen_model import CitizenModel
+    first, again = citizen("0123456789012"), citizen(" 0123456789012 ")
+    for data in (first, again):
+        assert CitizenModel.validate(data) is None
+    assert CitizenModel.add(first)[1]["national_id"] == "0123456789012"
+    assert CitizenModel.add(again)[0] is False
+
+
+def test_only_the_racing_row_is_reported(tmp_path, monkeypatch):
+    # another writer stored the same national_id between our check and insert:
+    # SQLite's UNIQUE rejects the whole batch, which is then retried row by row
+    from conftest import make_data_dir, use_data_dir
+    from models.citizen_model import CitizenModel, DUPLICATE_NATIONAL_ID
+    from models.storage import backend, set_backend
+    use_data_dir(make_data_dir(tmp_path / "data"), kind="sqlite")
+    try:
+        CitizenModel.add(citizen("3333333333333"))
+        monkeypatch.setattr(backend(), "citizen_by_national_id", lambda national_id: None)
+        results = CitizenModel.add_many([citizen("4444444444444"), citizen("3333333333333"),
+                                         citizen("5555555555555")])
+        assert [ok for ok, _ in results] == [True, False, True]
+        assert results[1][1] == DUPLICATE_NATIONAL_ID
+        assert CitizenModel.count() == 3
+    finally:
+        set_backend(None)
+
+
+def test_rejected_batch_inside_a_transaction_stores_nothing(tmp_path):
+    # the nested insert is a savepoint: the outer transaction still commits,
+    # but without the rows of the batch that failed
+    from conftest import make_data_dir, use_data_dir
+    from models.storage import DuplicateError, backend, set_backend
+    use_data_dir(make_data_dir(tmp_path / "data"), kind="sqlite")
+
+    def row(citizen_id, national_id):
+        return dict(citizen(national_id), citizen_id=citizen_id,
+                    registered_date="2024-01-01", region="", priority_key=0)
+    try:
+        db = backend()
+        db.insert_citizens([row("C001", "3333333333333")])
+        with db.transaction():
+            with pytest.raises(DuplicateError):
+                db.insert_citizens([row("C002", "4444444444444"), row("C003", "3333333333333")])
+            db.insert_citizens([row("C004", "5555555555555")])
+        assert [c["citizen_id"] for c in db.citizens()] == ["C001", "C004"]
+    finally:
+        set_backend(None)
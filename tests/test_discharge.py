@@ -0,0 +1,65 @@
+"""Discharge with refill: freed beds go to the waitlist, not back to those discharged."""
+import pytest
+
+from conftest import citizen, make_data_dir, use_data_dir
+
+# one small shelter, so most citizens wait
+SHELTERS = [("S001", "ศูนย์ทดสอบหนึ่ง", 3, 1, "")]
+
+
+@pytest.fixture(params=["csv", "sqlite"])
+def full_shelter(tmp_path, request):
+    from models.storage import set_backend
+    use_data_dir(make_data_dir(tmp_path / "data", SHELTERS), request.param)
+    from models.citizen_model import CitizenModel
+    from controllers.shelter_controller import ShelterController
+    CitizenModel.add_many([citizen(f"9{i:012d}") for i in range(6)])
+    placed = [r["citizen_id"] for r in ShelterController.auto_assign() if r["status"] == "ok"]
+    assert len(placed) == 3
+    yield placed
+    set_backend(None)
+
+
+def _active_ids():
+    from models.assignment_model import AssignmentModel
+    return {a["citizen_id"] for a in AssignmentModel.get_active()}
+
+
+def test_refill_places_a_waiting_citizen(full_shelter):
+    from controllers.shelter_controller import ShelterController
+    waiting = {"C004", "C005", "C006"}
+    success, discharged, refill = ShelterController.discharge_and_refill(full_shelter[0])
+    assert success and [a["citizen_id"] for a in discharged] == [full_shelter[0]]
+
+    placed = {r["citizen_id"] for r in refill if r["status"] == "ok"}
+    assert len(placed) == 1 and placed <= waiting
+    assert full_shelter[0] not in _active_ids()
+
+
+def test_closing_a_shelter_with_refill_moves_in_the_waitlist(full_shelter):
+    from controllers.shelter_controller import ShelterController
+    success, discharged, refill = ShelterController.discharge_and_refill(shelter_id="S001")
+    assert success and len(discharged) == 3
+    assert _active_ids() == {"C004", "C005", "C006"}
+
+
+def test_discharged_citizen_waits_again_afterwards(full_shelter):
+    from controllers.shelter_controller import ShelterController
+    ShelterController.discharge_and_refill(full_shelter[0])
+    ShelterController.discharge(next(iter(_active_ids() - set(full_shelter))))
+    results = ShelterController.auto_assign_incremental()
+    assert full_shelter[0] in {r["citizen_id"] for r in results}
+
+
+def test_incremental_run_after_a_discharge_needs_no_full_pass(full_shelter, monkeypatch):
+    from controllers.shelter_controller import ShelterController
+    ShelterController.discharge(full_shelter[0])
+
+    def full_pass(*args, **kwargs):
+        raise AssertionError("fell back to a full auto_assign()")
+    monkeypatch.setattr(ShelterController, "auto_assign", staticmethod(full_pass))
+
+    results = ShelterController.auto_assign_incremental()
+    # the discharged citizen is a candidate again, next to the waitlist for the freed bed
+    assert {r["citizen_id"] for r in results} == {full_shelter[0], "C004", "C005", "C006"}
+    assert len(_active_ids()) == 3
@@ -0,0 +1,66 @@
+"""FileLock between processes, and within one."""
+import multiprocessing
+import time
+
+import pytest
+
+from models.filelock import FileLock
+
+fcntl = pytest.importorskip("fcntl")   # the shared-lock checks need flock
+
+HOLD_SECONDS = 0.5
+
+
+def _hold_exclusive(path, held):
+    with FileLock(path).hold(exclusive=True):
+        held.set()
+        time.sleep(HOLD_SECONDS)
+
+
+def _can_lock(path, exclusive):
+    """True if the lock file could be locked right now (without waiting)."""
+    with open(path, "a") as f:
+        try:
+            fcntl.flock(f, (fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        fcntl.flock(f, fcntl.LOCK_UN)
+        return True
+
+
+@pytest.fixture
+def lock_path(tmp_path):
+    return str(tmp_path / ".lock")
+
+
+def test_exclusive_waits_for_another_process(lock_path):
+    ctx = multiprocessing.get_context("spawn")
+    held = ctx.Event()
+    other = ctx.Process(target=_hold_exclusive, args=(lock_path, held))
+    other.start()
+    try:
+        assert held.wait(30)
+        start = time.monotonic()
+        with FileLock(lock_path).hold(exclusive=False):
+            waited = time.monotonic() - start
+    finally:
+        other.join()
+    assert waited >= HOLD_SECONDS / 2
+
+
+def test_shared_holds_do_not_block_each_other(lock_path):
+    with FileLock(lock_path).hold(exclusive=False):
+        with FileLock(lock_path).hold(exclusive=False):
+            assert not _can_lock(lock_path, exclusive=True)
+    assert _can_lock(lock_path, exclusive=True)
+
+
+def test_nested_hold_upgrades_until_the_outermost_ends(lock_path):
+    lock = FileLock(lock_path)
+    with lock.hold(exclusive=False):
+        assert _can_lock(lock_path, exclusive=False)
+        with lock.hold(exclusive=True):
+            pass
+        # upgraded: stays exclusive until the outer hold ends
+        assert not _can_lock(lock_path, exclusive=False)
+    assert _can_lock(lock_path, exclusive=True)
@@ -0,0 +1,137 @@
+"""Journal recovery after a crash in the middle of an append."""
+import os
+
+from models.journal import Journal
+
+HEADER = b"assignment_id,citizen_id\n"
+
+
+def _data_file(tmp_path):
+    path = str(tmp_path / "assignments.csv")
+    with open(path, "wb") as f:
+        f.write(HEADER)
+    return path
+
+
+def _append(journal, path, data):
+    with open(path, "rb+") as f:
+        offset = f.seek(0, os.SEEK_END)
+        journal.write(f, offset, data)
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_committed_write_lost_from_data_file_is_replayed(tmp_path):
+    path = _data_file(tmp_path)
+    _append(Journal(path), path, b"A001,C001\n")
+    _append(Journal(path), path, b"A002,C002\n")
+    # the machine died before the page cache reached the data file
+    with open(path, "rb+") as f:
+        f.truncate(len(HEADER) + 4)
+
+    assert Journal(path).recover()
+    assert _read(path) == HEADER + b"A001,C001\nA002,C002\n"
+
+
+def test_uncommitted_tail_is_rolled_back(tmp_path):
+    path = _data_file(tmp_path)
+    _append(Journal(path), path, b"A001,C001\n")
+    # a writer died after writing to the data file but before its journal record
+    with open(path, "ab") as f:
+        f.write(b"A002,C0")
+
+    assert Journal(path).recover()
+    assert _read(path) == HEADER + b"A001,C001\n"
+
+
+def test_torn_journal_record_is_dropped(tmp_path):
+    path = _data_file(tmp_path)
+    journal = Journal(path)
+    _append(journal, path, b"A001,C001\n")
+    committed = os.path.getsize(journal.path)
+    # the record's header made it to the journal, its bytes did not
+    with open(journal.path, "ab") as j:
+        j.write(b"R %d 10 12345\nA002" % (len(HEADER) + 10))
+    with open(path, "ab") as f:
+        f.write(b"A002,C002\n")
+
+    Journal(path).recover()
+    assert _read(path) == HEADER + b"A001,C001\n"
+    assert os.path.getsize(journal.path) == committed
+
+
+def test_group_commits_once(tmp_path, monkeypatch):
+    path = _data_file(tmp_path)
+    journal = Journal(path)
+    syncs = []
+    monkeypatch.setattr(journal, "_fsync", syncs.append)
+    with journal.group():
+        for i in range(3):
+            _append(journal, path, b"A%03d,C%03d\n" % (i, i))
+        assert syncs.count(journal.path) == 0
+    assert syncs.count(journal.path) == 1
+
+
+def test_assignments_survive_a_lost_tail(data_dir):
+    from conftest import citizen, use_data_dir
+    from models.citizen_model import CitizenModel
+    from controllers.shelter_controller import ShelterController
+    _, c = CitizenModel.add(citizen("1234567890123"))
+    assert ShelterController.manual_assign(c["citizen_id"], "S001")[0]
+
+    path = os.path.join(data_dir, "assignments.csv")
+    with open(path, "rb+") as f:
+        f.truncate(os.path.getsize(path) - 5)
+    use_data_dir(data_dir)      # a fresh process
+
+    from models.assignment_model import AssignmentModel
+    assert AssignmentModel.get_by_citizen(c["citizen_id"])["shelter_id"] == "S001"
+
+
+def test_file_edited_in_place_is_not_replayed_into(data_dir):
+    from conftest import citizen, use_data_dir
+    from models.citizen_model import CitizenModel
+    from controllers.shelter_controller import ShelterController
+    ids = [c["citizen_id"] for _, c in CitizenModel.add_many([citizen(f"7{i:012d}") for i in range(8)])]
+    for citizen_id in ids:
+        ShelterController.manual_assign(citizen_id, "S002")
+    ShelterController.discharge(ids[0])
+
+    # someone keeps only the first lines, in place (same inode)
+    path = os.path.join(data_dir, "assignments.csv")
+    with open(path, encoding="utf-8") as f:
+        kept = f.readlines()[:4]
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(kept)
+    use_data_dir(data_dir)
+
+    from models.assignment_model import AssignmentModel
+    assert b"\0" not in _read(path)
+    assert _read(path) == "".join(kept).encode("utf-8")
+    assert len(AssignmentModel.get_active()) == 3
+    assert ShelterController.manual_assign(ids[5], "S001")[0]
+
+
+def test_line_deleted_by_hand_stays_deleted(data_dir):
+    from conftest import citizen, use_data_dir
+    from models.citizen_model import CitizenModel
+    from controllers.shelter_controller import ShelterController
+    ids = [c["citizen_id"] for _, c in CitizenModel.add_many([citizen(f"8{i:012d}") for i in range(3)])]
+    for citizen_id in ids:
+        ShelterController.manual_assign(citizen_id, "S002")
+
+    # a line deleted by hand: everything after it moves up
+    path = os.path.join(data_dir, "assignments.csv")
+    with open(path, encoding="utf-8") as f:
+        lines = f.readlines()
+    del lines[1]
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+    use_data_dir(data_dir)
+
+    from models.assignment_model import AssignmentModel
+    assert _read(path) == "".join(lines).encode("utf-8")
+    assert {a["citizen_id"] for a in AssignmentModel.get_active()} == set(ids[1:])
@@ -0,0 +1,24 @@
+"""Report counters agree with the report rows."""
+import pytest
+
+from conftest import citizen, use_data_dir
+
+
+@pytest.mark.parametrize("kind", ["csv", "sqlite"])
+def test_report_counts_follow_assignment_rows(data_dir, kind):
+    use_data_dir(data_dir, kind)
+    from models.citizen_model import CitizenModel
+    from controllers.shelter_controller import ShelterController
+    from controllers.report_rows import report_counts
+    from controllers.report_export import iter_export_rows
+
+    ids = [c["citizen_id"] for _, c in CitizenModel.add_many([citizen(f"4{i:012d}") for i in range(6)])]
+    for citizen_id in ids[:4]:
+        ShelterController.manual_assign(citizen_id, "S002")
+    ShelterController.transfer(ids[0], "S001")
+    ShelterController.discharge(ids[1])
+
+    total, assigned, unassigned = report_counts()
+    assert (total, assigned, unassigned) == (6, 3, 3)
+    assert assigned == sum(1 for _ in iter_export_rows("assigned"))
+    assert unassigned == sum(1 for _ in iter_export_rows("unassigned"))
@@ -0,0 +1,42 @@
+"""Table freshness checks: once per lock hold, every lookup otherwise."""
+import os
+
+from conftest import citizen
+
+
+def _count_stats(monkeypatch):
+    from models import repository
+    calls = []
+    stat = repository.Table._stat_signature
+    monkeypatch.setattr(repository.Table, "_stat_signature",
+                        lambda self: calls.append(self.path) or stat(self))
+    return calls
+
+
+def test_file_checked_once_per_transaction(data_dir, monkeypatch):
+    from models.citizen_model import CitizenModel
+    from models.storage import backend
+    CitizenModel.add_many([citizen(f"6{i:012d}") for i in range(20)])
+    calls = _count_stats(monkeypatch)
+
+    with backend().transaction():
+        for i in range(20):
+            assert CitizenModel.get_by_id(f"C{i + 1:03d}")
+    assert len(calls) == 1
+
+    for i in range(20):
+        CitizenModel.get_by_id(f"C{i + 1:03d}")
+    assert len(calls) == 21
+
+
+def test_change_by_another_process_seen_by_the_next_transaction(data_dir):
+    from models.citizen_model import CitizenModel
+    from models.storage import backend
+    CitizenModel.add(citizen("6000000000001"))
+    with backend().transaction():
+        assert CitizenModel.count() == 1
+    # another terminal registered someone in between
+    with open(os.path.join(data_dir, "citizens.csv"), "a", encoding="utf-8") as f:
+        f.write("C900,6000000000002,ก,ข,30,healthy,general,2024-01-01,-,\n")
+    with backend().transaction():
+        assert CitizenModel.get_by_id("C900") is not None
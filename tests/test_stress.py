@@ -0,0 +1,81 @@
+"""
+Multi-process stress: several intake terminals (processes) register and
+assign against the same data folder at the same time.
+"""
+import csv
+import multiprocessing
+import os
+from collections import Counter
+
+from conftest import citizen, use_data_dir
+
+PROCESSES = 4
+REGISTRATIONS = 25
+SHARED_NATIONAL_ID = "1999999999999"   # every process tries to register it
+
+
+def _register_and_assign(args):
+    data_dir, worker = args
+    use_data_dir(data_dir)
+    from models.citizen_model import CitizenModel
+    from controllers.shelter_controller import ShelterController
+
+    registered = assigned = 0
+    CitizenModel.add(citizen(SHARED_NATIONAL_ID))
+    for i in range(REGISTRATIONS):
+        ok, result = CitizenModel.add(citizen(f"2{worker:02d}{i:010d}"))
+        assert ok, result
+        registered += 1
+        ok, _ = ShelterController.manual_assign(result["citizen_id"], "S002")
+        assigned += ok
+    return registered, assigned
+
+
+def _manual_assign(args):
+    data_dir, citizen_ids = args
+    use_data_dir(data_dir)
+    from controllers.shelter_controller import ShelterController
+    return sum(ShelterController.manual_assign(cid, "S001")[0] for cid in citizen_ids)
+
+
+def _run(worker, tasks):
+    with multiprocessing.get_context("spawn").Pool(len(tasks)) as pool:
+        return pool.map(worker, tasks)
+
+
+def _rows(data_dir, name):
+    with open(os.path.join(data_dir, name), encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def _active_by_shelter(data_dir):
+    latest = {}
+    for a in _rows(data_dir, "assignments.csv"):
+        latest[a["assignment_id"]] = a
+    active = [a for a in latest.values() if a["status"] == "active"]
+    assert len({a["citizen_id"] for a in active}) == len(active), "citizen placed twice"
+    return Counter(a["shelter_id"] for a in active)
+
+
+def test_concurrent_registration_and_assignment(data_dir):
+    outcomes = _run(_register_and_assign, [(data_dir, w) for w in range(PROCESSES)])
+
+    citizens = _rows(data_dir, "citizens.csv")
+    assert len(citizens) == PROCESSES * REGISTRATIONS + 1
+    assert len({c["citizen_id"] for c in citizens}) == len(citizens)
+    assert len({c["national_id"] for c in citizens}) == len(citizens)
+
+    placed = sum(assigned for _, assigned in outcomes)
+    occupancy = _active_by_shelter(data_dir)
+    assert placed == occupancy["S002"] == 50     # capacity, never more
+
+
+def test_manual_assign_never_overbooks(data_dir):
+    from models.citizen_model import CitizenModel
+    results = CitizenModel.add_many([citizen(f"3{i:012d}") for i in range(PROCESSES * 6)])
+    ids = [c["citizen_id"] for _, c in results]
+
+    placed = _run(_manual_assign, [(data_dir, ids[w::PROCESSES]) for w in range(PROCESSES)])
+
+    assert sum(placed) == 5
+    assert _active_by_shelter(data_dir)["S001"] == 5
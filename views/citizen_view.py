@@ -3,6 +3,7 @@ View 1: CitizenView (หน้าลงทะเบียนประชาช
 ─ แสดงประชาชนทั้งหมด
 ─ แยกตามประเภทประชาชน
 ─ ฟอร์มลงทะเบียนใหม่
+─ นำเข้าข้อมูลจำนวนมากจากไฟล์
 """
 
 # ─── Mapping ภาษาไท ───
@@ -47,6 +48,7 @@ class CitizenView:
         print("  1) แสดงประชาชนทั้งหมด")
         print("  2) แสดงแยกตามประเภท (ทั่วไป / กลุ่มเสี่ยง / VIP)")
         print("  3) ลงทะเบียนประชาชนใหม่")
+        print("  4) นำเข้าข้อมูลจากไฟล์ (CSV / JSONL)")
         print("  0) กลับเมนูหลัก")
         CitizenView._line("─")
         return input("  เลือก: ").strip()
@@ -56,8 +58,13 @@ class CitizenView:
     # ════════════════════════════════════════════
     @staticmethod
     def show_all_citizens(citizens):
-        CitizenView._header(f"รายชื่อประชาชนทั้งหมด ({len(citizens)} คน)")
-        if not citizens:
+        CitizenView.show_all_citizens_pages([citizens], len(citizens))
+
+    @staticmethod
+    def show_all_citizens_pages(pages, total):
+        """pages = iterable of lists of citizen dicts; total = number of citizens."""
+        CitizenView._header(f"รายชื่อประชาชนทั้งหมด ({total} คน)")
+        if not total:
             print("  (ไม่มีข้อมูล)")
             return
 
@@ -69,19 +76,27 @@ class CitizenView:
         ))
         CitizenView._line("─")
 
-        for c in citizens:
-            full_name = f"{c['first_name']} {c['last_name']}"
-            health = HEALTH_LABELS.get(c["health_status"], c["health_status"])
-            ctype = TYPE_LABELS.get(c["citizen_type"], c["citizen_type"])
-            print(fmt.format(
-                c["citizen_id"],
-                c["national_id"][-4:].rjust(13, "*"),  # mask national id
-                full_name[:20],
-                c["age"],
-                health,
-                ctype,
-                c["registered_date"],
-            ))
+        pages = iter(pages)
+        page = next(pages, None)
+        while page is not None:
+            for c in page:
+                full_name = f"{c['first_name']} {c['last_name']}"
+                health = HEALTH_LABELS.get(c["health_status"], c["health_status"])
+                ctype = TYPE_LABELS.get(c["citizen_type"], c["citizen_type"])
+                print(fmt.format(
+                    c["citizen_id"],
+                    c["national_id"][-4:].rjust(13, "*"),  # mask national id
+                    full_name[:20],
+                    c["age"],
+                    health,
+                    ctype,
+                    c["registered_date"],
+                ))
+            page = next(pages, None)
+            if page is not None:
+                answer = input("  ── Enter = หน้าถัดไป, q = หยุด: ").strip().lower()
+                if answer == "q":
+                    break
         CitizenView._line("─")
 
     # ════════════════════════════════════════════
@@ -146,6 +161,7 @@ class CitizenView:
         type_map = {"1": "general", "2": "risk_group", "3": "vip"}
 
         phone = input("  เบอร์โทร (หรือ Enter ข้าม) : ").strip() or "-"
+        region = input("  เขต (หรือ Enter ข้าม)     : ").strip()
 
         # A basic validation
         try:
@@ -164,8 +180,34 @@ class CitizenView:
             "health_status": health_map.get(health_choice, "healthy"),
             "citizen_type": type_map.get(type_choice, "general"),
             "phone": phone,
+            "region": region,
         }
 
+    # ════════════════════════════════════════════
+    #  Form + result: bulk import from file
+    # ════════════════════════════════════════════
+    @staticmethod
+    def import_form():
+        CitizenView._header("นำเข้าข้อมูลประชาชนจากไฟล์")
+        print("  คอลัมน์: national_id, first_name, last_name, age,")
+        print("           health_status, citizen_type, phone, region")
+        print("  (พิมพ์ 'q' เพื่อยกเลิก)\n")
+
+        path = input("  path ไฟล์ (.csv / .jsonl)  : ").strip()
+        if not path or path.lower() == "q":
+            return None
+        return path
+
+    @staticmethod
+    def show_import_summary(summary):
+        CitizenView._header("ผลการนำเข้าข้อมูล")
+        print(f"  อ่านทั้งหมด     : {summary['read']:>8} แถว")
+        print(f"  ✅ นำเข้าสำเร็จ  : {summary['imported']:>8} คน")
+        print(f"  ❌ ไม่ผ่าน       : {summary['rejected']:>8} แถว")
+        if summary["rejected"]:
+            print(f"  รายละเอียดแถวที่ไม่ผ่าน: {summary['reject_path']}")
+        CitizenView._line("─")
+
     # ════════════════════════════════════════════
     #  Messages
     # ════════════════════════════════════════════
@@ -176,3 +218,7 @@ class CitizenView:
     @staticmethod
     def show_error(msg):
         print(f"\n  ❌  {msg}")
+
+    @staticmethod
+    def show_info(msg):
+        print(f"\n  ℹ️   {msg}")
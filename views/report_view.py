@@ -74,6 +74,25 @@ class ReportView:
             print(fmt.format(label, info["total"], info["assigned"], info["unassigned"]))
         ReportView._line("─")
 
+    # ════════════════════════════════════════════
+    #  Paging: print page by page, ask before the next one
+    # ════════════════════════════════════════════
+    @staticmethod
+    def _print_pages(pages, print_row):
+        pages = iter(pages)
+        page = next(pages, None)
+        while page is not None:
+            for row in page:
+                print_row(row)
+            page = next(pages, None)
+            if page is not None and not ReportView._ask_next_page():
+                break
+
+    @staticmethod
+    def _ask_next_page():
+        answer = input("  ── Enter = หน้าถัดไป, q = หยุด: ").strip().lower()
+        return answer != "q"
+
     # ════════════════════════════════════════════
     #  Report: assigned citizens
     # ════════════════════════════════════════════
@@ -82,9 +101,14 @@ class ReportView:
         """
         assigned_list = [{citizen, shelter_name, assigned_date}, ...]
         """
-        ReportView._header(f"ผู้ได้รับที่พัก ({len(assigned_list)} คน)")
+        ReportView.show_assigned_pages([assigned_list], len(assigned_list))
+
+    @staticmethod
+    def show_assigned_pages(pages, total):
+        """pages = iterable of lists of assigned items; total = number of items."""
+        ReportView._header(f"ผู้ได้รับที่พัก ({total} คน)")
 
-        if not assigned_list:
+        if not total:
             print("  (ยังไม่มีการจัดสรร)")
             return
 
@@ -94,7 +118,7 @@ class ReportView:
         ))
         ReportView._line("─")
 
-        for item in assigned_list:
+        def print_row(item):
             c = item["citizen"]
             name = f"{c['first_name']} {c['last_name']}"
             ctype = TYPE_LABELS.get(c["citizen_type"], c["citizen_type"])
@@ -103,6 +127,8 @@ class ReportView:
                 c["citizen_id"], name[:22], c["age"], ctype, health,
                 item["shelter_name"][:30], item["assigned_date"],
             ))
+
+        ReportView._print_pages(pages, print_row)
         ReportView._line("─")
 
     # ════════════════════════════════════════════
@@ -113,9 +139,14 @@ class ReportView:
         """
         unassigned_list = [citizen_dict, ...]
         """
-        ReportView._header(f"ผู้ตกค้าง – ยังไม่ได้ที่พัก ({len(unassigned_list)} คน)")
+        ReportView.show_unassigned_pages([unassigned_list], len(unassigned_list))
+
+    @staticmethod
+    def show_unassigned_pages(pages, total):
+        """pages = iterable of lists of citizen dicts; total = number of citizens."""
+        ReportView._header(f"ผู้ตกค้าง – ยังไม่ได้ที่พัก ({total} คน)")
 
-        if not unassigned_list:
+        if not total:
             print("  🎉  ทุกคนได้รับที่พักแล้ว!")
             return
 
@@ -123,13 +154,15 @@ class ReportView:
         print(fmt.format("รหัส", "ชื่อ-สกุล", "อายุ", "ประเภท", "สุขภาพ", "วันที่ลงทะเบียน"))
         ReportView._line("─")
 
-        for c in unassigned_list:
+        def print_row(c):
             name = f"{c['first_name']} {c['last_name']}"
             ctype = TYPE_LABELS.get(c["citizen_type"], c["citizen_type"])
             health = HEALTH_LABELS.get(c["health_status"], c["health_status"])
             print(fmt.format(
                 c["citizen_id"], name[:22], c["age"], ctype, health, c["registered_date"],
             ))
+
+        ReportView._print_pages(pages, print_row)
         ReportView._line("─")
 
     # ════════════════════════════════════════════
@@ -140,7 +173,12 @@ class ReportView:
         """
         all_citizens_with_status = [{citizen, status:'assigned'/'unassigned', shelter_name, assigned_date}]
         """
-        ReportView._header(f"รายงานแบบเต็ม ({len(all_citizens_with_status)} คน)")
+        ReportView.show_full_report_pages([all_citizens_with_status], len(all_citizens_with_status))
+
+    @staticmethod
+    def show_full_report_pages(pages, total):
+        """pages = iterable of lists of full-report items; total = number of items."""
+        ReportView._header(f"รายงานแบบเต็ม ({total} คน)")
 
         fmt = "  {:<8} {:<22} {:>5}  {:<12} {:<12} {:<6} {:<26}"
         print(fmt.format(
@@ -148,7 +186,7 @@ class ReportView:
         ))
         ReportView._line("─")
 
-        for item in all_citizens_with_status:
+        def print_row(item):
             c = item["citizen"]
             name = f"{c['first_name']} {c['last_name']}"
             ctype = TYPE_LABELS.get(c["citizen_type"], c["citizen_type"])
@@ -164,4 +202,6 @@ class ReportView:
             print(fmt.format(
                 c["citizen_id"], name[:22], c["age"], ctype, health, status_icon, shelter,
             ))
+
+        ReportView._print_pages(pages, print_row)
         ReportView._line("─")
@@ -3,6 +3,7 @@ View 2: ShelterView (หน้าจัดสรรที่พัก)
 ─ แสดงรายละเอียดที่พัก
 ─ แสดงจำนวนคนที่พักในปัจจุบัน
 ─ จัดสรรที่พักให้ประชาชน
+─ ให้ออกจากศูนย์ / ย้ายศูนย์
 """
 
 RISK_LABELS = {
@@ -40,6 +41,9 @@ class ShelterView:
         print("  1) แสดงรายละเอียดศูนย์พักพิงทั้งหมด")
         print("  2) จัดสรรที่พักอัตโนมัติ (Auto-Assign)")
         print("  3) จัดสรรที่พักรายบุคคล (Manual-Assign)")
+        print("  4) ให้ออกจากศูนย์รายบุคคล (Discharge)")
+        print("  5) ให้ทุกคนออกจากศูนย์ (ปิดศูนย์)")
+        print("  6) ย้ายศูนย์ (Transfer)")
         print("  0) กลับเมนูหลัก")
         ShelterView._line("─")
         return input("  เลือก: ").strip()
@@ -159,6 +163,66 @@ class ShelterView:
 
         return cid, sid
 
+    # ════════════════════════════════════════════
+    #  Forms: discharge / transfer
+    # ════════════════════════════════════════════
+    @staticmethod
+    def discharge_form():
+        ShelterView._header("ให้ออกจากศูนย์รายบุคคล")
+        cid = input("  รหัสประชาชน (เช่น C001) หรือ 'q' ยกเลิก: ").strip()
+        if not cid or cid.lower() == "q":
+            return None
+        return cid
+
+    @staticmethod
+    def discharge_shelter_form(shelters_with_occupancy):
+        ShelterView._header("ให้ทุกคนออกจากศูนย์")
+
+        occupied = [s for s in shelters_with_occupancy if s["current_occupancy"] > 0]
+        if not occupied:
+            print("  ไม่มีศูนย์ที่มีผู้เข้าพัก")
+            return None
+
+        print("\n  ── ศูนย์ที่มีผู้เข้าพัก ──")
+        for s in occupied:
+            print(f"    {s['shelter_id']}  {s['name']}  "
+                  f"เข้าพัก: {s['current_occupancy']}/{s['max_capacity']}")
+
+        print()
+        sid = input("  รหัสศูนย์ (เช่น S001) หรือ 'q' ยกเลิก: ").strip()
+        if not sid or sid.lower() == "q":
+            return None
+        confirm = input(f"  ยืนยันให้ทุกคนออกจาก {sid} (y/n): ").strip().lower()
+        return sid if confirm == "y" else None
+
+    @staticmethod
+    def transfer_form(available_shelters):
+        ShelterView._header("ย้ายศูนย์")
+
+        if not available_shelters:
+            print("  ศูนย์พักพิงเต็มทุกแห่ง")
+            return None, None
+
+        print("\n  ── ศูนย์พักพิงที่ยังว่าง ──")
+        for s in available_shelters:
+            print(f"    {s['shelter_id']}  {s['name']}  "
+                  f"ว่าง: {s['available']}/{s['max_capacity']}  ความเสี่ยง: {s['risk_level']}")
+
+        print()
+        cid = input("  รหัสประชาชน (เช่น C001) หรือ 'q' ยกเลิก: ").strip()
+        if cid.lower() == "q":
+            return None, None
+        sid = input("  ย้ายไปศูนย์ (เช่น S001)                 : ").strip()
+        if sid.lower() == "q":
+            return None, None
+
+        return cid, sid
+
+    @staticmethod
+    def ask_refill():
+        answer = input("\n  จัดสรรที่ว่างให้ผู้ที่รอคิวเลยหรือไม่ (y/n): ").strip().lower()
+        return answer == "y"
+
     # ════════════════════════════════════════════
     #  Messages
     # ════════════════════════════════════════════